@@ -2,28 +2,54 @@
 Base agent class for all agents in the pipeline
 """
 
+import asyncio
+import hashlib
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import structlog
-from langchain_anthropic import ChatAnthropic
 from langchain_core.language_models import BaseChatModel
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
 
 from ..config.settings import settings
+from ..utils.concurrency import is_overload_error, report_overload
+from ..utils.llm_clients import llm_clients
 
 logger = structlog.get_logger()
 
 
+def _canonical(value: Any) -> Any:
+    # Lists of names (symptoms, history) are sets; the LLM may reorder them.
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return sorted({item.strip().lower() for item in value})
+    return value
+
+
 class BaseAgent(ABC):
     """
     Abstract base class for all agents in the assembly line.
 
     Each agent is responsible for a specific task in the pipeline
     and can read/write to the shared state.
+
+    When the state carries a ``deadline``, ``process`` only gets the time
+    left before it. Agents past the deadline are skipped, and ``optional``
+    agents are also skipped once less than
+    ``settings.agent_optional_min_budget_seconds`` remains, so the state
+    gathered so far survives instead of the whole run being lost.
+
+    ``input_fields`` names the state an agent's result depends on; a follow-up
+    turn of a session reuses the stored result while those are unchanged.
     """
 
+    # Whether the pipeline still produces a useful answer without this agent
+    optional: bool = False
+    # Agents that only route (no LLM or I/O) may run past the deadline
+    enforce_deadline: bool = True
+    # State fields whose values determine the result; empty means always run
+    input_fields: Tuple[str, ...] = ()
+
     def __init__(
         self,
         name: str,
@@ -41,36 +67,82 @@ class BaseAgent(ABC):
             self.llm = llm
 
     def _initialize_llm(self) -> BaseChatModel:
-        """Initialize the language model based on configuration"""
+        """Get the shared language model client for the configured provider"""
         try:
             if settings.openai_api_key:
-                return ChatOpenAI(
-                    model=settings.primary_model,
+                return llm_clients.get(
+                    "openai",
+                    settings.primary_model,
                     temperature=settings.temperature,
                     max_tokens=settings.max_tokens,
                     api_key=settings.openai_api_key,
                 )
             elif settings.anthropic_api_key:
-                return ChatAnthropic(
-                    model="claude-3-sonnet-20240229",
+                return llm_clients.get(
+                    "anthropic",
+                    "claude-3-sonnet-20240229",
                     temperature=settings.temperature,
                     max_tokens=settings.max_tokens,
                     api_key=settings.anthropic_api_key,
                 )
             elif settings.google_ai_api_key:
-                return ChatGoogleGenerativeAI(
-                    model="gemini-pro",
+                return llm_clients.get(
+                    "google",
+                    "gemini-pro",
                     temperature=settings.temperature,
                     max_output_tokens=settings.max_tokens,
                     google_api_key=settings.google_ai_api_key,
                 )
             else:
                 # Fallback to OpenAI without key (will fail but gives clear error)
-                return ChatOpenAI(model=settings.primary_model)
+                return llm_clients.get("openai", settings.primary_model)
         except Exception as e:
             self.logger.error(f"Failed to initialize LLM: {str(e)}")
             raise
 
+    @staticmethod
+    def report_if_overloaded(error: Exception) -> None:
+        """
+        Tell the caller's concurrency limiter to back off after provider throttling.
+
+        Call this wherever an agent turns a provider error into a fallback
+        result; the limiter never sees errors that are swallowed.
+        """
+        if is_overload_error(error):
+            report_overload("rate_limit")
+
+    @staticmethod
+    def remaining_time(state: Dict[str, Any]) -> Optional[float]:
+        """Seconds left before the state's deadline, or None without one"""
+        deadline = state.get("deadline")
+        if deadline is None:
+            return None
+        return deadline - time.monotonic()
+
+    def input_fingerprint(
+        self, state: Dict[str, Any], fields: Optional[Tuple[str, ...]] = None
+    ) -> Optional[str]:
+        """Hash of the state this agent reads, or None for agents that always run"""
+        fields = self.input_fields if fields is None else fields
+        if not fields:
+            return None
+        values = {field: _canonical(state.get(field)) for field in fields}
+        canonical = json.dumps(values, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def has_budget_for_optional_work(self, state: Dict[str, Any]) -> bool:
+        """Whether there is time for optional work such as extra LLM calls"""
+        remaining = self.remaining_time(state)
+        return remaining is None or remaining >= settings.agent_optional_min_budget_seconds
+
+    def _deadline_updates(self, state: Dict[str, Any], updates: Dict[str, Any], reason: str) -> Dict[str, Any]:
+        self.logger.warning(f"{self.name} {reason}", remaining=self.remaining_time(state))
+        return {
+            **updates,
+            "deadline_exceeded": True,
+            "warnings": [f"{self.name} {reason}"],
+        }
+
     @abstractmethod
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -80,7 +152,8 @@ class BaseAgent(ABC):
             state: Current state of the pipeline
 
         Returns:
-            Dictionary of state updates
+            Dictionary of state updates; accumulating fields (``errors``,
+            ``warnings``) hold only the new entries, which the graph appends
         """
         pass
 
@@ -92,28 +165,41 @@ class BaseAgent(ABC):
             state: Current state of the pipeline
 
         Returns:
-            Updated state
+            State updates from this agent
         """
         self.logger.info(f"Starting {self.name} processing")
 
-        try:
-            # Update agent tracking
-            updates = {
-                "current_agent": self.name,
-                "agent_history": state.get("agent_history", []) + [self.name],
-            }
+        # Update agent tracking
+        updates = {
+            "current_agent": self.name,
+            "agent_history": [self.name],
+        }
+
+        remaining = self.remaining_time(state) if self.enforce_deadline else None
+        if remaining is not None and remaining <= 0:
+            return self._deadline_updates(state, updates, "skipped: deadline passed")
+        if remaining is not None and self.optional and not self.has_budget_for_optional_work(state):
+            return self._deadline_updates(state, updates, "skipped: not enough time left")
 
-            # Process the state
-            result = await self.process(state)
+        try:
+            # Process the state within the remaining budget
+            if remaining is None:
+                result = await self.process(state)
+            else:
+                result = await asyncio.wait_for(self.process(state), timeout=remaining)
             updates.update(result)
 
             self.logger.info(f"Completed {self.name} processing")
             return updates
 
+        except TimeoutError:
+            return self._deadline_updates(state, updates, "stopped: deadline reached")
+
         except Exception as e:
             self.logger.error(f"Error in {self.name}: {str(e)}")
+            self.report_if_overloaded(e)
             return {
-                "errors": state.get("errors", []) + [f"{self.name}: {str(e)}"],
+                "errors": [f"{self.name}: {str(e)}"],
                 "next_action": "escalate",
             }
 
@@ -29,6 +29,17 @@ class DiagnosticAnalyzerAgent(BaseAgent):
     with qualified healthcare professionals.
     """
 
+    # A follow-up turn re-diagnoses when the symptom set or patient context
+    # changes, not when re-extraction only rewords severity or duration.
+    input_fields = (
+        "symptoms",
+        "age",
+        "gender",
+        "medical_history",
+        "current_medications",
+        "synthesized_knowledge",
+    )
+
     def __init__(self, **kwargs):
         super().__init__(
             name="DiagnosticAnalyzer",
@@ -115,7 +126,8 @@ Remember: This is NOT a diagnosis, only informational analysis."""),
 
         except Exception as e:
             self.logger.error(f"Diagnostic analysis failed: {str(e)}")
+            self.report_if_overloaded(e)
             return {
-                "errors": state.get("errors", []) + [f"Diagnostic analysis failed: {str(e)}"],
+                "errors": [f"Diagnostic analysis failed: {str(e)}"],
                 "next_action": "continue",
             }
@@ -12,17 +12,36 @@ from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_openai import OpenAIEmbeddings
 
 from ..config.settings import settings
+from ..utils.monitoring import metrics
 from .base_agent import BaseAgent
 
 
+def _symptom_overlap(first: List[str], second: List[str]) -> float:
+    """Jaccard similarity of two symptom lists, ignoring case"""
+    first_set = {symptom.strip().lower() for symptom in first}
+    second_set = {symptom.strip().lower() for symptom in second}
+    if not first_set or not second_set:
+        return 0.0
+    return len(first_set & second_set) / len(first_set | second_set)
+
+
 class KnowledgeRetrieverAgent(BaseAgent):
     """
     Retrieves relevant medical knowledge based on extracted symptoms.
 
     This agent queries vector stores and knowledge bases to find relevant
     medical information that will inform the diagnostic analysis.
+
+    While the extractor's LLM call runs, ``retrieve_speculatively`` queries
+    for the rule-based symptoms; ``process`` reuses those documents when the
+    extracted symptoms overlap them enough and queries again otherwise.
     """
 
+    # Downstream agents can analyze symptoms without retrieved knowledge.
+    optional = True
+    input_fields = ("symptoms", "age", "medical_history")
+    speculative_input_fields = ("heuristic_symptoms", "age", "medical_history")
+
     def __init__(self, **kwargs):
         super().__init__(
             name="KnowledgeRetriever",
@@ -76,22 +95,57 @@ class KnowledgeRetrieverAgent(BaseAgent):
                 "next_action": "continue",
             }
 
-        # Create search query
-        query = self._create_search_query(symptoms, state)
-
-        # Retrieve documents
-        documents = await self._retrieve_documents(query)
+        # Reuse the speculative retrieval, or query for the extracted symptoms
+        documents = self._speculative_documents(symptoms, state)
+        if documents is None:
+            query = self._create_search_query(symptoms, state)
+            documents = await self._retrieve_documents(query)
 
-        # Enhance with LLM synthesis
-        synthesized_knowledge = await self._synthesize_knowledge(documents, symptoms)
+        # Enhance with LLM synthesis, or fall back to excerpts when time is short
+        updates: Dict[str, Any] = {}
+        if self.has_budget_for_optional_work(state):
+            synthesized_knowledge = await self._synthesize_knowledge(documents, symptoms)
+        else:
+            synthesized_knowledge = self._excerpt_knowledge(documents)
+            updates["warnings"] = [f"{self.name}: knowledge synthesis skipped to meet the deadline"]
 
         return {
+            **updates,
             "retrieved_documents": documents,
             "knowledge_sources": [doc.get("source", "Unknown") for doc in documents],
             "synthesized_knowledge": synthesized_knowledge,
             "next_action": "continue",
         }
 
+    async def retrieve_speculatively(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Retrieve documents for the rule-based symptoms before extraction finishes"""
+        symptoms = state.get("heuristic_symptoms") or []
+        if not symptoms or not settings.agent_speculative_retrieval:
+            metrics.record_speculative_retrieval("skipped")
+            return {"speculative_retrieval": None}
+
+        query = self._create_search_query(symptoms, state)
+        return {
+            "speculative_retrieval": {
+                "symptoms": symptoms,
+                "documents": await self._retrieve_documents(query),
+            }
+        }
+
+    def _speculative_documents(
+        self, symptoms: List[str], state: Dict[str, Any]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Speculatively retrieved documents, if their symptoms match the extracted ones"""
+        speculation = state.get("speculative_retrieval")
+        if not speculation:
+            return None
+
+        overlap = _symptom_overlap(speculation["symptoms"], symptoms)
+        hit = overlap >= settings.agent_speculative_retrieval_min_overlap
+        metrics.record_speculative_retrieval("hit" if hit else "miss")
+        self.logger.info("Speculative retrieval checked", overlap=overlap, reused=hit)
+        return speculation["documents"] if hit else None
+
     def _create_search_query(self, symptoms: List[str], state: Dict[str, Any]) -> str:
         """Create an effective search query from symptoms and context"""
         query_parts = [f"symptoms: {', '.join(symptoms)}"]
@@ -128,8 +182,17 @@ class KnowledgeRetrieverAgent(BaseAgent):
 
         except Exception as e:
             self.logger.error(f"Document retrieval failed: {str(e)}")
+            self.report_if_overloaded(e)
             return []
 
+    def _excerpt_knowledge(self, documents: List[Dict[str, Any]], limit: int = 300) -> str:
+        """Cheap stand-in for synthesis: the top documents' leading text"""
+        if not documents:
+            return "No relevant medical knowledge retrieved."
+        return "\n\n".join(
+            f"Source {i+1}: {doc['content'][:limit]}" for i, doc in enumerate(documents[:3])
+        )
+
     async def _synthesize_knowledge(
         self, documents: List[Dict[str, Any]], symptoms: List[str]
     ) -> str:
@@ -162,4 +225,5 @@ Provide a synthesized summary of the most relevant medical knowledge."""),
 
         except Exception as e:
             self.logger.error(f"Knowledge synthesis failed: {str(e)}")
+            self.report_if_overloaded(e)
             return "Failed to synthesize knowledge."
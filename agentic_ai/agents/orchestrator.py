@@ -16,6 +16,9 @@ class OrchestratorAgent(BaseAgent):
     should process next based on the current state.
     """
 
+    # Routing is cheap and must still end the run once the deadline passes.
+    enforce_deadline = False
+
     def __init__(self, **kwargs):
         super().__init__(
             name="Orchestrator",
@@ -32,7 +35,7 @@ class OrchestratorAgent(BaseAgent):
             self.logger.warning("Max iterations reached")
             return {
                 "next_action": "end",
-                "warnings": state.get("warnings", []) + ["Maximum iterations reached"],
+                "warnings": ["Maximum iterations reached"],
             }
 
         # Check for errors
@@ -41,7 +44,7 @@ class OrchestratorAgent(BaseAgent):
             self.logger.error("Too many errors, ending pipeline")
             return {
                 "next_action": "end",
-                "warnings": state.get("warnings", []) + ["Too many errors occurred"],
+                "warnings": ["Too many errors occurred"],
             }
 
         # Check urgency level
@@ -49,9 +52,16 @@ class OrchestratorAgent(BaseAgent):
         if urgency == "emergency":
             return {
                 "next_action": "escalate",
-                "warnings": state.get("warnings", []) + [
-                    "EMERGENCY: Seek immediate medical attention"
-                ],
+                "warnings": ["EMERGENCY: Seek immediate medical attention"],
+            }
+
+        # Out of time: stop with whatever the assembly line has produced
+        remaining = self.remaining_time(state)
+        if remaining is not None and remaining <= 0:
+            return {
+                "next_action": "end",
+                "deadline_exceeded": True,
+                "warnings": ["Deadline reached, returning partial results"],
             }
 
         # Determine next agent based on current state
@@ -30,6 +30,18 @@ class RecommendationGeneratorAgent(BaseAgent):
     symptom management and lifestyle modifications.
     """
 
+    input_fields = (
+        "symptoms",
+        "preliminary_diagnosis",
+        "risk_assessment",
+        "urgency_level",
+        "age",
+        "gender",
+        "medical_history",
+        "current_medications",
+        "allergies",
+    )
+
     def __init__(self, **kwargs):
         super().__init__(
             name="RecommendationGenerator",
@@ -111,10 +123,11 @@ Provide comprehensive, personalized recommendations."""),
 
         except Exception as e:
             self.logger.error(f"Recommendation generation failed: {str(e)}")
+            self.report_if_overloaded(e)
             return {
                 "recommendations": [
                     "Please consult with a healthcare professional for personalized advice."
                 ],
-                "errors": state.get("errors", []) + [f"Recommendation generation failed: {str(e)}"],
+                "errors": [f"Recommendation generation failed: {str(e)}"],
                 "next_action": "end",
             }
@@ -9,6 +9,11 @@ from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 
+from ..model_context_server.decision_support import (
+    compute_risk_score,
+    detect_red_flags,
+    suggest_urgency,
+)
 from .base_agent import BaseAgent
 
 
@@ -27,8 +32,26 @@ class RiskAssessorAgent(BaseAgent):
 
     This agent evaluates the severity, progression patterns, and risk factors
     to determine appropriate urgency levels and when to seek care.
+
+    ``screen`` is the rule-based part of the assessment (red flags, severity
+    and condition weights). It needs only the extracted symptoms, so the graph
+    runs it alongside diagnosis; the LLM assessment then runs on the
+    preliminary diagnosis and the screen's findings.
     """
 
+    input_fields = (
+        "symptoms",
+        "symptom_severity",
+        "symptom_duration",
+        "preliminary_diagnosis",
+        "requires_immediate_care",
+        "heuristic_risk",
+        "age",
+        "medical_history",
+        "current_medications",
+        "allergies",
+    )
+
     def __init__(self, **kwargs):
         super().__init__(
             name="RiskAssessor",
@@ -58,6 +81,7 @@ Duration: {duration}
 
 Preliminary Analysis: {preliminary_diagnosis}
 Requires Immediate Care: {requires_immediate_care}
+Rule-based Screen: {heuristic_risk}
 
 Patient Context:
 - Age: {age}
@@ -72,6 +96,9 @@ Provide a comprehensive risk assessment."""),
         """Assess health risks"""
 
         chain = self.prompt | self.llm | self.parser
+        requires_immediate_care = bool(state.get("requires_immediate_care"))
+        screen = state.get("heuristic_risk") or {}
+        screen_red_flags = screen.get("red_flags", [])
 
         try:
             result = await chain.ainvoke({
@@ -79,7 +106,8 @@ Provide a comprehensive risk assessment."""),
                 "severity": state.get("symptom_severity", {}),
                 "duration": state.get("symptom_duration", {}),
                 "preliminary_diagnosis": state.get("preliminary_diagnosis", []),
-                "requires_immediate_care": state.get("requires_immediate_care", False),
+                "requires_immediate_care": requires_immediate_care,
+                "heuristic_risk": screen or "Not available",
                 "age": state.get("age", "Not provided"),
                 "medical_history": state.get("medical_history", []),
                 "medications": state.get("current_medications", []),
@@ -87,18 +115,21 @@ Provide a comprehensive risk assessment."""),
                 "format_instructions": self.parser.get_format_instructions(),
             })
 
+            # Red flags the rules caught count even if the model missed them
+            red_flags = list(dict.fromkeys([*result["red_flags"], *screen_red_flags]))
+
             # Determine final urgency level
             urgency_level = self._determine_urgency(
                 result["overall_risk_level"],
-                state.get("requires_immediate_care", False),
-                result["red_flags"]
+                requires_immediate_care,
+                red_flags
             )
 
             return {
                 "risk_assessment": {
                     "risk_level": result["overall_risk_level"],
                     "risk_factors": result["risk_factors"],
-                    "red_flags": result["red_flags"],
+                    "red_flags": red_flags,
                     "monitoring_advice": result["monitoring_advice"],
                 },
                 "urgency_level": urgency_level,
@@ -108,13 +139,32 @@ Provide a comprehensive risk assessment."""),
 
         except Exception as e:
             self.logger.error(f"Risk assessment failed: {str(e)}")
+            self.report_if_overloaded(e)
             return {
-                "errors": state.get("errors", []) + [f"Risk assessment failed: {str(e)}"],
-                "urgency_level": "high",  # Default to high when assessment fails
+                "errors": [f"Risk assessment failed: {str(e)}"],
+                # Default to high when assessment fails, emergency if diagnosis or rules say so
+                "urgency_level": "emergency" if requires_immediate_care or screen_red_flags else "high",
                 "when_to_see_doctor": "Please consult a healthcare professional as soon as possible.",
                 "next_action": "continue",
             }
 
+    def screen(self, state: Dict[str, Any], text: str) -> Dict[str, Any]:
+        """Rule-based risk screen of the extracted symptoms and patient context"""
+        red_flags = detect_red_flags(" ".join([text, *state.get("symptoms", [])]))
+        severities = (state.get("symptom_severity") or {}).values()
+        severity = max((value for value in severities if isinstance(value, int)), default=None)
+        conditions = state.get("medical_history") or []
+        urgency, rationale = suggest_urgency(red_flags, severity, conditions)
+        score = compute_risk_score(urgency, red_flags, state.get("age"), conditions, severity)
+        return {
+            "heuristic_risk": {
+                "red_flags": red_flags,
+                "suggested_urgency": urgency,
+                "risk_tier": score["risk_tier"],
+                "rationale": rationale + score["contributing_factors"],
+            }
+        }
+
     def _determine_urgency(
         self, risk_level: str, requires_immediate_care: bool, red_flags: List[str]
     ) -> str:
@@ -9,6 +9,7 @@ from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 
+from ..graphs.state import conversation_text
 from .base_agent import BaseAgent
 
 
@@ -58,14 +59,14 @@ Provide a structured extraction of all symptoms mentioned."""),
         ])
 
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract symptoms from user input"""
+        """Extract symptoms from user input, including earlier turns of the session"""
 
         # Prepare input
         chain = self.prompt | self.llm | self.parser
 
         try:
             result = await chain.ainvoke({
-                "user_input": state.get("user_input", ""),
+                "user_input": conversation_text(state),
                 "age": state.get("age", "Not provided"),
                 "gender": state.get("gender", "Not provided"),
                 "medical_history": state.get("medical_history", []),
@@ -88,8 +89,9 @@ Provide a structured extraction of all symptoms mentioned."""),
 
         except Exception as e:
             self.logger.error(f"Symptom extraction failed: {str(e)}")
+            self.report_if_overloaded(e)
             return {
-                "errors": state.get("errors", []) + [f"Symptom extraction failed: {str(e)}"],
+                "errors": [f"Symptom extraction failed: {str(e)}"],
                 "next_action": "ask_clarification",
             }
 
@@ -1,6 +1,6 @@
 """LangChain chains and components."""
 
-__all__ = ["SymptomAnalysisChain", "MedicalKnowledgeChain"]
+__all__ = ["SymptomAnalysisChain", "MedicalKnowledgeChain", "FastTriageChain"]
 
 
 def __getattr__(name: str):
@@ -13,4 +13,8 @@ def __getattr__(name: str):
         from .retrieval_chain import MedicalKnowledgeChain
 
         return MedicalKnowledgeChain
+    if name == "FastTriageChain":
+        from .fast_triage_chain import FastTriageChain
+
+        return FastTriageChain
     raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -0,0 +1,66 @@
+"""
+Fast Triage Chain - single compact LLM call for the "fast" analysis mode
+"""
+
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field
+
+from ..config.settings import settings
+from ..utils.llm_clients import llm_clients
+
+
+class FastTriage(BaseModel):
+    """Structured output for fast triage"""
+    symptoms: list[str] = Field(description="Normalized symptom names")
+    possible_conditions: list[str] = Field(description="Up to three possible conditions")
+    urgency_level: str = Field(description="One of: low, medium, high, emergency")
+    recommendations: list[str] = Field(description="Up to three short next steps")
+    confidence: float = Field(description="Confidence between 0 and 1")
+
+
+class FastTriageChain:
+    """
+    One-call triage refinement on top of deterministic heuristics.
+
+    The heuristic findings are passed to the model so it only has to refine
+    them, which keeps the prompt and the response short.
+    """
+
+    def __init__(self, llm: BaseChatModel | None = None):
+        """Initialize the chain"""
+        self.llm = llm or llm_clients.get(
+            "openai",
+            settings.primary_model,
+            temperature=0,
+            max_tokens=settings.mcp_fast_max_tokens,
+            api_key=settings.openai_api_key,
+        )
+        self.parser = JsonOutputParser(pydantic_object=FastTriage)
+        self.prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are a cautious medical triage assistant. This is NOT medical advice.
+Refine the rule-based findings for the patient description. Be brief and never
+lower the urgency without a clear reason.
+
+{format_instructions}"""),
+            ("user", """Description: {user_input}
+Rule-based symptoms: {symptoms}
+Rule-based urgency: {urgency_level}
+Age: {age}
+Medical history: {medical_history}"""),
+        ])
+        self.chain = self.prompt | self.llm | self.parser
+
+    async def analyze(self, input_data: dict[str, Any], baseline: dict[str, Any]) -> dict[str, Any]:
+        """Return the model's refinement of a heuristic baseline"""
+        return await self.chain.ainvoke({
+            "user_input": input_data["user_input"],
+            "symptoms": ", ".join(baseline["symptoms"]) or "none detected",
+            "urgency_level": baseline["urgency_level"],
+            "age": input_data.get("age") or "Not provided",
+            "medical_history": ", ".join(input_data.get("medical_history") or []) or "None reported",
+            "format_instructions": self.parser.get_format_instructions(),
+        })
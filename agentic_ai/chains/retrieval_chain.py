@@ -12,6 +12,7 @@ from langchain_core.runnables import RunnablePassthrough
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
 from ..config.settings import settings
+from ..utils.llm_clients import llm_clients
 
 
 class MedicalKnowledgeChain:
@@ -28,8 +29,9 @@ class MedicalKnowledgeChain:
         vector_store: Chroma | None = None,
     ):
         """Initialize the RAG chain"""
-        self.llm = llm or ChatOpenAI(
-            model=settings.primary_model,
+        self.llm = llm or llm_clients.get(
+            "openai",
+            settings.primary_model,
             temperature=settings.temperature,
             api_key=settings.openai_api_key,
         )
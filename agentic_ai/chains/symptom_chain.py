@@ -10,6 +10,7 @@ from langchain_core.runnables import RunnableParallel, RunnablePassthrough
 from langchain_openai import ChatOpenAI
 
 from ..config.settings import settings
+from ..utils.llm_clients import llm_clients
 
 
 class SymptomAnalysisChain:
@@ -22,8 +23,9 @@ class SymptomAnalysisChain:
 
     def __init__(self, llm: ChatOpenAI | None = None):
         """Initialize the chain"""
-        self.llm = llm or ChatOpenAI(
-            model=settings.primary_model,
+        self.llm = llm or llm_clients.get(
+            "openai",
+            settings.primary_model,
             temperature=settings.temperature,
             api_key=settings.openai_api_key,
         )
@@ -31,6 +31,21 @@ class Settings(BaseSettings):
     fallback_model: str = Field(default="gpt-3.5-turbo", description="Fallback LLM model")
     temperature: float = Field(default=0.7, description="LLM temperature")
     max_tokens: int = Field(default=2000, description="Maximum tokens for LLM response")
+    llm_http_max_connections: int = Field(
+        default=32,
+        ge=1,
+        description="Connection limit of the shared HTTP pool per LLM provider",
+    )
+    llm_http_max_keepalive_connections: int = Field(
+        default=16,
+        ge=0,
+        description="Idle connections kept open per LLM provider",
+    )
+    llm_http_keepalive_expiry_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Seconds an idle LLM connection stays in the pool",
+    )
 
     # Vector Store Settings
     vector_store_type: str = Field(default="chroma", description="Vector store type: chroma, pinecone, faiss")
@@ -77,6 +92,16 @@ class Settings(BaseSettings):
         ge=1,
         description="Tool execution timeout in seconds",
     )
+    mcp_fast_timeout_seconds: float = Field(
+        default=8.0,
+        gt=0,
+        description="Timeout for fast-mode analyses (one LLM call); full mode uses mcp_tool_timeout_seconds",
+    )
+    mcp_fast_max_tokens: int = Field(
+        default=400,
+        ge=1,
+        description="Maximum completion tokens for the fast-mode LLM call",
+    )
     mcp_batch_max_requests: int = Field(
         default=10,
         ge=1,
@@ -87,6 +112,106 @@ class Settings(BaseSettings):
         ge=1,
         description="Maximum in-flight analyses for batch requests",
     )
+    mcp_llm_concurrency_initial: int = Field(
+        default=4,
+        ge=1,
+        description="Starting limit for concurrent LLM-bound analyses (adapted at runtime)",
+    )
+    mcp_llm_concurrency_min: int = Field(
+        default=1,
+        ge=1,
+        description="Lowest adaptive limit for concurrent LLM-bound analyses",
+    )
+    mcp_llm_concurrency_max: int = Field(
+        default=32,
+        ge=1,
+        description="Highest adaptive limit for concurrent LLM-bound analyses",
+    )
+    mcp_llm_latency_tolerance: float = Field(
+        default=2.0,
+        gt=1,
+        description="Back off when recent p95 latency exceeds this multiple of the long-run average",
+    )
+    mcp_admission_max_in_flight: int = Field(
+        default=16,
+        ge=1,
+        description="Process-wide cap on concurrently running LLM analyses",
+    )
+    mcp_admission_max_queue: int = Field(
+        default=64,
+        ge=0,
+        description="Analyses allowed to wait for admission before new ones are shed",
+    )
+    mcp_admission_queue_timeout_seconds: float = Field(
+        default=10.0,
+        gt=0,
+        description="Longest an analysis may wait for admission before it is shed",
+    )
+    mcp_batch_stream_timeout_seconds: float = Field(
+        default=120.0,
+        gt=0,
+        description="Default deadline for streamed batches; unfinished items are reported as timed out",
+    )
+    mcp_triage_batch_max_items: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum number of texts per deterministic triage batch call",
+    )
+    mcp_triage_batch_inline_threshold: int = Field(
+        default=200,
+        ge=0,
+        description="Triage batches up to this size run inline instead of in the process pool",
+    )
+    mcp_triage_batch_chunk_size: int = Field(
+        default=250,
+        ge=1,
+        description="Number of texts dispatched to a process-pool worker at a time",
+    )
+    mcp_triage_batch_workers: int | None = Field(
+        default=None,
+        ge=1,
+        description="Process-pool workers for large triage batches (defaults to CPU count)",
+    )
+    mcp_population_risk_max_rows: int = Field(
+        default=100000,
+        ge=1,
+        description="Maximum rows per score_population_risk call",
+    )
+    mcp_response_cache_size: int = Field(
+        default=4096,
+        ge=1,
+        description="Maximum memoized responses per deterministic scoring tool",
+    )
+    mcp_analysis_cache_backend: str = Field(
+        default="memory",
+        description="Result cache for analyze_symptoms: memory, redis, or none",
+    )
+    mcp_analysis_cache_size: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum cached symptom analyses",
+    )
+    mcp_analysis_cache_ttl_seconds: int = Field(
+        default=600,
+        ge=1,
+        description="Seconds a cached symptom analysis stays valid",
+    )
+    mcp_red_flag_short_circuit: bool = Field(
+        default=True,
+        description="Answer analyze_symptoms with an emergency response when red flags are detected, skipping the graph",
+    )
+    mcp_red_flag_background_enrichment: bool = Field(
+        default=False,
+        description="After a red-flag short-circuit, run the full graph in the background and cache the result",
+    )
+    mcp_rule_pack_path: str | None = Field(
+        default=None,
+        description="JSON/YAML triage rule pack loaded at startup instead of the built-in tables",
+    )
+    mcp_rule_pack_dir: str | None = Field(
+        default=None,
+        description="Directory the load_rule_pack tool may read files from; unset allows inline documents only",
+    )
     mcp_require_auth: bool = Field(
         default=False,
         description="Require bearer token auth for non-health HTTP endpoints",
@@ -95,6 +220,19 @@ class Settings(BaseSettings):
         default=None,
         description="Bearer token for HTTP MCP authentication",
     )
+    mcp_warmup_enabled: bool = Field(
+        default=False,
+        description="Build the analysis graph at startup; /readyz reports not ready until it finishes",
+    )
+    mcp_warmup_dry_run: bool = Field(
+        default=False,
+        description="During warm-up, run one synthetic analysis through the graph with a stub model",
+    )
+    mcp_warmup_retry_backoff_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        description="Delay before retrying a failed warm-up; doubles per attempt up to 60 seconds",
+    )
     mcp_readiness_check_graph: bool = Field(
         default=False,
         description="If true, readiness checks attempt graph initialization",
@@ -103,6 +241,39 @@ class Settings(BaseSettings):
     # Agent Settings
     max_agent_iterations: int = Field(default=10, description="Maximum agent iterations")
     agent_timeout: int = Field(default=300, description="Agent timeout in seconds")
+    agent_optional_min_budget_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="Skip optional agent work (e.g. knowledge synthesis) when less time remains before the deadline",
+    )
+    agent_speculative_retrieval: bool = Field(
+        default=True,
+        description="Start knowledge retrieval from rule-based symptoms while the LLM extracts them",
+    )
+    agent_speculative_retrieval_min_overlap: float = Field(
+        default=0.5,
+        ge=0,
+        le=1,
+        description="Reuse speculative retrieval when the rule-based and extracted symptom sets overlap this much (Jaccard)",
+    )
+    agent_session_store: str = Field(
+        default="sqlite",
+        description="Checkpoint store that lets follow-up turns of a session reuse earlier stages: sqlite, memory, or none",
+    )
+    agent_session_sqlite_path: str = Field(
+        default="./data/sessions.sqlite",
+        description="SQLite file of the sqlite session store",
+    )
+    agent_session_max_sessions: int = Field(
+        default=1000,
+        ge=1,
+        description="Sessions kept in the checkpoint store; the least recently used are evicted first",
+    )
+    agent_session_ttl_seconds: int = Field(
+        default=86400,
+        ge=1,
+        description="Seconds an idle session stays in the checkpoint store",
+    )
 
     # Monitoring Settings
     enable_metrics: bool = Field(default=True, description="Enable Prometheus metrics")
@@ -3,12 +3,21 @@ LangGraph Assembly Line - Main orchestration graph
 Implements the multi-agent assembly line architecture
 """
 
+import asyncio
+import copy
+import json
 import time
+import weakref
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Literal
+from typing import Any, AsyncIterator, Dict, Literal, Optional, Tuple
 
 import structlog
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
 from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
 
 from ..agents import (
@@ -19,10 +28,75 @@ from ..agents import (
     RiskAssessorAgent,
     SymptomExtractorAgent,
 )
-from .state import AgentState, SymptomAnalysisInput, SymptomAnalysisOutput
+from ..agents.base_agent import BaseAgent
+from ..config.settings import settings
+from ..model_context_server.decision_support import infer_symptoms
+from ..utils.monitoring import metrics
+from .sessions import build_session_store, session_config
+from .state import (
+    AgentState,
+    SymptomAnalysisEvent,
+    SymptomAnalysisInput,
+    SymptomAnalysisOutput,
+    conversation_text,
+    merge_state,
+    turn_update,
+)
 
 logger = structlog.get_logger()
 
+# Node updates of the run in progress, so a run stopped at its deadline can
+# still return what the agents produced so far.
+_run_progress: ContextVar[Optional[Dict[str, Any]]] = ContextVar("symptomsync_graph_progress", default=None)
+
+# Output fields a streamed analysis reports as soon as a stage sets them
+STREAMED_FIELDS = (
+    "symptoms",
+    "urgency_level",
+    "preliminary_diagnosis",
+    "risk_assessment",
+    "recommendations",
+    "when_to_see_doctor",
+    "confidence_score",
+)
+
+# Marks a session store not yet built from the settings
+_FROM_SETTINGS: Any = object()
+
+# Synthetic request for warm-up dry runs. The stub model answers every agent
+# with one JSON object carrying the keys all of their parsers read.
+DRY_RUN_INPUT: SymptomAnalysisInput = {
+    "user_input": "Mild headache since yesterday",
+    "user_id": None,
+    "session_id": None,
+    "medical_history": None,
+    "current_medications": None,
+    "allergies": None,
+    "age": 30,
+    "gender": None,
+}
+DRY_RUN_RESPONSE: Dict[str, Any] = {
+    "symptoms": ["headache"],
+    "severity": {"headache": 3},
+    "duration": {"headache": "1 day"},
+    "entities": {},
+    "preliminary_diagnoses": ["tension headache"],
+    "confidence_scores": {"tension headache": 0.5},
+    "reasoning": "Warm-up dry run",
+    "requires_immediate_care": False,
+    "overall_risk_level": "low",
+    "risk_factors": [],
+    "urgency_recommendation": "If symptoms persist",
+    "red_flags": [],
+    "monitoring_advice": "Monitor symptoms",
+    "immediate_actions": ["Rest"],
+    "lifestyle_recommendations": [],
+    "dietary_advice": [],
+    "activity_guidance": [],
+    "symptom_relief": [],
+    "when_to_escalate": "If symptoms worsen",
+}
+
 
 class SymptomSyncGraph:
     """
@@ -37,12 +111,46 @@ class SymptomSyncGraph:
     4. RiskAssessor: Assesses health risks
     5. RecommendationGenerator: Generates personalized recommendations
 
+    Knowledge retrieval starts speculatively from rule-based symptoms while
+    the extractor runs. RiskAssessor's rule-based screen only depends on the
+    extracted symptoms, so it runs in parallel with stages 2-3; its LLM
+    assessment waits for both and reads the diagnosis.
     The Orchestrator manages the flow between agents.
+
+    Each run has a deadline (``input_data["deadline"]`` or
+    ``settings.agent_timeout`` from now) that agents budget against; a run
+    cut short returns its partial results with ``partial`` set.
+
+    Requests with a ``session_id`` run against a checkpointer that stores
+    the session's last state. A follow-up turn re-extracts symptoms from the
+    whole conversation and reuses each later stage's stored result while
+    the state that stage reads (``BaseAgent.input_fields``) is unchanged.
+    Concurrent turns of one session wait for each other, so none of them
+    starts from a state another is about to replace.
     """
 
-    def __init__(self):
-        """Initialize the assembly line graph"""
+    AGENT_ATTRIBUTES = (
+        "symptom_extractor",
+        "knowledge_retriever",
+        "diagnostic_analyzer",
+        "risk_assessor",
+        "recommendation_generator",
+        "orchestrator",
+    )
+
+    def __init__(self, session_store: Optional[BaseCheckpointSaver] = _FROM_SETTINGS):
+        """
+        Initialize the assembly line graph.
+
+        Args:
+            session_store: Checkpointer for session runs; by default the one
+                selected by ``settings.agent_session_store``, opened on first use.
+                None turns sessions off.
+        """
         self.logger = logger.bind(component="SymptomSyncGraph")
+        self._session_store = session_store
+        self._session_graph = None
+        self._session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
 
         # Initialize agents
         self.symptom_extractor = SymptomExtractorAgent()
@@ -55,27 +163,37 @@ class SymptomSyncGraph:
         # Build the graph
         self.graph = self._build_graph()
 
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self, checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
         """Build the LangGraph state machine"""
 
         # Create the graph
         workflow = StateGraph(AgentState)
 
         # Add nodes for each agent
+        workflow.add_node("heuristic_screen", self._heuristic_screen_node)
+        workflow.add_node("knowledge_prefetch", self._knowledge_prefetch_node)
         workflow.add_node("symptom_extractor", self._symptom_extractor_node)
         workflow.add_node("knowledge_retriever", self._knowledge_retriever_node)
         workflow.add_node("diagnostic_analyzer", self._diagnostic_analyzer_node)
+        workflow.add_node("risk_screen", self._risk_screen_node)
         workflow.add_node("risk_assessor", self._risk_assessor_node)
         workflow.add_node("recommendation_generator", self._recommendation_generator_node)
         workflow.add_node("orchestrator", self._orchestrator_node)
 
         # Set entry point
-        workflow.set_entry_point("symptom_extractor")
-
-        # Define the assembly line flow
-        workflow.add_edge("symptom_extractor", "knowledge_retriever")
+        workflow.set_entry_point("heuristic_screen")
+
+        # Define the assembly line flow. Retrieval for the rule-based
+        # symptoms overlaps the extractor's LLM call. The rule-based risk
+        # screen needs only the extracted symptoms, so it runs alongside
+        # knowledge retrieval and diagnosis; the LLM risk assessment reads
+        # both.
+        workflow.add_edge("heuristic_screen", "symptom_extractor")
+        workflow.add_edge("heuristic_screen", "knowledge_prefetch")
+        workflow.add_edge(["symptom_extractor", "knowledge_prefetch"], "knowledge_retriever")
+        workflow.add_edge("symptom_extractor", "risk_screen")
         workflow.add_edge("knowledge_retriever", "diagnostic_analyzer")
-        workflow.add_edge("diagnostic_analyzer", "risk_assessor")
+        workflow.add_edge(["diagnostic_analyzer", "risk_screen"], "risk_assessor")
         workflow.add_edge("risk_assessor", "recommendation_generator")
         workflow.add_edge("recommendation_generator", "orchestrator")
 
@@ -85,49 +203,136 @@ class SymptomSyncGraph:
             self._route_from_orchestrator,
             {
                 "end": END,
-                "continue": "symptom_extractor",
+                "continue": "heuristic_screen",
                 "escalate": END,
             }
         )
 
         # Compile the graph
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
+
+    @property
+    def session_store(self) -> Optional[BaseCheckpointSaver]:
+        """The session checkpointer, or None when sessions are off"""
+        if self._session_store is _FROM_SETTINGS:
+            self._session_store = build_session_store(
+                settings.agent_session_store,
+                path=settings.agent_session_sqlite_path,
+                max_sessions=settings.agent_session_max_sessions,
+                ttl_seconds=settings.agent_session_ttl_seconds,
+            )
+        return self._session_store
+
+    def _graph_for_session(self):
+        """The graph compiled with the session checkpointer, or None when sessions are off"""
+        if self._session_graph is None and self.session_store is not None:
+            self._session_graph = self._build_graph(checkpointer=self.session_store)
+        return self._session_graph
+
+    async def _heuristic_screen_node(self, state: AgentState) -> Dict[str, Any]:
+        """Rule-based symptom screen that seeds speculative retrieval"""
+        return self._checkpoint({"heuristic_symptoms": infer_symptoms(conversation_text(state))})
+
+    async def _knowledge_prefetch_node(self, state: AgentState) -> Dict[str, Any]:
+        """Knowledge retrieval for the rule-based symptoms, alongside extraction"""
+        fingerprint = self.knowledge_retriever.input_fingerprint(
+            state, KnowledgeRetrieverAgent.speculative_input_fields
+        )
+        if self._is_unchanged(state, "knowledge_prefetch", fingerprint):
+            return self._checkpoint({"stage_fingerprints": {"knowledge_prefetch": fingerprint}})
+        result = await self.knowledge_retriever.retrieve_speculatively(state)
+        return self._checkpoint({**result, "stage_fingerprints": {"knowledge_prefetch": fingerprint}})
 
-    async def _symptom_extractor_node(self, state: AgentState) -> AgentState:
+    async def _symptom_extractor_node(self, state: AgentState) -> Dict[str, Any]:
         """Symptom extractor node"""
         self.logger.info("Running symptom extractor")
         result = await self.symptom_extractor(state)
-        return {**state, **result}
+        return self._checkpoint(result)
 
-    async def _knowledge_retriever_node(self, state: AgentState) -> AgentState:
+    async def _knowledge_retriever_node(self, state: AgentState) -> Dict[str, Any]:
         """Knowledge retriever node"""
-        self.logger.info("Running knowledge retriever")
-        result = await self.knowledge_retriever(state)
-        return {**state, **result}
+        return await self._run_stage("knowledge_retriever", self.knowledge_retriever, state)
 
-    async def _diagnostic_analyzer_node(self, state: AgentState) -> AgentState:
+    async def _diagnostic_analyzer_node(self, state: AgentState) -> Dict[str, Any]:
         """Diagnostic analyzer node"""
-        self.logger.info("Running diagnostic analyzer")
-        result = await self.diagnostic_analyzer(state)
-        return {**state, **result}
+        return await self._run_stage("diagnostic_analyzer", self.diagnostic_analyzer, state)
+
+    async def _risk_screen_node(self, state: AgentState) -> Dict[str, Any]:
+        """Rule-based risk screen, alongside knowledge retrieval and diagnosis"""
+        return self._checkpoint(self.risk_assessor.screen(state, conversation_text(state)))
 
-    async def _risk_assessor_node(self, state: AgentState) -> AgentState:
+    async def _risk_assessor_node(self, state: AgentState) -> Dict[str, Any]:
         """Risk assessor node"""
-        self.logger.info("Running risk assessor")
-        result = await self.risk_assessor(state)
-        return {**state, **result}
+        return await self._run_stage("risk_assessor", self.risk_assessor, state)
 
-    async def _recommendation_generator_node(self, state: AgentState) -> AgentState:
+    async def _recommendation_generator_node(self, state: AgentState) -> Dict[str, Any]:
         """Recommendation generator node"""
-        self.logger.info("Running recommendation generator")
-        result = await self.recommendation_generator(state)
-        return {**state, **result}
+        return await self._run_stage("recommendation_generator", self.recommendation_generator, state)
 
-    async def _orchestrator_node(self, state: AgentState) -> AgentState:
+    async def _orchestrator_node(self, state: AgentState) -> Dict[str, Any]:
         """Orchestrator node"""
         self.logger.info("Running orchestrator")
         result = await self.orchestrator(state)
-        return {**state, **result}
+        return self._checkpoint(result)
+
+    def _is_unchanged(self, state: AgentState, stage: str, fingerprint: Optional[str]) -> bool:
+        """Whether an earlier turn of the session ran ``stage`` on the same inputs"""
+        stored = (state.get("stage_fingerprints") or {}).get(stage)
+        if fingerprint is None or stored is None:
+            return False
+        reused = stored == fingerprint
+        metrics.record_session_stage(stage, reused)
+        if reused:
+            self.logger.info("Reusing stage result from the session", stage=stage)
+        return reused
+
+    async def _run_stage(self, stage: str, agent: BaseAgent, state: AgentState) -> Dict[str, Any]:
+        """Run an agent unless the session already holds its result for these inputs"""
+        fingerprint = agent.input_fingerprint(state)
+        if self._is_unchanged(state, stage, fingerprint):
+            # The stored fields stay in place; keep routing as if the agent ran
+            return self._checkpoint({"current_agent": agent.name})
+
+        self.logger.info(f"Running {agent.name}")
+        result = await agent(state)
+        # Only complete results are worth reusing; degraded ones run again next turn
+        if fingerprint is not None and not any(
+            result.get(key) for key in ("errors", "warnings", "deadline_exceeded")
+        ):
+            result["stage_fingerprints"] = {stage: fingerprint}
+        return self._checkpoint(result)
+
+    def with_llm(self, llm: BaseChatModel) -> "SymptomSyncGraph":
+        """Return a copy whose agents call ``llm``; vector stores, prompts and parsers are shared"""
+        clone = copy.copy(self)
+        for name in self.AGENT_ATTRIBUTES:
+            agent = copy.copy(getattr(self, name))
+            agent.llm = llm
+            setattr(clone, name, agent)
+        clone.graph = clone._build_graph()
+        clone._session_graph = None
+        return clone
+
+    async def dry_run(self) -> SymptomAnalysisOutput:
+        """
+        Push a synthetic request through every stage using a stub chat model.
+
+        Used at startup to warm imports, prompts, parsers and the compiled
+        graph without chat-model calls. Raises RuntimeError if a stage failed.
+        """
+        stub = FakeListChatModel(responses=[json.dumps(DRY_RUN_RESPONSE)])
+        result = await self.with_llm(stub).analyze_symptoms(DRY_RUN_INPUT)
+        if result["urgency_level"] == "unknown" or not result["symptoms"]:
+            raise RuntimeError("Graph dry run did not complete")
+        return result
+
+    @staticmethod
+    def _checkpoint(update: Dict[str, Any]) -> Dict[str, Any]:
+        """Remember a node's update; the state is only rebuilt if the run is cut short"""
+        progress = _run_progress.get()
+        if progress is not None:
+            progress["updates"].append(update)
+        return update
 
     def _route_from_orchestrator(
         self, state: AgentState
@@ -146,22 +351,9 @@ class SymptomSyncGraph:
         else:
             return "end"
 
-    async def analyze_symptoms(
-        self, input_data: SymptomAnalysisInput
-    ) -> SymptomAnalysisOutput:
-        """
-        Main entry point for symptom analysis.
-
-        Args:
-            input_data: Input data containing user symptoms and context
-
-        Returns:
-            Analysis results with recommendations
-        """
-        start_time = time.time()
-
-        # Initialize state
-        initial_state: AgentState = {
+    def _initial_state(self, input_data: SymptomAnalysisInput) -> AgentState:
+        """Fresh state for a run, with its deadline resolved"""
+        return {
             "messages": [HumanMessage(content=input_data["user_input"])],
             "user_input": input_data["user_input"],
             "user_id": input_data.get("user_id"),
@@ -181,76 +373,225 @@ class SymptomSyncGraph:
             "recommendations": None,
             "lifestyle_advice": None,
             "when_to_see_doctor": None,
+            "heuristic_symptoms": None,
+            "speculative_retrieval": None,
             "retrieved_documents": None,
             "knowledge_sources": None,
             "current_agent": None,
             "agent_history": [],
             "iteration_count": 0,
+            "stage_fingerprints": {},
             "errors": [],
             "warnings": [],
+            "deadline": input_data.get("deadline") or time.monotonic() + settings.agent_timeout,
+            "deadline_exceeded": False,
             "timestamp": datetime.utcnow().isoformat(),
             "processing_time": None,
             "confidence_score": None,
             "next_action": "continue",
         }
 
+    @asynccontextmanager
+    async def _session_turn(self, input_data: SymptomAnalysisInput, deadline: float) -> AsyncIterator[bool]:
+        """
+        Run the turns of one session one at a time, so each starts from the last one's state.
+
+        Yields False, without holding the session, when an earlier turn is
+        still running at the deadline.
+        """
+        if not input_data.get("session_id") or self._graph_for_session() is None:
+            yield True
+            return
+
+        thread_id = session_config(input_data["session_id"], input_data.get("user_id"))["configurable"]["thread_id"]
+        lock = self._session_locks.get(thread_id)
+        if lock is None:
+            lock = self._session_locks[thread_id] = asyncio.Lock()
         try:
-            # Run the graph
-            self.logger.info("Starting symptom analysis pipeline")
-            final_state = await self.graph.ainvoke(initial_state)
-
-            processing_time = time.time() - start_time
-
-            # Prepare output
-            output: SymptomAnalysisOutput = {
-                "symptoms": final_state.get("symptoms", []),
-                "preliminary_diagnosis": final_state.get("preliminary_diagnosis", []),
-                "risk_assessment": final_state.get("risk_assessment", {}),
-                "urgency_level": final_state.get("urgency_level", "unknown"),
-                "recommendations": final_state.get("recommendations", []),
-                "when_to_see_doctor": final_state.get("when_to_see_doctor", "Consult a healthcare professional"),
-                "confidence_score": final_state.get("confidence_score", 0.0),
-                "processing_time": processing_time,
-            }
+            await asyncio.wait_for(lock.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+        except TimeoutError:
+            self.logger.warning("Deadline reached while an earlier turn of the session was running")
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            lock.release()
 
-            self.logger.info(
-                "Symptom analysis completed",
-                processing_time=processing_time,
-                urgency=output["urgency_level"]
-            )
+    async def _prepare_run(
+        self, input_data: SymptomAnalysisInput, initial_state: AgentState
+    ) -> Tuple[Any, Dict[str, Any], Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Graph, input and config for a run, plus the state its node updates apply to.
+
+        Follow-up turns of a session run on top of the session's last state.
+        """
+        session_graph = self._graph_for_session() if input_data.get("session_id") else None
+        if session_graph is None:
+            return self.graph, initial_state, None, initial_state
+
+        config = session_config(input_data["session_id"], input_data.get("user_id"))
+        stored = await session_graph.aget_state(config)
+        if stored.created_at is None:
+            return session_graph, initial_state, config, initial_state
+        graph_input = turn_update(initial_state)
+        return session_graph, graph_input, config, merge_state(stored.values, graph_input)
+
+    def _output(self, final_state: Dict[str, Any], start_time: float) -> SymptomAnalysisOutput:
+        """Shape the final state; stages that never ran leave their fields unset"""
+        processing_time = time.time() - start_time
+        output: SymptomAnalysisOutput = {
+            "symptoms": final_state.get("symptoms") or [],
+            "preliminary_diagnosis": final_state.get("preliminary_diagnosis") or [],
+            "risk_assessment": final_state.get("risk_assessment") or {},
+            "urgency_level": final_state.get("urgency_level") or "unknown",
+            "recommendations": final_state.get("recommendations") or [],
+            "when_to_see_doctor": final_state.get("when_to_see_doctor") or "Consult a healthcare professional",
+            "confidence_score": final_state.get("confidence_score") or 0.0,
+            "processing_time": processing_time,
+            "partial": bool(final_state.get("deadline_exceeded")),
+        }
+
+        self.logger.info(
+            "Symptom analysis completed",
+            processing_time=processing_time,
+            urgency=output["urgency_level"],
+            partial=output["partial"],
+        )
+        return output
 
-            return output
+    def _fallback_output(self, error: Exception, start_time: float) -> SymptomAnalysisOutput:
+        """Safe output for a run that failed"""
+        self.logger.error(f"Pipeline execution failed: {str(error)}")
+        return {
+            "symptoms": [],
+            "preliminary_diagnosis": [],
+            "risk_assessment": {},
+            "urgency_level": "unknown",
+            "recommendations": [
+                "We encountered an error processing your request. "
+                "Please consult with a healthcare professional."
+            ],
+            "when_to_see_doctor": "As soon as possible",
+            "confidence_score": 0.0,
+            "processing_time": time.time() - start_time,
+            "partial": False,
+        }
+
+    async def analyze_symptoms(
+        self, input_data: SymptomAnalysisInput
+    ) -> SymptomAnalysisOutput:
+        """
+        Main entry point for symptom analysis.
+
+        Args:
+            input_data: Input data containing user symptoms and context
+
+        Returns:
+            Analysis results with recommendations
+        """
+        start_time = time.time()
+        initial_state = self._initial_state(input_data)
+        deadline = initial_state["deadline"]
+
+        progress: Dict[str, Any] = {"updates": []}
+        token = _run_progress.set(progress)
+        try:
+            async with self._session_turn(input_data, deadline) as on_time:
+                if not on_time:
+                    return self._output(merge_state(initial_state, {"deadline_exceeded": True}), start_time)
+                graph, graph_input, config, base_state = await self._prepare_run(input_data, initial_state)
+
+                # Run the graph
+                self.logger.info("Starting symptom analysis pipeline", session=config is not None)
+                try:
+                    final_state = await asyncio.wait_for(
+                        graph.ainvoke(graph_input, config=config),
+                        timeout=max(0.0, deadline - time.monotonic()),
+                    )
+                except TimeoutError:
+                    final_state = merge_state(base_state, *progress["updates"], {"deadline_exceeded": True})
+                    self.logger.warning(
+                        "Deadline reached, returning partial results",
+                        agents=final_state.get("agent_history", []),
+                    )
+
+                return self._output(final_state, start_time)
 
         except Exception as e:
-            self.logger.error(f"Pipeline execution failed: {str(e)}")
-            processing_time = time.time() - start_time
-
-            # Return safe fallback output
-            return {
-                "symptoms": [],
-                "preliminary_diagnosis": [],
-                "risk_assessment": {},
-                "urgency_level": "unknown",
-                "recommendations": [
-                    "We encountered an error processing your request. "
-                    "Please consult with a healthcare professional."
-                ],
-                "when_to_see_doctor": "As soon as possible",
-                "confidence_score": 0.0,
-                "processing_time": processing_time,
-            }
+            return self._fallback_output(e, start_time)
+
+        finally:
+            _run_progress.reset(token)
+
+    async def stream_analysis(
+        self, input_data: SymptomAnalysisInput
+    ) -> AsyncIterator[SymptomAnalysisEvent]:
+        """
+        Run an analysis like ``analyze_symptoms``, reporting stages as they finish.
+
+        Each stage that sets output fields yields an event with just those
+        fields, so urgency is known once the extractor is done. The last
+        event has stage ``"result"`` and carries what ``analyze_symptoms``
+        would return. Closing the iterator early cancels the run.
+        """
+        start_time = time.time()
+        initial_state = self._initial_state(input_data)
+        deadline = initial_state["deadline"]
+
+        try:
+            async with self._session_turn(input_data, deadline) as on_time:
+                if on_time:
+                    graph, graph_input, config, base_state = await self._prepare_run(input_data, initial_state)
+
+                    self.logger.info("Starting streamed symptom analysis", session=config is not None)
+                    updates = []
+                    stream = graph.astream(graph_input, config=config, stream_mode="updates")
+                    try:
+                        while True:
+                            try:
+                                chunk = await asyncio.wait_for(
+                                    anext(stream), timeout=max(0.0, deadline - time.monotonic())
+                                )
+                            except StopAsyncIteration:
+                                break
+                            except TimeoutError:
+                                updates.append({"deadline_exceeded": True})
+                                self.logger.warning("Deadline reached, returning partial results")
+                                break
+                            for stage, update in chunk.items():
+                                updates.append(update)
+                                fields = {key: update[key] for key in STREAMED_FIELDS if key in update}
+                                if fields:
+                                    yield {"stage": stage, "data": fields}
+                    finally:
+                        await stream.aclose()
+
+                    output = self._output(merge_state(base_state, *updates), start_time)
+                else:
+                    output = self._output(merge_state(initial_state, {"deadline_exceeded": True}), start_time)
+
+        except Exception as e:
+            output = self._fallback_output(e, start_time)
+
+        yield {"stage": "result", "data": output}
 
     def visualize(self) -> str:
         """Generate a Mermaid diagram of the graph"""
         return """
 graph TD
-    Start([User Input]) --> A[Symptom Extractor]
+    Start([User Input]) --> S[Heuristic Screen]
+    S --> A[Symptom Extractor]
+    S --> P[Knowledge Prefetch]
     A --> B[Knowledge Retriever]
+    P --> B
+    A --> R[Risk Screen]
     B --> C[Diagnostic Analyzer]
     C --> D[Risk Assessor]
+    R --> D
     D --> E[Recommendation Generator]
     E --> F{Orchestrator}
     F -->|End| G([Output Results])
     F -->|Escalate| H([Emergency Alert])
-    F -->|Continue| A
+    F -->|Continue| S
 """
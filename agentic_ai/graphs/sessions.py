@@ -0,0 +1,274 @@
+"""
+Session checkpoint stores for the LangGraph assembly line
+
+With a checkpointer the graph saves its state under the conversation's
+session, and the next turn of that session starts from it, so stages whose
+inputs did not change are not run again. The stores here keep only each
+session's latest checkpoint, drop sessions idle for longer than
+``ttl_seconds``, and evict the least recently used ones beyond
+``max_sessions``. Any other LangGraph checkpointer can be passed to
+``SymptomSyncGraph`` instead.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from ..utils.monitoring import metrics
+
+
+def session_config(session_id: str, user_id: Optional[str] = None) -> RunnableConfig:
+    """Checkpointer config for a session; a user's sessions are kept apart from other users'"""
+    thread_id = f"{user_id}:{session_id}" if user_id else session_id
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def _validate_bounds(max_sessions: int, ttl_seconds: float) -> None:
+    if max_sessions <= 0:
+        raise ValueError("max_sessions must be > 0")
+    if ttl_seconds <= 0:
+        raise ValueError("ttl_seconds must be > 0")
+
+
+def _report_evictions(expired: int, evicted: int, stored: int) -> None:
+    if expired:
+        metrics.record_session_evictions("expired", expired)
+    if evicted:
+        metrics.record_session_evictions("capacity", evicted)
+    metrics.set_sessions_stored(stored)
+
+
+class BoundedMemorySaver(MemorySaver):
+    """In-process session store; sessions are lost on restart"""
+
+    def __init__(
+        self,
+        max_sessions: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        _validate_bounds(max_sessions, ttl_seconds)
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._last_used: OrderedDict[str, float] = OrderedDict()
+        # The async methods run the sync ones in executor threads.
+        self._lock = threading.Lock()
+
+    # Not ``__len__``: LangGraph tests checkpointers for truth, and an empty
+    # store would read as no checkpointer at all.
+    def session_count(self) -> int:
+        """Number of stored sessions"""
+        with self._lock:
+            return len(self._last_used)
+
+    def _drop(self, thread_ids: Iterable[str]) -> int:
+        dropped = 0
+        for thread_id in list(thread_ids):
+            self._last_used.pop(thread_id, None)
+            self.storage.pop(thread_id, None)
+            dropped += 1
+        return dropped
+
+    def _drop_expired(self) -> int:
+        cutoff = self._clock() - self.ttl_seconds
+        return self._drop(
+            thread_id for thread_id, last_used in self._last_used.items() if last_used < cutoff
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = str(config["configurable"]["thread_id"])
+        with self._lock:
+            expired = self._drop_expired()
+            # ``storage`` is a defaultdict; do not create entries for unknown sessions
+            saved = super().get_tuple(config) if thread_id in self.storage else None
+            stored = len(self._last_used)
+        if expired:
+            _report_evictions(expired, 0, stored)
+        return saved
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+    ) -> RunnableConfig:
+        thread_id = str(config["configurable"]["thread_id"])
+        with self._lock:
+            saved = super().put(config, checkpoint, metadata)
+            # Puts of one run may finish out of order; keep the newest checkpoint
+            checkpoints = self.storage[thread_id]
+            latest = max(checkpoints)
+            self.storage[thread_id] = {latest: checkpoints[latest]}
+            self._last_used[thread_id] = self._clock()
+            self._last_used.move_to_end(thread_id)
+            expired = self._drop_expired()
+            excess = len(self._last_used) - self.max_sessions
+            evicted = self._drop(list(self._last_used)[:excess]) if excess > 0 else 0
+            stored = len(self._last_used)
+        _report_evictions(expired, evicted, stored)
+        return saved
+
+
+class BoundedSqliteSaver(SqliteSaver):
+    """
+    SQLite session store that survives restarts.
+
+    A ``sessions`` table next to LangGraph's ``checkpoints`` table records when
+    each session was last written. The async methods run the sync ones in a
+    worker thread, so the standard library ``sqlite3`` module is enough.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        max_sessions: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(conn, **kwargs)
+        _validate_bounds(max_sessions, ttl_seconds)
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+
+    @classmethod
+    def from_path(cls, path: str, max_sessions: int, ttl_seconds: float) -> "BoundedSqliteSaver":
+        """Open (and create) the database at ``path``"""
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        return cls(conn, max_sessions=max_sessions, ttl_seconds=ttl_seconds)
+
+    def session_count(self) -> int:
+        """Number of stored sessions"""
+        with self.lock, self.cursor(transaction=False) as cur:
+            return self._count(cur)
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                thread_id TEXT PRIMARY KEY,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+            """
+        )
+
+    @staticmethod
+    def _drop(cur: sqlite3.Cursor, thread_ids: List[str]) -> int:
+        rows = [(thread_id,) for thread_id in thread_ids]
+        cur.executemany("DELETE FROM checkpoints WHERE thread_id = ?", rows)
+        cur.executemany("DELETE FROM sessions WHERE thread_id = ?", rows)
+        return len(rows)
+
+    def _drop_expired(self, cur: sqlite3.Cursor) -> int:
+        cur.execute(
+            "SELECT thread_id FROM sessions WHERE updated_at < ?",
+            (self._clock() - self.ttl_seconds,),
+        )
+        return self._drop(cur, [row[0] for row in cur.fetchall()])
+
+    def _count(self, cur: sqlite3.Cursor) -> int:
+        cur.execute("SELECT COUNT(*) FROM sessions")
+        return cur.fetchone()[0]
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self.lock:
+            with self.cursor() as cur:
+                expired = self._drop_expired(cur)
+                stored = self._count(cur) if expired else 0
+            saved = super().get_tuple(config)
+        if expired:
+            _report_evictions(expired, 0, stored)
+        return saved
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+    ) -> RunnableConfig:
+        saved = super().put(config, checkpoint, metadata)
+        thread_id = str(config["configurable"]["thread_id"])
+        with self.lock, self.cursor() as cur:
+            # Puts of one run may finish out of order; keep the newest checkpoint
+            cur.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND thread_ts < "
+                "(SELECT MAX(thread_ts) FROM checkpoints WHERE thread_id = ?)",
+                (thread_id, thread_id),
+            )
+            cur.execute(
+                "INSERT OR REPLACE INTO sessions (thread_id, updated_at) VALUES (?, ?)",
+                (thread_id, self._clock()),
+            )
+            expired = self._drop_expired(cur)
+            cur.execute(
+                "SELECT thread_id FROM sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?",
+                (self.max_sessions,),
+            )
+            evicted = self._drop(cur, [row[0] for row in cur.fetchall()])
+            stored = self._count(cur)
+        _report_evictions(expired, evicted, stored)
+        return saved
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        def collect() -> List[CheckpointTuple]:
+            with self.lock:
+                return list(self.list(config, filter=filter, before=before, limit=limit))
+
+        for checkpoint_tuple in await asyncio.to_thread(collect):
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata)
+
+
+def build_session_store(
+    backend: str, path: str, max_sessions: int, ttl_seconds: float
+) -> Optional[BaseCheckpointSaver]:
+    """Create the configured store; ``"none"`` turns session checkpointing off"""
+    backend = backend.lower()
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return BoundedMemorySaver(max_sessions=max_sessions, ttl_seconds=ttl_seconds)
+    if backend == "sqlite":
+        return BoundedSqliteSaver.from_path(path, max_sessions=max_sessions, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown session store '{backend}'; expected sqlite, memory, or none")
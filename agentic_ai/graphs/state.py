@@ -2,18 +2,65 @@
 State definitions for the LangGraph assembly line
 """
 
-from typing import Annotated, Any, Dict, List, Optional, TypedDict
+import operator
+from dataclasses import dataclass
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NotRequired,
+    Optional,
+    TypedDict,
+    get_type_hints,
+)
 
 from langchain_core.messages import BaseMessage
 from langgraph.graph import add_messages
 
 
+def keep_latest(current: Any, update: Any) -> Any:
+    """Reducer for fields that parallel branches may both set; the last write wins"""
+    return update
+
+
+def merge_dicts(current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer for mappings that parallel branches add keys to"""
+    return {**current, **update}
+
+
+@dataclass(frozen=True)
+class Reset:
+    """Update that replaces a reduced field's value instead of merging into it"""
+
+    value: Any
+
+
+def resettable(reducer: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+    """Wrap a reducer so a ``Reset`` update starts the field over"""
+
+    def reduce(current: Any, update: Any) -> Any:
+        if isinstance(update, Reset):
+            return update.value
+        return reducer(current, update)
+
+    return reduce
+
+
 class AgentState(TypedDict):
     """
     State object that flows through the assembly line.
 
     This represents the shared state between all agents in the pipeline.
-    Each agent can read from and write to this state.
+    Each agent can read from and write to this state. Nodes return only the
+    fields they changed, and accumulating lists only their new entries; the
+    reducers declared here merge those updates, including ones from parallel
+    branches.
+
+    With a session checkpointer the state outlives the run: the fields in
+    ``SESSION_FIELDS`` carry over to the session's next turn, and
+    ``turn_update`` starts the per-turn fields over.
     """
 
     # Conversation messages
@@ -38,7 +85,10 @@ class AgentState(TypedDict):
     gender: Optional[str]
 
     # Analysis results
+    synthesized_knowledge: Optional[str]
     preliminary_diagnosis: Optional[List[str]]
+    requires_immediate_care: Optional[bool]
+    heuristic_risk: Optional[Dict[str, Any]]  # rule-based red flags and risk tier
     risk_assessment: Optional[Dict[str, Any]]
     urgency_level: Optional[str]  # low, medium, high, emergency
 
@@ -48,17 +98,24 @@ class AgentState(TypedDict):
     when_to_see_doctor: Optional[str]
 
     # Knowledge retrieval
+    heuristic_symptoms: Optional[List[str]]  # rule-based, seeds speculative retrieval
+    speculative_retrieval: Optional[Dict[str, Any]]  # {"symptoms": [...], "documents": [...]}
     retrieved_documents: Optional[List[Dict[str, Any]]]
     knowledge_sources: Optional[List[str]]
 
     # Agent tracking
-    current_agent: Optional[str]
-    agent_history: List[str]
+    current_agent: Annotated[Optional[str], keep_latest]
+    agent_history: Annotated[List[str], resettable(operator.add)]
     iteration_count: int
+    stage_fingerprints: Annotated[Dict[str, str], merge_dicts]  # stage -> hash of the inputs it ran on
 
     # Error handling
-    errors: List[str]
-    warnings: List[str]
+    errors: Annotated[List[str], resettable(operator.add)]
+    warnings: Annotated[List[str], resettable(operator.add)]
+
+    # Deadline (time.monotonic() value) every agent must finish by
+    deadline: Optional[float]
+    deadline_exceeded: Annotated[bool, resettable(operator.or_)]
 
     # Metadata
     timestamp: Optional[str]
@@ -66,7 +123,90 @@ class AgentState(TypedDict):
     confidence_score: Optional[float]
 
     # Next action
-    next_action: Optional[str]  # continue, end, escalate, ask_clarification
+    next_action: Annotated[Optional[str], keep_latest]  # continue, end, escalate, ask_clarification
+
+
+# Reducers declared on AgentState, by field
+STATE_REDUCERS: Dict[str, Callable[[Any, Any], Any]] = {
+    name: hint.__metadata__[0]
+    for name, hint in get_type_hints(AgentState, include_extras=True).items()
+    if hasattr(hint, "__metadata__")
+}
+
+
+# Analysis results a session carries into its next turn
+SESSION_FIELDS = frozenset({
+    "messages",
+    "symptoms",
+    "symptom_severity",
+    "symptom_duration",
+    "extracted_entities",
+    "synthesized_knowledge",
+    "preliminary_diagnosis",
+    "requires_immediate_care",
+    "heuristic_risk",
+    "risk_assessment",
+    "urgency_level",
+    "recommendations",
+    "lifestyle_advice",
+    "when_to_see_doctor",
+    "heuristic_symptoms",
+    "speculative_retrieval",
+    "retrieved_documents",
+    "knowledge_sources",
+    "confidence_score",
+    "stage_fingerprints",
+})
+
+# Patient context a follow-up turn may leave out to keep the stored values
+CONTEXT_FIELDS = frozenset({"medical_history", "current_medications", "allergies", "age", "gender"})
+
+# Accumulating fields that describe a single turn
+_PER_TURN_REDUCED_FIELDS = ("agent_history", "errors", "warnings", "deadline_exceeded")
+
+
+def turn_update(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Input that starts a new turn on top of a session's stored state.
+
+    Keeps the new message and per-turn fields of ``state``, leaves analysis
+    results and context the caller did not repeat to the stored state, and
+    resets the accumulating per-turn fields instead of appending to the last
+    turn's.
+    """
+    update: Dict[str, Any] = {}
+    for key, value in state.items():
+        if key in SESSION_FIELDS and key != "messages":
+            continue
+        if key in CONTEXT_FIELDS and value is None:
+            continue
+        update[key] = Reset(value) if key in _PER_TURN_REDUCED_FIELDS else value
+    return update
+
+
+def conversation_text(state: Dict[str, Any]) -> str:
+    """What the user has said so far: every message of a session, or this turn's input"""
+    turns = [
+        message.content
+        for message in state.get("messages") or []
+        if message.type == "human" and isinstance(message.content, str)
+    ]
+    return "\n".join(turns) if turns else state.get("user_input", "")
+
+
+def merge_state(state: Dict[str, Any], *updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply node updates to a copy of a state the way the graph's reducers do"""
+    merged = dict(state)
+    for update in updates:
+        for key, value in update.items():
+            reducer = STATE_REDUCERS.get(key)
+            if isinstance(value, Reset):
+                merged[key] = value.value
+            elif reducer is not None and key in merged:
+                merged[key] = reducer(merged[key], value)
+            else:
+                merged[key] = value
+    return merged
 
 
 class SymptomAnalysisInput(TypedDict):
@@ -79,6 +219,13 @@ class SymptomAnalysisInput(TypedDict):
     allergies: Optional[List[str]]
     age: Optional[int]
     gender: Optional[str]
+    deadline: NotRequired[Optional[float]]
+
+
+class SymptomAnalysisEvent(TypedDict):
+    """One event of a streamed analysis"""
+    stage: str  # graph node that set ``data``, or "result" for the final output
+    data: Dict[str, Any]
 
 
 class SymptomAnalysisOutput(TypedDict):
@@ -91,3 +238,4 @@ class SymptomAnalysisOutput(TypedDict):
     when_to_see_doctor: str
     confidence_score: float
     processing_time: float
+    partial: bool
@@ -2,6 +2,8 @@
 
 from .models import (
     BatchAnalysisResponse,
+    BatchTriageFactsResponse,
+    BatchTriageHeuristicsResponse,
     CapabilityCatalogResponse,
     CareSettingRecommendationResponse,
     ClarificationQuestionsResponse,
@@ -12,7 +14,9 @@ from .models import (
     HealthStatus,
     MetricsSnapshotResponse,
     MonitoringScheduleResponse,
+    PopulationRiskResponse,
     RiskScoreResponse,
+    RulePackStatusResponse,
     RuntimeConfig,
     RuntimePolicyValidationResponse,
     SelfCarePlanResponse,
@@ -21,6 +25,7 @@ from .models import (
     SymptomComparisonResponse,
     TextRedactionResponse,
     TriageFactsResponse,
+    TriageHeuristicsRequest,
     TriageHeuristicsResponse,
     UrgencyExplanationResponse,
 )
@@ -29,6 +34,8 @@ from .service import SymptomSyncMCPService, service
 
 __all__ = [
     "BatchAnalysisResponse",
+    "BatchTriageFactsResponse",
+    "BatchTriageHeuristicsResponse",
     "CapabilityCatalogResponse",
     "CareSettingRecommendationResponse",
     "ClarificationQuestionsResponse",
@@ -39,7 +46,9 @@ __all__ = [
     "HealthStatus",
     "MetricsSnapshotResponse",
     "MonitoringScheduleResponse",
+    "PopulationRiskResponse",
     "RiskScoreResponse",
+    "RulePackStatusResponse",
     "RuntimeConfig",
     "RuntimePolicyValidationResponse",
     "SelfCarePlanResponse",
@@ -48,6 +57,7 @@ __all__ = [
     "SymptomAnalysisResponse",
     "TextRedactionResponse",
     "TriageFactsResponse",
+    "TriageHeuristicsRequest",
     "TriageHeuristicsResponse",
     "UrgencyExplanationResponse",
     "SymptomSyncMCPService",
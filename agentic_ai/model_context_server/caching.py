@@ -0,0 +1,134 @@
+"""Small in-process caches shared by MCP service helpers."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from threading import Lock
+from typing import Any, Generic, TypeVar
+
+import pydantic_core
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe bounded LRU mapping with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be > 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value and mark it most recently used."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key: K, factory: Callable[[], V]) -> V:
+        """Return the cached value, computing and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return counters and current size."""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class SerializedResource:
+    """A resource payload serialized once, with a strong content ETag."""
+
+    __slots__ = ("value", "text", "body", "etag", "media_type")
+
+    def __init__(self, value: Any, media_type: str) -> None:
+        self.value = value
+        # Same rendering FastMCP applies to non-string resource results.
+        self.text = value if isinstance(value, str) else pydantic_core.to_json(value, fallback=str, indent=2).decode()
+        self.body = self.text.encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()}"'
+        self.media_type = media_type
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Return True when an ``If-None-Match`` header names this payload."""
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*" or candidate.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+
+class VersionedCache:
+    """Keeps one value per name, rebuilt whenever its version key changes."""
+
+    def __init__(self) -> None:
+        self.builds = 0
+        self._entries: dict[str, tuple[Hashable, Any]] = {}
+        self._lock = Lock()
+
+    def peek(self, name: str, version: Hashable) -> Any | None:
+        """Return the value for ``name`` if it was built at ``version``."""
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        return None
+
+    def get_or_build(self, name: str, version: Hashable, factory: Callable[[], V]) -> V:
+        """Return the value for ``name`` at ``version``, building it on change."""
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        value = factory()
+        with self._lock:
+            self._entries[name] = (version, value)
+            self.builds += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+__all__ = ["LRUCache", "SerializedResource", "VersionedCache"]
@@ -6,9 +6,22 @@ even when external LLM providers are unavailable.
 
 from __future__ import annotations
 
+import hashlib
 import re
+from types import MappingProxyType
 from typing import Any
 
+from .caching import LRUCache
+from .redaction import (  # noqa: F401 - re-exported pattern constants
+    DOB_PATTERN,
+    EMAIL_PATTERN,
+    MRN_PATTERN,
+    PHONE_PATTERN,
+    SSN_PATTERN,
+    redact_text,
+)
+from .rule_pack import CompiledRulePack, RulePackRegistry, RulePackSpec
+
 URGENCY_RANK = {
     "low": 0,
     "medium": 1,
@@ -17,18 +30,25 @@ URGENCY_RANK = {
 }
 
 RED_FLAG_PATTERNS: dict[str, tuple[str, ...]] = {
-    "chest pain": ("chest pain", "pressure in chest", "crushing chest pain"),
-    "difficulty breathing": ("shortness of breath", "trouble breathing", "can't breathe"),
+    "chest pain": ("chest pain", "chest pains", "pressure in chest", "crushing chest pain"),
+    "difficulty breathing": (
+        "shortness of breath",
+        "trouble breathing",
+        "can't breathe",
+        "cannot breathe",
+        "cant breathe",
+    ),
     "stroke-like symptoms": (
         "face drooping",
+        "face droops",
         "slurred speech",
         "one-sided weakness",
         "numbness one side",
     ),
     "severe bleeding": ("severe bleeding", "won't stop bleeding", "blood everywhere"),
-    "loss of consciousness": ("passed out", "unconscious", "fainted and not waking"),
-    "seizure activity": ("seizure", "convulsion"),
-    "suicidal ideation": ("suicidal", "want to die", "harm myself"),
+    "loss of consciousness": ("passed out", "passing out", "unconscious", "fainted and not waking"),
+    "seizure activity": ("seizure", "seizures", "seizing", "convulsion", "convulsions", "convulsing"),
+    "suicidal ideation": ("suicidal", "want to die", "wants to die", "harm myself", "harming myself"),
 }
 
 RISK_CONDITION_WEIGHTS: dict[str, int] = {
@@ -42,20 +62,60 @@ RISK_CONDITION_WEIGHTS: dict[str, int] = {
     "asthma": 6,
 }
 
+# Phrases match whole tokens, so inflected forms are listed explicitly.
 SYMPTOM_HINTS: dict[str, tuple[str, ...]] = {
-    "fever": ("fever", "temperature", "chills"),
-    "headache": ("headache", "migraine", "head pain"),
-    "dizziness": ("dizzy", "lightheaded", "vertigo"),
-    "nausea": ("nausea", "queasy"),
-    "vomiting": ("vomit", "throwing up"),
-    "diarrhea": ("diarrhea", "loose stool"),
+    "fever": ("fever", "fevers", "feverish", "temperature", "chills"),
+    "headache": ("headache", "headaches", "migraine", "migraines", "head pain"),
+    "dizziness": ("dizzy", "dizziness", "lightheaded", "light-headed", "vertigo"),
+    "nausea": ("nausea", "nauseous", "nauseated", "queasy"),
+    "vomiting": ("vomit", "vomits", "vomited", "vomiting", "throwing up", "threw up"),
+    "diarrhea": ("diarrhea", "loose stool", "loose stools"),
     "sore throat": ("sore throat", "throat pain"),
-    "cough": ("cough", "coughing"),
-    "fatigue": ("fatigue", "tired", "exhausted"),
-    "rash": ("rash", "hives", "skin breakout"),
-    "abdominal pain": ("abdominal pain", "stomach pain", "belly pain"),
+    "cough": ("cough", "coughs", "coughing", "coughed"),
+    "fatigue": ("fatigue", "fatigued", "tired", "exhausted"),
+    "rash": ("rash", "rashes", "hives", "skin breakout"),
+    "abdominal pain": ("abdominal pain", "stomach pain", "stomach ache", "stomachache", "belly pain"),
+}
+
+# Context terms are reported even when negated ("no fever" still mentions fever).
+CONTEXT_TERMS: dict[str, tuple[str, ...]] = {
+    "fever": ("fever", "fevers", "feverish", "temperature"),
+    "pain": ("pain", "pains", "painful"),
+    "worsening": ("worse", "worsening", "worsened", "progressive"),
+    "nighttime": ("night", "nights", "nighttime", "tonight", "overnight"),
+    "today": ("today",),
+    "yesterday": ("yesterday",),
 }
 
+NEGATION_CUES: tuple[str, ...] = (
+    "no",
+    "not",
+    "denies",
+    "denied",
+    "deny",
+    "without",
+    "never",
+    "negative for",
+    "free of",
+    "don't",
+    "doesn't",
+    "didn't",
+    "haven't",
+    "hasn't",
+)
+
+# Red flags are only hidden by these cues placed directly before the phrase;
+# "never had chest pain this bad" or "not helping my chest pain" still report it.
+RED_FLAG_NEGATION_CUES: tuple[str, ...] = (
+    "no",
+    "denies",
+    "denied",
+    "deny",
+    "without",
+    "negative for",
+    "free of",
+)
+
 SELF_CARE_LIBRARY: dict[str, list[str]] = {
     "fever": ["Stay hydrated with water or oral rehydration fluids.", "Rest and monitor temperature trends."],
     "headache": ["Rest in a quiet, dark room.", "Limit screen exposure and hydrate."],
@@ -90,32 +150,197 @@ URGENCY_EXPLANATIONS = {
     "emergency": "Potentially life-threatening warning signs are present.",
 }
 
-EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
-PHONE_PATTERN = re.compile(r"\b(?:\+1[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?){2}\d{4}\b")
-SSN_PATTERN = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
-DOB_PATTERN = re.compile(r"\b(?:19|20)\d{2}[-/](?:0?[1-9]|1[0-2])[-/](?:0?[1-9]|[12]\d|3[01])\b")
-MRN_PATTERN = re.compile(r"\b(?:mrn|medical record number)[:\s#-]*[A-Za-z0-9-]{4,}\b", re.IGNORECASE)
+IMMEDIATE_ACTIONS = {
+    "low": ["Continue monitoring at home.", "Use conservative self-care measures."],
+    "medium": ["Arrange prompt outpatient review.", "Track symptom progression closely."],
+    "high": ["Seek urgent in-person medical evaluation today.", "Do not delay care if worsening."],
+    "emergency": ["Call emergency services immediately.", "Do not self-transport if unstable."],
+}
+
+ELEVATED_RISK_CONDITIONS = ("pregnancy", "heart disease", "copd", "diabetes", "immunocompromised", "cancer")
+
+# The tables above are the built-in rule pack. Helpers read the active compiled
+# pack, which an operator can replace at runtime (see ``load_rule_pack``).
+BUILTIN_RULE_PACK = RulePackSpec(
+    version="builtin",
+    description="Rule tables bundled with decision_support.",
+    red_flags={flag: list(phrases) for flag, phrases in RED_FLAG_PATTERNS.items()},
+    symptom_hints={symptom: list(phrases) for symptom, phrases in SYMPTOM_HINTS.items()},
+    context_terms={term: list(phrases) for term, phrases in CONTEXT_TERMS.items()},
+    negation_cues=list(NEGATION_CUES),
+    red_flag_negation_cues=list(RED_FLAG_NEGATION_CUES),
+    risk_condition_weights=RISK_CONDITION_WEIGHTS,
+    elevated_risk_conditions=list(ELEVATED_RISK_CONDITIONS),
+    self_care=SELF_CARE_LIBRARY,
+    general_monitoring=GENERAL_MONITORING,
+    seek_care_thresholds=SEEK_CARE_THRESHOLDS,
+    urgency_explanations=URGENCY_EXPLANATIONS,
+    immediate_actions=IMMEDIATE_ACTIONS,
+)
+
+rule_packs = RulePackRegistry(BUILTIN_RULE_PACK)
+
+SEVERITY_PATTERN = re.compile(r"\b([0-9]|10)\s*/\s*10\b")
+DURATION_PATTERN = re.compile(r"\b(\d+)\s*(hour|hours|day|days|week|weeks|month|months)\b")
+TIMEFRAME_PATTERN = re.compile(r"\b(hour|hours|day|days|week|weeks|month|months|today|yesterday)\b")
+
+TEXT_ANALYSIS_CACHE_SIZE = 1024
+# Confidence reported for escalations made by the phrase screen alone.
+RED_FLAG_SCREEN_CONFIDENCE = 0.9
+# Keyword triage without a red flag cannot rule conditions in or out.
+HEURISTIC_ANALYSIS_CONFIDENCE = 0.4
 
 
 def _lower(text: str) -> str:
     return text.lower().strip()
 
 
-def _contains_any(text: str, phrases: tuple[str, ...]) -> bool:
-    return any(phrase in text for phrase in phrases)
+class TextAnalysis:
+    """Immutable result of normalizing and scanning one free-text input.
+
+    Built once per distinct text by ``analyze_text`` and shared by every
+    text-based helper, so repeated tool calls on the same user message do not
+    re-run the phrase and regex scans.
+    """
+
+    __slots__ = (
+        "normalized_text",
+        "symptoms",
+        "red_flags",
+        "severity",
+        "duration",
+        "context_flags",
+        "mentions_timeframe",
+    )
+
+    normalized_text: str
+    symptoms: tuple[str, ...]
+    red_flags: tuple[str, ...]
+    severity: int | None
+    duration: str | None
+    context_flags: MappingProxyType[str, bool]
+    mentions_timeframe: bool
+
+    def __init__(
+        self,
+        normalized_text: str,
+        symptoms: tuple[str, ...],
+        red_flags: tuple[str, ...],
+        severity: int | None,
+        duration: str | None,
+        context_flags: dict[str, bool],
+        mentions_timeframe: bool,
+    ) -> None:
+        set_attr = object.__setattr__
+        set_attr(self, "normalized_text", normalized_text)
+        set_attr(self, "symptoms", symptoms)
+        set_attr(self, "red_flags", red_flags)
+        set_attr(self, "severity", severity)
+        set_attr(self, "duration", duration)
+        set_attr(self, "context_flags", MappingProxyType(dict(context_flags)))
+        set_attr(self, "mentions_timeframe", mentions_timeframe)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("TextAnalysis is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("TextAnalysis is immutable")
+
+    def __repr__(self) -> str:
+        return (
+            f"TextAnalysis(symptoms={self.symptoms!r}, red_flags={self.red_flags!r}, "
+            f"severity={self.severity!r}, duration={self.duration!r})"
+        )
+
+
+_text_analysis_cache: LRUCache[tuple[int, bytes], TextAnalysis] = LRUCache(TEXT_ANALYSIS_CACHE_SIZE)
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _build_text_analysis(user_input: str, pack: CompiledRulePack) -> TextAnalysis:
+    normalized = _lower(user_input)
+    matched = pack.matcher.scan(normalized)
+    context_terms = matched["context"]
+
+    severity_match = SEVERITY_PATTERN.search(normalized)
+    duration_match = DURATION_PATTERN.search(normalized)
+    duration = None
+    if duration_match:
+        duration = f"{duration_match.group(1)} {duration_match.group(2)}"
+    elif "today" in context_terms:
+        duration = "today"
+    elif "yesterday" in context_terms:
+        duration = "since yesterday"
+
+    return TextAnalysis(
+        normalized_text=normalized,
+        symptoms=tuple(sorted(matched["symptoms"])),
+        red_flags=tuple(flag for flag in pack.red_flag_order if flag in matched["red_flags"]),
+        severity=int(severity_match.group(1)) if severity_match else None,
+        duration=duration,
+        context_flags={
+            "mentions_fever": "fever" in context_terms,
+            "mentions_pain": "pain" in context_terms,
+            "mentions_worsening": "worsening" in context_terms,
+            "mentions_nighttime": "nighttime" in context_terms,
+        },
+        mentions_timeframe=TIMEFRAME_PATTERN.search(normalized) is not None,
+    )
+
+
+def analyze_text(user_input: str) -> TextAnalysis:
+    """Return the memoized deterministic analysis for free text."""
+    pack = rule_packs.active
+    # Keying on the pack generation keeps a result computed under a pack that
+    # is being swapped out from being served after the swap.
+    return _text_analysis_cache.get_or_set(
+        (pack.generation, _text_key(user_input)),
+        lambda: _build_text_analysis(user_input, pack),
+    )
+
+
+def text_analysis_cache_stats() -> dict[str, int]:
+    """Return hit/miss/eviction counters for the text analysis cache."""
+    return _text_analysis_cache.stats()
+
+
+def active_rule_pack() -> CompiledRulePack:
+    """Return the compiled rule pack currently used by the triage helpers."""
+    return rule_packs.active
+
+
+def load_rule_pack(
+    document: dict[str, Any] | None = None,
+    path: str | None = None,
+) -> CompiledRulePack:
+    """Validate and activate a rule pack; omitted sections keep built-in values."""
+    return rule_packs.load(document=document, path=path)
+
+
+def reset_rule_pack() -> CompiledRulePack:
+    """Reactivate the built-in rule pack."""
+    return rule_packs.reset()
+
+
+def install_rule_pack(spec: dict[str, Any], source: str) -> None:
+    """Activate an already validated pack, e.g. when initializing a pool worker."""
+    rule_packs.install(RulePackSpec.model_validate(spec), source=source)
+
+
+rule_packs.add_listener(lambda pack: _text_analysis_cache.clear())
 
 
 def detect_red_flags(user_input: str) -> list[str]:
     """Detect high-risk symptom phrases from free text."""
-    normalized = _lower(user_input)
-    return [flag for flag, patterns in RED_FLAG_PATTERNS.items() if _contains_any(normalized, patterns)]
+    return list(analyze_text(user_input).red_flags)
 
 
 def infer_symptoms(user_input: str) -> list[str]:
     """Infer normalized symptom names using keyword hints."""
-    normalized = _lower(user_input)
-    symptoms = [symptom for symptom, patterns in SYMPTOM_HINTS.items() if _contains_any(normalized, patterns)]
-    return sorted(set(symptoms))
+    return list(analyze_text(user_input).symptoms)
 
 
 def _escalate_level(level: str) -> str:
@@ -151,7 +376,7 @@ def suggest_urgency(
         reasons.append("No severe indicators from severity input.")
         urgency = "low"
 
-    elevated_risk_conditions = {"pregnancy", "heart disease", "copd", "diabetes", "immunocompromised", "cancer"}
+    elevated_risk_conditions = rule_packs.active.elevated_risk_conditions
     if any(condition in elevated_risk_conditions for condition in conditions):
         urgency = _escalate_level(urgency)
         reasons.append("Known high-risk condition present; urgency escalated.")
@@ -159,6 +384,39 @@ def suggest_urgency(
     return urgency, reasons
 
 
+def triage_heuristics(
+    user_input: str,
+    severity_hint: int | None = None,
+    known_conditions: list[str] | None = None,
+) -> dict[str, Any]:
+    """Run deterministic triage heuristics on free text."""
+    analysis = analyze_text(user_input)
+    urgency, reasons = suggest_urgency(
+        red_flags=list(analysis.red_flags),
+        severity_hint=severity_hint,
+        known_conditions=known_conditions,
+    )
+    next_step = (
+        "Seek emergency care immediately."
+        if urgency == "emergency"
+        else "Use symptom monitoring and seek care per urgency guidance."
+    )
+    return {
+        "detected_symptoms": list(analysis.symptoms),
+        "detected_red_flags": list(analysis.red_flags),
+        "suggested_urgency": urgency,
+        "rationale": reasons,
+        "recommended_next_step": next_step,
+    }
+
+
+def triage_heuristics_batch(
+    items: list[tuple[str, int | None, list[str] | None]],
+) -> list[dict[str, Any]]:
+    """Run triage heuristics over (text, severity_hint, known_conditions) items."""
+    return [triage_heuristics(text, severity, conditions) for text, severity, conditions in items]
+
+
 def build_clarification_questions(
     user_input: str,
     age: int | None = None,
@@ -170,8 +428,8 @@ def build_clarification_questions(
     """Generate clarification questions for missing triage context."""
     questions: list[str] = []
     missing_fields: list[str] = []
-    inferred = infer_symptoms(user_input)
-    red_flags = detect_red_flags(user_input)
+    analysis = analyze_text(user_input)
+    inferred = list(analysis.symptoms)
 
     if not inferred:
         questions.append("Can you describe the main symptom(s) in one sentence?")
@@ -179,7 +437,7 @@ def build_clarification_questions(
         questions.append(f"When did these symptoms start: {', '.join(inferred)}?")
         questions.append("How severe are these symptoms on a 0-10 scale?")
 
-    if not re.search(r"\b(hour|hours|day|days|week|weeks|month|months|today|yesterday)\b", _lower(user_input)):
+    if not analysis.mentions_timeframe:
         questions.append("How long have these symptoms been present?")
 
     if age is None:
@@ -198,7 +456,7 @@ def build_clarification_questions(
         missing_fields.append("allergies")
         questions.append("Any known medication or food allergies?")
 
-    if red_flags:
+    if analysis.red_flags:
         questions.insert(0, "Are life-threatening symptoms active right now (severe chest pain, breathing trouble, stroke signs)?")
 
     deduped_questions = list(dict.fromkeys(questions))
@@ -207,41 +465,21 @@ def build_clarification_questions(
 
 def extract_triage_facts(user_input: str) -> dict[str, Any]:
     """Extract structured triage facts from free-text input."""
-    normalized = _lower(user_input)
-    red_flags = detect_red_flags(user_input)
-    symptoms = infer_symptoms(user_input)
-
-    severity_match = re.search(r"\b([0-9]|10)\s*/\s*10\b", normalized)
-    inferred_severity = int(severity_match.group(1)) if severity_match else None
-
-    duration_match = re.search(
-        r"\b(\d+)\s*(hour|hours|day|days|week|weeks|month|months)\b",
-        normalized,
-    )
-    inferred_duration = None
-    if duration_match:
-        inferred_duration = f"{duration_match.group(1)} {duration_match.group(2)}"
-    elif "today" in normalized:
-        inferred_duration = "today"
-    elif "yesterday" in normalized:
-        inferred_duration = "since yesterday"
-
-    context = {
-        "mentions_fever": "fever" in normalized or "temperature" in normalized,
-        "mentions_pain": "pain" in normalized,
-        "mentions_worsening": any(term in normalized for term in ("worse", "worsening", "progressive")),
-        "mentions_nighttime": "night" in normalized,
-    }
-
+    analysis = analyze_text(user_input)
     return {
-        "inferred_symptoms": symptoms,
-        "inferred_duration": inferred_duration,
-        "inferred_severity": inferred_severity,
-        "inferred_context": context,
-        "red_flags": red_flags,
+        "inferred_symptoms": list(analysis.symptoms),
+        "inferred_duration": analysis.duration,
+        "inferred_severity": analysis.severity,
+        "inferred_context": dict(analysis.context_flags),
+        "red_flags": list(analysis.red_flags),
     }
 
 
+def extract_triage_facts_batch(texts: list[str]) -> list[dict[str, Any]]:
+    """Extract triage facts for many free-text inputs, preserving order."""
+    return [extract_triage_facts(text) for text in texts]
+
+
 def summarize_handoff(
     user_input: str,
     analysis: dict[str, Any],
@@ -364,10 +602,11 @@ def compute_risk_score(
         score += 8
         factors.append("Moderate severity score (5-7/10).")
 
+    weights = rule_packs.active.risk_condition_weights
     for condition in (known_conditions or []):
         key = condition.lower().strip()
-        if key in RISK_CONDITION_WEIGHTS:
-            score += RISK_CONDITION_WEIGHTS[key]
+        if key in weights:
+            score += weights[key]
             factors.append(f"Risk condition detected: {condition}.")
 
     score = max(0, min(100, score))
@@ -392,22 +631,67 @@ def compute_risk_score(
     }
 
 
+def _age_band(age: int | None) -> int:
+    if age is None:
+        return 0
+    if age >= 75:
+        return 1
+    if age >= 60:
+        return 2
+    if age <= 5:
+        return 3
+    return 0
+
+
+def _severity_band(severity_hint: int | None) -> int:
+    severity = max(0, min(10, severity_hint or 0))
+    return 2 if severity >= 8 else 1 if severity >= 5 else 0
+
+
+def risk_score_key(
+    urgency_level: str,
+    red_flags: list[str],
+    age: int | None = None,
+    known_conditions: list[str] | None = None,
+    severity_hint: int | None = None,
+) -> tuple[Any, ...]:
+    """Reduce ``compute_risk_score`` inputs to the parts that affect its output.
+
+    Inputs with equal keys produce identical results under the same rule pack.
+    """
+    urgency = urgency_level if urgency_level in URGENCY_RANK else "medium"
+    return (
+        urgency,
+        min(len(red_flags), 3),
+        _age_band(age),
+        _severity_band(severity_hint),
+        tuple(known_conditions or ()),
+    )
+
+
+def care_setting_key(urgency_level: str, risk_score: int, has_primary_care: bool = True) -> tuple[str, int, bool]:
+    """Normalize ``recommend_care_setting`` inputs; the domain has 808 keys."""
+    urgency = urgency_level if urgency_level in URGENCY_RANK else "medium"
+    return urgency, max(0, min(100, risk_score)), bool(has_primary_care)
+
+
+def monitoring_schedule_key(
+    symptoms: list[str],
+    urgency_level: str,
+    red_flags: list[str] | None = None,
+) -> tuple[str, bool, bool]:
+    """Reduce ``build_monitoring_schedule`` inputs to the parts that affect its output."""
+    urgency = urgency_level if urgency_level in URGENCY_RANK else "medium"
+    normalized = {s.lower() for s in symptoms}
+    flags = {f.lower() for f in (red_flags or [])}
+    return urgency, "fever" in normalized, "difficulty breathing" in flags or "cough" in normalized
+
+
 def explain_urgency(urgency_level: str) -> dict[str, Any]:
     """Provide structured urgency explanation and action guidance."""
     urgency = urgency_level if urgency_level in URGENCY_RANK else "medium"
-    immediate_actions = {
-        "low": ["Continue monitoring at home.", "Use conservative self-care measures."],
-        "medium": ["Arrange prompt outpatient review.", "Track symptom progression closely."],
-        "high": ["Seek urgent in-person medical evaluation today.", "Do not delay care if worsening."],
-        "emergency": ["Call emergency services immediately.", "Do not self-transport if unstable."],
-    }[urgency]
-
-    return {
-        "urgency_level": urgency,
-        "explanation": URGENCY_EXPLANATIONS[urgency],
-        "immediate_actions": immediate_actions,
-        "seek_care_threshold": SEEK_CARE_THRESHOLDS[urgency],
-    }
+    response = rule_packs.active.urgency_responses[urgency]
+    return {**response, "immediate_actions": list(response["immediate_actions"])}
 
 
 def recommend_care_setting(
@@ -454,10 +738,11 @@ def build_self_care_plan(
     """Build a safety-oriented self-care plan."""
     urgency = urgency_level if urgency_level in URGENCY_RANK else "medium"
     normalized_symptoms = [item.lower() for item in symptoms]
+    pack = rule_packs.active
 
     actions: list[str] = []
     for symptom in normalized_symptoms:
-        actions.extend(SELF_CARE_LIBRARY.get(symptom, []))
+        actions.extend(pack.self_care.get(symptom, ()))
 
     if not actions:
         actions.extend(
@@ -481,7 +766,7 @@ def build_self_care_plan(
         "urgency_level": urgency,
         "actions": actions if urgency in {"low", "medium"} else ["Prioritize urgent medical evaluation over home care."],
         "avoid": avoid,
-        "monitoring": GENERAL_MONITORING,
+        "monitoring": list(pack.general_monitoring),
     }
     return plan
 
@@ -555,41 +840,140 @@ def emergency_checklist(red_flags: list[str]) -> dict[str, Any]:
     }
 
 
-def redact_sensitive_text(text: str) -> dict[str, Any]:
-    """Redact common PII patterns from free text."""
-    redaction_types: list[str] = []
-    redacted = text
-
-    replacements = [
-        ("email", EMAIL_PATTERN, "[REDACTED_EMAIL]"),
-        ("phone", PHONE_PATTERN, "[REDACTED_PHONE]"),
-        ("ssn", SSN_PATTERN, "[REDACTED_SSN]"),
-        ("dob", DOB_PATTERN, "[REDACTED_DOB]"),
-        ("mrn", MRN_PATTERN, "[REDACTED_MRN]"),
-    ]
+def red_flag_emergency_analysis(user_input: str) -> dict[str, Any] | None:
+    """Build an emergency analysis from red flags alone; None when there are none.
 
-    redaction_count = 0
-    for label, pattern, replacement in replacements:
-        matches = pattern.findall(redacted)
-        if matches:
-            redaction_types.append(label)
-            redaction_count += len(matches)
-            redacted = pattern.sub(replacement, redacted)
+    Fields mirror ``SymptomAnalysisResponse`` (minus ``processing_time``) so
+    the service can answer before running the LLM graph.
+    """
+    analysis = analyze_text(user_input)
+    if not analysis.red_flags:
+        return None
+    checklist = emergency_checklist(list(analysis.red_flags))
+    urgency = explain_urgency("emergency")
+    return {
+        "symptoms": list(analysis.symptoms),
+        "preliminary_diagnosis": [],
+        "risk_assessment": {
+            "risk_level": "critical",
+            "red_flags": checklist["detected_red_flags"],
+            "explanation": urgency["explanation"],
+            "emergency_contacts": checklist["emergency_contacts"],
+            "source": "red_flag_screen",
+        },
+        "urgency_level": "emergency",
+        "recommendations": list(dict.fromkeys(checklist["immediate_steps"] + urgency["immediate_actions"])),
+        "when_to_see_doctor": urgency["seek_care_threshold"],
+        "confidence_score": RED_FLAG_SCREEN_CONFIDENCE,
+    }
 
+
+def heuristic_analysis(
+    user_input: str,
+    age: int | None = None,
+    known_conditions: list[str] | None = None,
+    allergies: list[str] | None = None,
+    current_medications: list[str] | None = None,
+) -> dict[str, Any]:
+    """Build a complete analysis from deterministic rules only (no LLM).
+
+    Fields mirror ``SymptomAnalysisResponse`` (minus ``processing_time``).
+    """
+    emergency = red_flag_emergency_analysis(user_input)
+    if emergency is not None:
+        return emergency
+
+    analysis = analyze_text(user_input)
+    urgency, reasons = suggest_urgency([], analysis.severity, known_conditions)
+    risk = compute_risk_score(urgency, [], age, known_conditions, analysis.severity)
+    if URGENCY_RANK[risk["suggested_urgency"]] > URGENCY_RANK[urgency]:
+        urgency = risk["suggested_urgency"]
+        reasons.append("Risk score raised the urgency level.")
+    guidance = explain_urgency(urgency)
+    plan = build_self_care_plan(list(analysis.symptoms), urgency, allergies, current_medications)
     return {
-        "redacted_text": redacted,
-        "redaction_count": redaction_count,
-        "redaction_types": redaction_types,
+        "symptoms": list(analysis.symptoms),
+        "preliminary_diagnosis": [],
+        "risk_assessment": {
+            "risk_level": risk["risk_tier"],
+            "risk_score": risk["risk_score"],
+            "risk_factors": reasons + risk["contributing_factors"],
+            "source": "heuristics",
+        },
+        "urgency_level": urgency,
+        "recommendations": list(dict.fromkeys(guidance["immediate_actions"] + plan["actions"])),
+        "when_to_see_doctor": guidance["seek_care_threshold"],
+        "confidence_score": HEURISTIC_ANALYSIS_CONFIDENCE,
     }
 
 
-def urgency_matrix() -> dict[str, Any]:
-    """Return urgency matrix for client rendering."""
+def refine_heuristic_analysis(baseline: dict[str, Any], refinement: dict[str, Any]) -> dict[str, Any]:
+    """Merge a compact LLM refinement into a ``heuristic_analysis`` result.
+
+    The LLM may add symptoms, possible conditions, and advice, and may raise
+    urgency, but never lowers it below the deterministic level.
+    """
+    urgency = baseline["urgency_level"]
+    suggested = str(refinement.get("urgency_level", "")).lower()
+    if URGENCY_RANK.get(suggested, -1) > URGENCY_RANK[urgency]:
+        urgency = suggested
+    guidance = explain_urgency(urgency)
+
+    symptoms = [str(item).lower().strip() for item in refinement.get("symptoms") or [] if str(item).strip()]
+    try:
+        confidence = float(refinement.get("confidence", baseline["confidence_score"]))
+    except (TypeError, ValueError):
+        confidence = baseline["confidence_score"]
+    advice = [str(item) for item in refinement.get("recommendations") or []]
     return {
-        level: {
-            "rank": rank,
-            "explanation": URGENCY_EXPLANATIONS[level],
-            "seek_care_threshold": SEEK_CARE_THRESHOLDS[level],
-        }
-        for level, rank in URGENCY_RANK.items()
+        "symptoms": list(dict.fromkeys(baseline["symptoms"] + symptoms)),
+        "preliminary_diagnosis": [str(item) for item in refinement.get("possible_conditions") or []][:3],
+        "risk_assessment": {**baseline["risk_assessment"], "source": "fast"},
+        "urgency_level": urgency,
+        "recommendations": list(dict.fromkeys(guidance["immediate_actions"] + advice + baseline["recommendations"])),
+        "when_to_see_doctor": guidance["seek_care_threshold"],
+        "confidence_score": max(0.0, min(1.0, confidence)),
     }
+
+
+def complete_partial_analysis(baseline: dict[str, Any], partial: dict[str, Any]) -> dict[str, Any]:
+    """Fill the gaps of a graph run cut short by its deadline.
+
+    Whatever the graph produced is kept; fields from stages that never ran
+    come from the ``heuristic_analysis`` baseline, and urgency is never lower
+    than the deterministic level.
+    """
+    urgency = baseline["urgency_level"]
+    reported = str(partial.get("urgency_level") or "").lower()
+    if URGENCY_RANK.get(reported, -1) > URGENCY_RANK[urgency]:
+        urgency = reported
+    guidance = explain_urgency(urgency)
+    when_to_see_doctor = partial.get("when_to_see_doctor") if urgency == reported else None
+    # An incomplete run is no more certain than the rules alone.
+    confidence = min(float(partial.get("confidence_score") or 1.0), baseline["confidence_score"])
+
+    return {
+        "symptoms": list(dict.fromkeys(list(partial.get("symptoms") or []) + baseline["symptoms"])),
+        "preliminary_diagnosis": list(partial.get("preliminary_diagnosis") or []),
+        "risk_assessment": partial.get("risk_assessment") or baseline["risk_assessment"],
+        "urgency_level": urgency,
+        "recommendations": list(
+            dict.fromkeys(
+                guidance["immediate_actions"]
+                + list(partial.get("recommendations") or [])
+                + baseline["recommendations"]
+            )
+        ),
+        "when_to_see_doctor": when_to_see_doctor or guidance["seek_care_threshold"],
+        "confidence_score": confidence,
+    }
+
+
+def redact_sensitive_text(text: str) -> dict[str, Any]:
+    """Redact common PII patterns from free text."""
+    return redact_text(text)
+
+
+def urgency_matrix() -> dict[str, Any]:
+    """Return urgency matrix for client rendering."""
+    return {level: dict(row) for level, row in rule_packs.active.urgency_matrix.items()}
@@ -2,25 +2,43 @@
 
 from __future__ import annotations
 
+import json
+import math
 import secrets
 import time
 import uuid
 from collections import deque
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from threading import Lock
+from typing import Any
 
 import structlog
 from fastapi import FastAPI, HTTPException, Request, Response, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from pydantic import BaseModel, Field
 
 try:
     from ..config.settings import settings
+    from ..utils.concurrency import AdmissionRejectedError
+    from ..utils.llm_clients import llm_clients
+    from ..utils.monitoring import metrics as service_metrics
 except ImportError:
     from config.settings import settings
+    from utils.concurrency import AdmissionRejectedError
+    from utils.llm_clients import llm_clients
+    from utils.monitoring import metrics as service_metrics
 from .mcp_instance import mcp
-from .models import HealthStatus
+from .models import AnalysisStreamEvent, BatchItemResult, HealthStatus, SymptomAnalysisRequest
 from .service import service
+from .static_resources import STATIC_RESOURCES
+
+_RESOURCE_URI_PREFIX = "symptomsync://"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+_BATCH_STREAM_PATH = "/batch/analyze/stream"
+_ANALYSIS_STREAM_PATH = "/analyze/stream"
 
 logger = structlog.get_logger()
 
@@ -66,6 +84,56 @@ def _is_rate_limited(key: str, limit: int) -> bool:
         return False
 
 
+class BatchStreamRequest(BaseModel):
+    """Body of the NDJSON batch analysis endpoint."""
+
+    requests: list[dict[str, Any]]
+    timeout_seconds: float | None = Field(default=None, gt=0)
+
+
+async def _ndjson_batch_lines(
+    first: BatchItemResult,
+    items: AsyncIterator[BatchItemResult],
+    start_time: float,
+) -> AsyncIterator[str]:
+    """Yield one JSON line per finished item, then a summary line."""
+    finished = [first]
+    yield json.dumps({"type": "item", **first.model_dump(mode="json")}) + "\n"
+    async for item in items:
+        finished.append(item)
+        yield json.dumps({"type": "item", **item.model_dump(mode="json")}) + "\n"
+    summary = service.streaming_batch_summary(finished, time.time() - start_time)
+    yield json.dumps({"type": "summary", **summary.model_dump(mode="json", exclude={"items"})}) + "\n"
+
+
+def _stream_frame(payload: dict[str, Any], sse: bool) -> str:
+    """Encode one event as an SSE message named after its type, or as an NDJSON line."""
+    data = json.dumps(payload)
+    if sse:
+        return f"event: {payload['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+async def _analysis_stream_frames(
+    first: AnalysisStreamEvent,
+    events: AsyncIterator[AnalysisStreamEvent],
+    sse: bool,
+) -> AsyncIterator[str]:
+    """Yield one frame per finished stage, then the result."""
+    yield _stream_frame(first.model_dump(mode="json", exclude_none=True), sse)
+    async for event in events:
+        yield _stream_frame(event.model_dump(mode="json", exclude_none=True), sse)
+
+
+def _overloaded_response(retry_after: float) -> JSONResponse:
+    """503 telling the client when to retry a shed analysis."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server overloaded", "retry_after_seconds": math.ceil(retry_after)},
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
+
+
 def _request_context_middleware(
     request: Request,
     call_next: Callable[[Request], Awaitable[Response]],
@@ -142,6 +210,32 @@ def _rate_limit_middleware(
     return _inner()
 
 
+def _is_analysis_path(path: str) -> bool:
+    """Return True for the streaming endpoints that start LLM analyses.
+
+    The MCP endpoint is not shed here: it also carries session setup, listing,
+    and deterministic tools, and JSON-RPC reports its shed analysis tools as
+    tool errors inside a 200 response.
+    """
+    return path.rstrip("/") in {_BATCH_STREAM_PATH, _ANALYSIS_STREAM_PATH}
+
+
+def _load_shed_middleware(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]],
+):
+    """Reject analysis requests with 503 while admission control is saturated."""
+
+    async def _inner():
+        if request.method != "POST" or not _is_analysis_path(request.url.path) or not service.admission.saturated:
+            return await call_next(request)
+
+        service_metrics.record_load_shed("gateway")
+        return _overloaded_response(service.admission.retry_after())
+
+    return _inner()
+
+
 def _metrics_middleware(
     request: Request,
     call_next: Callable[[Request], Awaitable[Response]],
@@ -166,6 +260,16 @@ def _metrics_middleware(
     return _inner()
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start the opt-in warm-up; each worker process warms its own graph."""
+    if settings.mcp_warmup_enabled:
+        service.start_warmup()
+    yield
+    await service.stop_warmup()
+    await llm_clients.aclose()
+
+
 def create_http_app() -> FastAPI:
     """Create an HTTP app with health/metrics plus mounted MCP routes."""
     with _rate_limit_lock:
@@ -175,9 +279,11 @@ def create_http_app() -> FastAPI:
         title=f"{settings.app_name} MCP Gateway",
         description="HTTP gateway for SymptomSync's standalone MCP server",
         version=settings.app_version,
+        lifespan=_lifespan,
     )
 
     app.middleware("http")(_request_context_middleware)
+    app.middleware("http")(_load_shed_middleware)
     app.middleware("http")(_auth_middleware)
     app.middleware("http")(_rate_limit_middleware)
     app.middleware("http")(_metrics_middleware)
@@ -203,6 +309,51 @@ def create_http_app() -> FastAPI:
             raise HTTPException(status_code=404, detail="Metrics disabled")
         return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
+    # Both streams wait for their first entry before sending headers, so a
+    # request shed by admission control still gets a 503 instead of a 200.
+    @app.post(_BATCH_STREAM_PATH)
+    async def stream_batch_analysis(body: BatchStreamRequest) -> Response:
+        try:
+            requests = service.parse_batch_requests(body.requests)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        start_time = time.time()
+        items = service.stream_batch_analysis(requests, body.timeout_seconds)
+        try:
+            first = await anext(items)
+        except AdmissionRejectedError as exc:
+            return _overloaded_response(exc.retry_after)
+        return StreamingResponse(
+            _ndjson_batch_lines(first, items, start_time),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    @app.post(_ANALYSIS_STREAM_PATH)
+    async def stream_analysis(body: SymptomAnalysisRequest, request: Request) -> Response:
+        sse = SSE_MEDIA_TYPE in request.headers.get("accept", "")
+        events = service.stream_analysis(body)
+        try:
+            first = await anext(events)
+        except AdmissionRejectedError as exc:
+            return _overloaded_response(exc.retry_after)
+        return StreamingResponse(
+            _analysis_stream_frames(first, events, sse),
+            media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    @app.get("/resources/{resource_path:path}")
+    async def static_resource(resource_path: str, request: Request) -> Response:
+        build = STATIC_RESOURCES.get(f"{_RESOURCE_URI_PREFIX}{resource_path}")
+        if build is None:
+            raise HTTPException(status_code=404, detail="Unknown resource")
+        resource = await build()
+        headers = {"ETag": resource.etag, "Cache-Control": "no-cache"}
+        if resource.matches(request.headers.get("if-none-match")):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=resource.body, media_type=resource.media_type, headers=headers)
+
     @app.get("/")
     async def root() -> dict[str, str]:
         return {
@@ -214,6 +365,11 @@ def create_http_app() -> FastAPI:
             "livez": "/livez",
             "readyz": "/readyz",
             "metrics": "/metrics",
+            "batch_stream": _BATCH_STREAM_PATH,
+            "analysis_stream": _ANALYSIS_STREAM_PATH,
+            "resources": ", ".join(
+                f"/resources/{uri.removeprefix(_RESOURCE_URI_PREFIX)}" for uri in STATIC_RESOURCES
+            ),
         }
 
     app.mount("/", mcp.streamable_http_app())
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Literal, TypeAlias, cast
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Literal, TypeAlias, cast
 
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.prompts import Prompt
+from mcp.server.fastmcp.resources import Resource
 
 try:
     from ..config.settings import settings
@@ -24,7 +28,45 @@ def _resolve_log_level(raw_level: str) -> LogLevel:
     return "INFO"
 
 
-mcp = FastMCP(
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+    """Start the opt-in warm-up with the server session (idempotent across HTTP sessions)."""
+    if settings.mcp_warmup_enabled:
+        from .service import service
+
+        service.start_warmup()
+    yield {}
+
+
+class SymptomSyncMCP(FastMCP):
+    """FastMCP that counts tool, resource, and prompt (un)registrations.
+
+    ``registration_generation`` lets payloads derived from the registered
+    primitives (the capability catalog) be cached without listing them per read.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.registration_generation = 0
+
+    def add_tool(self, *args: Any, **kwargs: Any) -> None:
+        super().add_tool(*args, **kwargs)
+        self.registration_generation += 1
+
+    def remove_tool(self, name: str) -> None:
+        super().remove_tool(name)
+        self.registration_generation += 1
+
+    def add_resource(self, resource: Resource) -> None:
+        super().add_resource(resource)
+        self.registration_generation += 1
+
+    def add_prompt(self, prompt: Prompt) -> None:
+        super().add_prompt(prompt)
+        self.registration_generation += 1
+
+
+mcp = SymptomSyncMCP(
     settings.app_name,
     instructions=(
         "SymptomSync performs symptom triage using a multi-agent graph. "
@@ -36,7 +78,8 @@ mcp = FastMCP(
     host=settings.mcp_server_host,
     port=settings.mcp_server_port,
     streamable_http_path=settings.mcp_http_path,
+    lifespan=_lifespan,
 )
 
 
-__all__ = ["mcp"]
+__all__ = ["SymptomSyncMCP", "mcp"]
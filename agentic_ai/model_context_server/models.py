@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class HealthStatus(BaseModel):
@@ -17,6 +17,9 @@ class HealthStatus(BaseModel):
     timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 
+AnalysisMode = Literal["heuristic", "fast", "full"]
+
+
 class SymptomAnalysisRequest(BaseModel):
     """Request model for symptom analysis."""
 
@@ -28,6 +31,10 @@ class SymptomAnalysisRequest(BaseModel):
     medical_history: list[str] | None = Field(default=None)
     current_medications: list[str] | None = Field(default=None)
     allergies: list[str] | None = Field(default=None)
+    mode: AnalysisMode = Field(
+        default="full",
+        description="heuristic: rules only; fast: one LLM call plus rules; full: multi-agent graph",
+    )
 
 
 class SymptomAnalysisResponse(BaseModel):
@@ -41,6 +48,11 @@ class SymptomAnalysisResponse(BaseModel):
     when_to_see_doctor: str
     confidence_score: float = Field(ge=0.0, le=1.0)
     processing_time: float
+    mode: AnalysisMode = Field(default="full")
+    partial: bool = Field(
+        default=False,
+        description="True when the run hit its deadline and missing stages were filled from rules",
+    )
     disclaimer: str = Field(
         default="This is NOT medical advice. Always consult healthcare professionals.",
     )
@@ -53,6 +65,42 @@ class BatchAnalysisResponse(BaseModel):
     total_processing_time: float
 
 
+class BatchItemResult(BaseModel):
+    """One batch item, emitted as soon as it finishes."""
+
+    index: int = Field(description="Position of the request in the submitted batch")
+    status: Literal["completed", "error", "timeout"]
+    elapsed_seconds: float = Field(description="Seconds from batch start until this item finished")
+    result: SymptomAnalysisResponse | None = None
+    error: str | None = None
+
+
+class StreamingBatchAnalysisResponse(BaseModel):
+    """Batch items in completion order, including those cut off by the deadline."""
+
+    items: list[BatchItemResult]
+    completed: int
+    failed: int
+    timed_out: int
+    total_processing_time: float
+
+
+class AnalysisStreamEvent(BaseModel):
+    """One step of a streamed analysis: a finished stage, or the final result."""
+
+    type: Literal["stage", "result"]
+    stage: str | None = Field(default=None, description="Graph stage whose output is reported")
+    elapsed_seconds: float = Field(description="Seconds from the start of the analysis")
+    symptoms: list[str] | None = None
+    urgency_level: str | None = None
+    preliminary_diagnosis: list[str] | None = None
+    risk_assessment: dict[str, Any] | None = None
+    recommendations: list[str] | None = None
+    when_to_see_doctor: str | None = None
+    confidence_score: float | None = None
+    result: SymptomAnalysisResponse | None = None
+
+
 class GraphVisualization(BaseModel):
     """Graph visualization payload."""
 
@@ -78,6 +126,8 @@ class RuntimeConfig(BaseModel):
     mcp_batch_max_requests: int
     mcp_batch_max_concurrency: int
     mcp_require_auth: bool
+    rule_pack_version: str
+    rule_pack_source: str
 
 
 class TriageHeuristicsResponse(BaseModel):
@@ -90,6 +140,21 @@ class TriageHeuristicsResponse(BaseModel):
     recommended_next_step: str
 
 
+class TriageHeuristicsRequest(BaseModel):
+    """Single item of a deterministic triage batch."""
+
+    user_input: str = Field(..., min_length=1, description="User symptom description")
+    severity_hint: int | None = Field(default=None)
+    known_conditions: list[str] | None = Field(default=None)
+
+
+class BatchTriageHeuristicsResponse(BaseModel):
+    """Heuristic triage output for a batch of texts, in input order."""
+
+    results: list[TriageHeuristicsResponse]
+    total_processing_time: float
+
+
 class ClarificationQuestionsResponse(BaseModel):
     """Structured clarification question output."""
 
@@ -119,9 +184,11 @@ class SymptomComparisonResponse(BaseModel):
 class UrgencyExplanationResponse(BaseModel):
     """Human-readable explanation for urgency level."""
 
+    model_config = ConfigDict(frozen=True)
+
     urgency_level: str
     explanation: str
-    immediate_actions: list[str]
+    immediate_actions: tuple[str, ...]
     seek_care_threshold: str
 
 
@@ -153,6 +220,28 @@ class MetricsSnapshotResponse(BaseModel):
     error_count_total: float
     llm_calls_total: float
     vector_queries_total: float
+    cache_hits_total: float = 0.0
+    cache_misses_total: float = 0.0
+    cache_evictions_total: float = 0.0
+    analysis_cache_hits_total: float = 0.0
+    analysis_cache_misses_total: float = 0.0
+    analysis_cache_evictions_total: float = 0.0
+    coalesced_requests_total: float = 0.0
+    red_flag_short_circuits_total: float = 0.0
+    llm_concurrency_limit: float = 0.0
+    llm_concurrency_in_flight: float = 0.0
+    llm_concurrency_backoffs_total: float = 0.0
+    llm_clients: float = 0.0
+    speculative_retrieval_hits_total: float = 0.0
+    speculative_retrieval_misses_total: float = 0.0
+    speculative_retrieval_hit_rate: float = 0.0
+    session_stages_reused_total: float = 0.0
+    session_stages_rerun_total: float = 0.0
+    session_evictions_total: float = 0.0
+    llm_http_pool_in_use: float = 0.0
+    admission_in_flight: float = 0.0
+    admission_queue_depth: float = 0.0
+    requests_shed_total: float = 0.0
 
 
 class DependencyStatusResponse(BaseModel):
@@ -166,6 +255,8 @@ class DependencyStatusResponse(BaseModel):
 class CapabilityCatalogResponse(BaseModel):
     """Catalog of exposed MCP capabilities and limits."""
 
+    model_config = ConfigDict(frozen=True)
+
     tools: list[str]
     resources: list[str]
     prompts: list[str]
@@ -182,30 +273,53 @@ class TriageFactsResponse(BaseModel):
     red_flags: list[str]
 
 
+class BatchTriageFactsResponse(BaseModel):
+    """Triage facts for a batch of texts, in input order."""
+
+    results: list[TriageFactsResponse]
+    total_processing_time: float
+
+
 class RiskScoreResponse(BaseModel):
     """Risk scoring output for triage prioritization."""
 
+    model_config = ConfigDict(frozen=True)
+
     risk_score: int = Field(ge=0, le=100)
     risk_tier: str
-    contributing_factors: list[str]
+    contributing_factors: tuple[str, ...]
     suggested_urgency: str
 
 
+class PopulationRiskResponse(BaseModel):
+    """Columnar risk scores for many patients, in input row order."""
+
+    risk_scores: list[int]
+    risk_tiers: list[str]
+    suggested_urgency: list[str]
+    condition_order: list[str]
+    total_processing_time: float
+
+
 class CareSettingRecommendationResponse(BaseModel):
     """Recommended care setting and timeframe."""
 
+    model_config = ConfigDict(frozen=True)
+
     care_setting: str
     timeframe: str
-    rationale: list[str]
+    rationale: tuple[str, ...]
 
 
 class MonitoringScheduleResponse(BaseModel):
     """Symptom monitoring cadence and escalation triggers."""
 
+    model_config = ConfigDict(frozen=True)
+
     check_interval_minutes: int
     monitoring_window_hours: int
-    required_checks: list[str]
-    escalation_triggers: list[str]
+    required_checks: tuple[str, ...]
+    escalation_triggers: tuple[str, ...]
 
 
 class TextRedactionResponse(BaseModel):
@@ -216,6 +330,18 @@ class TextRedactionResponse(BaseModel):
     redaction_types: list[str]
 
 
+class RulePackStatusResponse(BaseModel):
+    """Active triage rule-pack metadata."""
+
+    version: str
+    format: int
+    description: str
+    source: str
+    generation: int
+    loaded_at: float
+    counts: dict[str, int]
+
+
 class RuntimePolicyValidationResponse(BaseModel):
     """Validation output for runtime hardening policies."""
 
@@ -0,0 +1,192 @@
+"""Compiled token-level phrase matcher used by deterministic triage helpers.
+
+Phrase tables are compiled once into a trie keyed by tokens, so a free-text
+input is tokenized and walked in one pass. Phrases only match whole tokens
+("vomit" does not fire inside "vomitorium"), and negation is applied during the
+same walk so "no chest pain" does not report a red flag. Groups where a missed
+finding is dangerous use strict negation: only an explicit cue directly before
+the phrase counts, so "never had chest pain this bad" still reports it.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Mapping
+
+PhraseTable = Mapping[str, Iterable[str]]
+PhraseHit = tuple[str, str]
+
+# Words (keeping internal apostrophes, e.g. "can't") and clause punctuation.
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)*|[.,;:!?]")
+
+# Negation stops at clause punctuation and contrastive conjunctions. Commas end
+# it too: missing a negated list item is safer than negating a real red flag.
+SCOPE_TERMINATORS = frozenset(
+    {".", ",", ";", ":", "!", "?", "but", "however", "although", "though", "except", "yet", "still"}
+)
+DEFAULT_NEGATION_SCOPE = 3
+# Words that carry a strict negation on to the next phrase ("denies X or Y").
+NEGATION_LIST_JOINERS = frozenset({"or", "nor"})
+
+_NEGATION = "\0negation"
+_STRICT_NEGATION = "\0strict-negation"
+_END = ""
+
+
+def tokenize(text: str) -> list[str]:
+    """Split lower-cased text into word and clause-punctuation tokens."""
+    return TOKEN_PATTERN.findall(text.replace("’", "'"))
+
+
+class PhraseMatcher:
+    """Match grouped phrase tables against text in a single token walk.
+
+    ``groups`` maps a group name (for example ``"red_flags"``) to a table of
+    ``label -> phrases``. ``scan`` returns, per group, the labels whose phrases
+    occur as whole-token sequences in the text. Phrases from
+    ``negatable_groups`` are dropped when they start within ``negation_scope``
+    unmatched tokens after a negation cue. Phrases from
+    ``strict_negation_groups`` are dropped only when they start right after a
+    ``strict_negation_cues`` cue, or right after such a negated phrase and an
+    "or"/"nor". Other groups ignore negation.
+    """
+
+    def __init__(
+        self,
+        groups: Mapping[str, PhraseTable],
+        negation_cues: Iterable[str] = (),
+        negatable_groups: Iterable[str] | None = None,
+        negation_scope: int = DEFAULT_NEGATION_SCOPE,
+        strict_negation_cues: Iterable[str] = (),
+        strict_negation_groups: Iterable[str] = (),
+    ) -> None:
+        if negation_scope < 1:
+            raise ValueError("negation_scope must be >= 1")
+        self.groups = tuple(groups)
+        self.strict_negation_groups = frozenset(strict_negation_groups)
+        default_negatable = set(self.groups) - self.strict_negation_groups
+        self.negatable_groups = frozenset(default_negatable if negatable_groups is None else negatable_groups)
+        if self.negatable_groups & self.strict_negation_groups:
+            raise ValueError("a group cannot use both scoped and strict negation")
+        self.negation_scope = negation_scope
+
+        entries: dict[tuple[str, ...], list[PhraseHit]] = {}
+        for group, table in groups.items():
+            for label, phrases in table.items():
+                for phrase in phrases:
+                    self._add(entries, phrase, (group, label))
+        for cue in negation_cues:
+            self._add(entries, cue, (_NEGATION, cue))
+        for cue in strict_negation_cues:
+            self._add(entries, cue, (_STRICT_NEGATION, cue))
+
+        self._trie: dict[str, dict] = {}
+        for tokens, hits in entries.items():
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_END] = tuple(hits)
+
+    @staticmethod
+    def _add(entries: dict[tuple[str, ...], list[PhraseHit]], phrase: str, hit: PhraseHit) -> None:
+        tokens = tuple(tokenize(phrase.lower()))
+        if not tokens:
+            return
+        hits = entries.setdefault(tokens, [])
+        if hit not in hits:
+            hits.append(hit)
+
+    @staticmethod
+    def _hits_from(node: dict, tokens: list[str], start: int) -> list[tuple[int, tuple[PhraseHit, ...]]]:
+        """Return ``(end, hits)`` for every phrase starting at ``start`` (``node`` is its first token)."""
+        found = []
+        end = start + 1
+        while node is not None:
+            hits = node.get(_END)
+            if hits:
+                found.append((end, hits))
+            if end == len(tokens):
+                break
+            node = node.get(tokens[end])
+            end += 1
+        return found
+
+    def scan(self, text: str) -> dict[str, set[str]]:
+        """Return matched, non-negated labels per group for lower-cased text."""
+        found: dict[str, set[str]] = {group: set() for group in self.groups}
+        tokens = tokenize(text)
+        trie = self._trie
+        negatable = self.negatable_groups
+        strict = self.strict_negation_groups
+
+        scope_left = 0  # unmatched tokens the current negation may still span
+        scope_start = 0  # first token after the active cue
+        covered_until = 0  # end of the last matched negatable phrase
+        strict_at = -1  # token where a strictly negated phrase may start
+        strict_chain = False  # ``strict_at`` follows a negated phrase, not a cue
+
+        for index, token in enumerate(tokens):
+            if token in SCOPE_TERMINATORS:
+                scope_left = 0
+                continue
+            if strict_chain and index == strict_at and token in NEGATION_LIST_JOINERS:
+                strict_at = index + 1
+                continue
+
+            negated = scope_left > 0 and index >= scope_start
+            strictly_negated = index == strict_at
+            node = trie.get(token)
+            if node is None:
+                # Most tokens start no phrase; skip the walk for them.
+                if negated and index >= covered_until:
+                    scope_left -= 1
+                continue
+
+            starts_phrase = False
+            cue_end = 0
+            strict_cue_end = 0
+            phrase_end = 0
+            for end, hits in self._hits_from(node, tokens, index):
+                for group, label in hits:
+                    if group == _NEGATION:
+                        cue_end = max(cue_end, end)
+                    elif group == _STRICT_NEGATION:
+                        strict_cue_end = max(strict_cue_end, end)
+                    elif group in strict:
+                        starts_phrase = True
+                        covered_until = max(covered_until, end)
+                        phrase_end = max(phrase_end, end)
+                        if not strictly_negated:
+                            found[group].add(label)
+                    elif group in negatable:
+                        starts_phrase = True
+                        covered_until = max(covered_until, end)
+                        phrase_end = max(phrase_end, end)
+                        if not negated:
+                            found[group].add(label)
+                    else:
+                        found[group].add(label)
+
+            if strictly_negated and phrase_end:
+                # "denies chest pain or shortness of breath" negates both
+                strict_at, strict_chain = phrase_end, True
+            # Cue words inside a matched phrase ("fainted and not waking") are
+            # part of that phrase, not a new negation.
+            if strict_cue_end and index >= covered_until:
+                strict_at, strict_chain = strict_cue_end, False
+            if cue_end and index >= covered_until:
+                scope_left = self.negation_scope
+                scope_start = cue_end
+            elif negated and not starts_phrase and index >= covered_until:
+                # Only tokens outside matched phrases use up the scope.
+                scope_left -= 1
+        return found
+
+
+__all__ = [
+    "PhraseMatcher",
+    "tokenize",
+    "SCOPE_TERMINATORS",
+    "DEFAULT_NEGATION_SCOPE",
+    "NEGATION_LIST_JOINERS",
+]
@@ -0,0 +1,139 @@
+"""Columnar risk scoring for whole patient populations.
+
+``score_population`` is the vectorized counterpart of
+``decision_support.compute_risk_score``: it takes one array per input column
+and returns NumPy arrays of scores and tiers, with identical results row for
+row. Known conditions are passed as an integer bitmask whose bit ``i`` is the
+``i``-th condition of the active rule pack (see ``condition_order``); rule
+packs are capped at ``MAX_RISK_CONDITIONS`` so every mask fits in an int64.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+from .decision_support import URGENCY_RANK, active_rule_pack
+
+RISK_TIERS = ("low", "moderate", "high", "critical")
+TIER_URGENCY = ("low", "medium", "high", "emergency")
+
+_URGENCY_LABELS = np.array(list(URGENCY_RANK), dtype=object)
+_TIER_LABELS = np.array(RISK_TIERS, dtype=object)
+_TIER_URGENCY_LABELS = np.array(TIER_URGENCY, dtype=object)
+
+
+class PopulationRiskResult:
+    """Scores and tier codes for each input row."""
+
+    __slots__ = ("scores", "tier_codes", "condition_order")
+
+    def __init__(self, scores: np.ndarray, tier_codes: np.ndarray, condition_order: tuple[str, ...]) -> None:
+        self.scores = scores
+        self.tier_codes = tier_codes
+        self.condition_order = condition_order
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def tiers(self) -> np.ndarray:
+        """Tier names per row (``RISK_TIERS`` indexed by ``tier_codes``)."""
+        return _TIER_LABELS[self.tier_codes]
+
+    @property
+    def suggested_urgency(self) -> np.ndarray:
+        """Suggested urgency level per row."""
+        return _TIER_URGENCY_LABELS[self.tier_codes]
+
+
+def condition_order() -> tuple[str, ...]:
+    """Return condition names in bitmask order for the active rule pack."""
+    return tuple(active_rule_pack().risk_condition_weights)
+
+
+def encode_conditions(conditions: Iterable[str] | None, order: Sequence[str] | None = None) -> int:
+    """Encode condition names as a bitmask; unknown names are ignored."""
+    order = condition_order() if order is None else order
+    bits = {name: 1 << index for index, name in enumerate(order)}
+    mask = 0
+    for condition in conditions or ():
+        mask |= bits.get(condition.lower().strip(), 0)
+    return mask
+
+
+def encode_urgency(levels: Any) -> np.ndarray:
+    """Map urgency names (or rank codes) to rank codes; unknown values become medium."""
+    values = np.asarray(levels)
+    medium = URGENCY_RANK["medium"]
+    if np.issubdtype(values.dtype, np.integer):
+        codes = values.astype(np.int64)
+        return np.where((codes >= 0) & (codes < len(URGENCY_RANK)), codes, medium)
+    codes = np.full(values.shape, medium, dtype=np.int64)
+    for level, rank in URGENCY_RANK.items():
+        codes[values == level] = rank
+    return codes
+
+
+def _column(name: str, values: Any, length: int, dtype: Any) -> np.ndarray:
+    column = np.asarray(values, dtype=dtype)
+    if column.shape != (length,):
+        raise ValueError(f"{name} must be a 1-D array with {length} rows, got shape {column.shape}")
+    return column
+
+
+def score_population(
+    urgency_levels: Any,
+    red_flag_counts: Any,
+    ages: Any,
+    severity_hints: Any,
+    condition_masks: Any = None,
+) -> PopulationRiskResult:
+    """Score many patients at once.
+
+    ``ages`` and ``severity_hints`` may contain ``None``/``NaN`` for unknown
+    values. Because conditions are a bitmask, a condition listed twice for the
+    scalar function counts twice there but once here.
+    """
+    urgency = encode_urgency(urgency_levels)
+    if urgency.ndim != 1:
+        raise ValueError("urgency_levels must be a 1-D array")
+    rows = len(urgency)
+    flags = _column("red_flag_counts", red_flag_counts, rows, np.int64)
+    age = _column("ages", ages, rows, np.float64)
+    severity = np.clip(np.nan_to_num(_column("severity_hints", severity_hints, rows, np.float64)), 0, 10)
+    if (flags < 0).any():
+        raise ValueError("red_flag_counts must be >= 0")
+
+    pack = active_rule_pack()
+    order = tuple(pack.risk_condition_weights)
+    weights = np.fromiter(pack.risk_condition_weights.values(), dtype=np.int64, count=len(order))
+
+    scores = urgency * 22
+    scores += np.minimum(30, 10 * flags)
+    with np.errstate(invalid="ignore"):
+        scores += np.select([age >= 75, age >= 60, age <= 5], [15, 8, 8], 0)
+    scores += np.select([severity >= 8, severity >= 5], [15, 8], 0)
+
+    if condition_masks is not None:
+        masks = _column("condition_masks", condition_masks, rows, np.int64)
+        if ((masks < 0) | (masks >= 1 << len(order))).any():
+            raise ValueError(f"condition_masks must only set bits for {len(order)} conditions: {list(order)}")
+        bits = (masks[:, None] >> np.arange(len(order), dtype=np.int64)) & 1
+        scores += bits @ weights
+
+    scores = np.clip(scores, 0, 100)
+    tier_codes = (scores >= 30).astype(np.int8) + (scores >= 55) + (scores >= 75)
+    return PopulationRiskResult(scores, tier_codes, order)
+
+
+__all__ = [
+    "RISK_TIERS",
+    "PopulationRiskResult",
+    "condition_order",
+    "encode_conditions",
+    "encode_urgency",
+    "score_population",
+]
@@ -2,24 +2,37 @@
 
 from __future__ import annotations
 
+import json
+import time
 from typing import Any
 
+from mcp.server.fastmcp import Context
+from mcp.server.fastmcp.exceptions import ToolError
+
 try:
-    from ..config.settings import settings
+    from ..utils.concurrency import AdmissionRejectedError
 except ImportError:
-    from config.settings import settings
+    from utils.concurrency import AdmissionRejectedError
+
 from .mcp_instance import mcp
 from .models import (
+    AnalysisMode,
     BatchAnalysisResponse,
     GraphVisualization,
     HealthStatus,
     RuntimeConfig,
+    StreamingBatchAnalysisResponse,
     SymptomAnalysisRequest,
     SymptomAnalysisResponse,
 )
 from .service import service
 
 
+def _overloaded(exc: AdmissionRejectedError) -> ToolError:
+    """Structured tool error telling clients when to retry a shed request."""
+    return ToolError(json.dumps(exc.to_dict()))
+
+
 @mcp.tool(name="analyze_symptoms", description="Run single-request symptom analysis")
 async def analyze_symptoms(
     user_input: str,
@@ -30,8 +43,13 @@ async def analyze_symptoms(
     medical_history: list[str] | None = None,
     current_medications: list[str] | None = None,
     allergies: list[str] | None = None,
+    mode: AnalysisMode = "full",
 ) -> SymptomAnalysisResponse:
-    """Analyze symptoms and return triage recommendations."""
+    """Analyze symptoms and return triage recommendations.
+
+    ``mode`` trades depth for latency: ``heuristic`` (rules only, no LLM),
+    ``fast`` (one LLM call), or ``full`` (multi-agent graph).
+    """
     request = SymptomAnalysisRequest(
         user_input=user_input,
         user_id=user_id,
@@ -41,8 +59,12 @@ async def analyze_symptoms(
         medical_history=medical_history,
         current_medications=current_medications,
         allergies=allergies,
+        mode=mode,
     )
-    return await service.analyze_symptoms(request)
+    try:
+        return await service.analyze_symptoms(request)
+    except AdmissionRejectedError as exc:
+        raise _overloaded(exc) from exc
 
 
 @mcp.tool(
@@ -51,15 +73,86 @@ async def analyze_symptoms(
 )
 async def batch_analyze_symptoms(requests: list[dict[str, Any]]) -> BatchAnalysisResponse:
     """Analyze up to configured max symptom requests in one MCP tool call."""
-    if not requests:
-        raise ValueError("At least one request is required")
-    if len(requests) > settings.mcp_batch_max_requests:
-        raise ValueError(
-            f"A maximum of {settings.mcp_batch_max_requests} requests is allowed",
-        )
+    parsed_requests = service.parse_batch_requests(requests)
+    try:
+        return await service.batch_analyze_symptoms(parsed_requests)
+    except AdmissionRejectedError as exc:
+        raise _overloaded(exc) from exc
+
+
+@mcp.tool(
+    name="stream_batch_analyze_symptoms",
+    description="Run batch symptom analysis, reporting each result via progress notifications as it completes",
+)
+async def stream_batch_analyze_symptoms(
+    requests: list[dict[str, Any]],
+    ctx: Context,
+    timeout_seconds: float | None = None,
+) -> StreamingBatchAnalysisResponse:
+    """Analyze a batch, emitting every finished item as a progress notification.
+
+    Each notification's message is the JSON ``BatchItemResult``. Items still
+    running after ``timeout_seconds`` are returned with status ``timeout``.
+    """
+    if timeout_seconds is not None and timeout_seconds <= 0:
+        raise ValueError("timeout_seconds must be > 0")
+    parsed_requests = service.parse_batch_requests(requests)
+
+    start_time = time.time()
+    items = []
+    try:
+        async for item in service.stream_batch_analysis(parsed_requests, timeout_seconds):
+            items.append(item)
+            await ctx.report_progress(len(items), len(parsed_requests), message=item.model_dump_json())
+    except AdmissionRejectedError as exc:
+        raise _overloaded(exc) from exc
+    return service.streaming_batch_summary(items, time.time() - start_time)
+
+
+@mcp.tool(
+    name="stream_analyze_symptoms",
+    description="Run full symptom analysis, reporting each finished stage via progress notifications",
+)
+async def stream_analyze_symptoms(
+    user_input: str,
+    ctx: Context,
+    user_id: str | None = None,
+    session_id: str | None = None,
+    age: int | None = None,
+    gender: str | None = None,
+    medical_history: list[str] | None = None,
+    current_medications: list[str] | None = None,
+    allergies: list[str] | None = None,
+    mode: AnalysisMode = "full",
+) -> SymptomAnalysisResponse:
+    """Analyze symptoms like ``analyze_symptoms``, emitting partial results as they arrive.
 
-    parsed_requests = [SymptomAnalysisRequest.model_validate(item) for item in requests]
-    return await service.batch_analyze_symptoms(parsed_requests)
+    Each notification's message is the JSON ``AnalysisStreamEvent`` of a
+    finished stage (unset fields omitted), so urgency can be shown before
+    diagnoses and recommendations are ready. The complete response is returned.
+    """
+    request = SymptomAnalysisRequest(
+        user_input=user_input,
+        user_id=user_id,
+        session_id=session_id,
+        age=age,
+        gender=gender,
+        medical_history=medical_history,
+        current_medications=current_medications,
+        allergies=allergies,
+        mode=mode,
+    )
+    stages = 0
+    try:
+        async for event in service.stream_analysis(request):
+            if event.type == "result":
+                response = event.result
+                continue
+            stages += 1
+            await ctx.report_progress(stages, message=event.model_dump_json(exclude_none=True))
+    except AdmissionRejectedError as exc:
+        raise _overloaded(exc) from exc
+    return response
 
 
 @mcp.tool(name="visualize_graph", description="Return the LangGraph flow as Mermaid")
@@ -126,6 +219,8 @@ def symptom_triage_prompt(
 __all__ = [
     "analyze_symptoms",
     "batch_analyze_symptoms",
+    "stream_batch_analyze_symptoms",
+    "stream_analyze_symptoms",
     "visualize_graph",
     "get_runtime_config",
     "health_check",
@@ -2,21 +2,18 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from .mcp_instance import mcp
 from .models import (
     CapabilityCatalogResponse,
     DependencyStatusResponse,
     MetricsSnapshotResponse,
+    RulePackStatusResponse,
     RuntimePolicyValidationResponse,
 )
 from .service import service
-
-
-async def _catalog() -> CapabilityCatalogResponse:
-    tools = [tool.name for tool in await mcp.list_tools()]
-    resources = [str(resource.uri) for resource in await mcp.list_resources()]
-    prompts = [prompt.name for prompt in await mcp.list_prompts()]
-    return service.capability_catalog(tools=tools, resources=resources, prompts=prompts)
+from .static_resources import capability_catalog_model
 
 
 @mcp.tool(
@@ -52,7 +49,37 @@ async def validate_runtime_policy() -> RuntimePolicyValidationResponse:
 )
 async def get_capability_catalog() -> CapabilityCatalogResponse:
     """Return full catalog of currently exposed MCP primitives."""
-    return await _catalog()
+    return await capability_catalog_model()
+
+
+@mcp.tool(
+    name="get_rule_pack_status",
+    description="Return version and table sizes of the active triage rule pack",
+)
+async def get_rule_pack_status() -> RulePackStatusResponse:
+    """Return metadata for the active triage rule pack."""
+    return service.rule_pack_status()
+
+
+@mcp.tool(
+    name="load_rule_pack",
+    description="Validate and hot-swap the triage rule pack from an inline document or a JSON/YAML file in the rule-pack directory",
+)
+async def load_rule_pack(
+    path: str | None = None,
+    document: dict[str, Any] | None = None,
+) -> RulePackStatusResponse:
+    """Activate a new rule pack; sections omitted from the document keep built-in values."""
+    return service.load_rule_pack(document=document, path=path)
+
+
+@mcp.tool(
+    name="reset_rule_pack",
+    description="Restore the built-in triage rule pack",
+)
+async def reset_rule_pack() -> RulePackStatusResponse:
+    """Reactivate the built-in triage rule pack."""
+    return service.reset_rule_pack()
 
 
 __all__ = [
@@ -60,5 +87,8 @@ __all__ = [
     "check_dependencies",
     "validate_runtime_policy",
     "get_capability_catalog",
+    "get_rule_pack_status",
+    "load_rule_pack",
+    "reset_rule_pack",
 ]
 
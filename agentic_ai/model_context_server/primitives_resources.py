@@ -2,43 +2,41 @@
 
 from __future__ import annotations
 
-from typing import Any
-
 from .mcp_instance import mcp
 from .models import (
-    CapabilityCatalogResponse,
     DependencyStatusResponse,
     MetricsSnapshotResponse,
     RuntimePolicyValidationResponse,
 )
 from .service import service
-
-
-async def _catalog() -> CapabilityCatalogResponse:
-    tools = [tool.name for tool in await mcp.list_tools()]
-    resources = [str(resource.uri) for resource in await mcp.list_resources()]
-    prompts = [prompt.name for prompt in await mcp.list_prompts()]
-    return service.capability_catalog(tools=tools, resources=resources, prompts=prompts)
+from .static_resources import (
+    CAPABILITY_CATALOG_URI,
+    TRIAGE_GUIDELINES_URI,
+    URGENCY_MATRIX_URI,
+    capability_catalog,
+    triage_guidelines,
+    urgency_matrix,
+)
 
 
 @mcp.resource(
-    "symptomsync://guidelines/triage",
+    TRIAGE_GUIDELINES_URI,
     name="triage-guidelines",
     description="Safety-focused triage guidelines",
 )
 async def triage_guidelines_resource() -> str:
     """Return markdown triage guidelines for clients."""
-    return service.triage_guidelines_markdown()
+    return (await triage_guidelines()).text
 
 
 @mcp.resource(
-    "symptomsync://guidelines/urgency-matrix",
+    URGENCY_MATRIX_URI,
     name="urgency-matrix",
     description="Structured urgency-level matrix",
 )
-async def urgency_matrix_resource() -> dict[str, Any]:
-    """Return urgency matrix for client display and policy checks."""
-    return service.urgency_matrix_resource()
+async def urgency_matrix_resource() -> str:
+    """Return urgency matrix JSON for client display and policy checks."""
+    return (await urgency_matrix()).text
 
 
 @mcp.resource(
@@ -72,13 +70,13 @@ async def runtime_policy_resource() -> RuntimePolicyValidationResponse:
 
 
 @mcp.resource(
-    "symptomsync://catalog/capabilities",
+    CAPABILITY_CATALOG_URI,
     name="capability-catalog",
     description="Catalog of available tools/resources/prompts",
 )
-async def capability_catalog_resource() -> CapabilityCatalogResponse:
-    """Return capability catalog as a resource."""
-    return await _catalog()
+async def capability_catalog_resource() -> str:
+    """Return capability catalog JSON as a resource."""
+    return (await capability_catalog()).text
 
 
 __all__ = [
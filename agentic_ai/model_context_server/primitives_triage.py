@@ -4,24 +4,41 @@ from __future__ import annotations
 
 from typing import Any
 
+try:
+    from ..config.settings import settings
+except ImportError:
+    from config.settings import settings
 from .mcp_instance import mcp
 from .models import (
+    BatchTriageFactsResponse,
+    BatchTriageHeuristicsResponse,
     CareSettingRecommendationResponse,
     ClarificationQuestionsResponse,
     ClinicianHandoffResponse,
     EmergencyChecklistResponse,
     MonitoringScheduleResponse,
+    PopulationRiskResponse,
     RiskScoreResponse,
     SelfCarePlanResponse,
     SymptomComparisonResponse,
     TextRedactionResponse,
     TriageFactsResponse,
+    TriageHeuristicsRequest,
     TriageHeuristicsResponse,
     UrgencyExplanationResponse,
 )
 from .service import service
 
 
+def _check_triage_batch_size(count: int) -> None:
+    if not count:
+        raise ValueError("At least one item is required")
+    if count > settings.mcp_triage_batch_max_items:
+        raise ValueError(
+            f"A maximum of {settings.mcp_triage_batch_max_items} items is allowed",
+        )
+
+
 @mcp.tool(
     name="triage_text_heuristics",
     description="Run deterministic symptom triage heuristics (no LLM calls)",
@@ -48,6 +65,27 @@ async def extract_triage_facts(user_input: str) -> TriageFactsResponse:
     return service.extract_triage_facts(user_input=user_input)
 
 
+@mcp.tool(
+    name="batch_triage_text_heuristics",
+    description="Run deterministic triage heuristics for many texts (no LLM calls)",
+)
+async def batch_triage_text_heuristics(requests: list[dict[str, Any]]) -> BatchTriageHeuristicsResponse:
+    """Triage message backlogs in one call; results are returned in input order."""
+    _check_triage_batch_size(len(requests))
+    parsed_requests = [TriageHeuristicsRequest.model_validate(item) for item in requests]
+    return await service.batch_heuristic_triage(parsed_requests)
+
+
+@mcp.tool(
+    name="batch_extract_triage_facts",
+    description="Extract structured triage facts from many free-text inputs",
+)
+async def batch_extract_triage_facts(texts: list[str]) -> BatchTriageFactsResponse:
+    """Extract triage facts for message backlogs; results are returned in input order."""
+    _check_triage_batch_size(len(texts))
+    return await service.batch_extract_triage_facts(texts)
+
+
 @mcp.tool(
     name="generate_clarification_questions",
     description="Generate follow-up questions for missing triage context",
@@ -132,6 +170,34 @@ async def compute_risk_score(
     )
 
 
+@mcp.tool(
+    name="score_population_risk",
+    description="Vectorized risk scoring for many patients given column arrays (same rules as compute_risk_score)",
+)
+async def score_population_risk(
+    urgency_levels: list[str],
+    red_flag_counts: list[int],
+    ages: list[int | None],
+    severity_hints: list[int | None],
+    condition_masks: list[int] | None = None,
+    known_conditions: list[list[str]] | None = None,
+) -> PopulationRiskResponse:
+    """Score a population in one call; bit i of a condition mask is condition_order[i]."""
+    rows = len(urgency_levels)
+    if not rows:
+        raise ValueError("At least one row is required")
+    if rows > settings.mcp_population_risk_max_rows:
+        raise ValueError(f"A maximum of {settings.mcp_population_risk_max_rows} rows is allowed")
+    return service.population_risk(
+        urgency_levels=urgency_levels,
+        red_flag_counts=red_flag_counts,
+        ages=ages,
+        severity_hints=severity_hints,
+        condition_masks=condition_masks,
+        known_conditions=known_conditions,
+    )
+
+
 @mcp.tool(
     name="recommend_care_setting",
     description="Recommend appropriate care setting and timeframe",
@@ -206,11 +272,14 @@ async def redact_sensitive_text(text: str) -> TextRedactionResponse:
 __all__ = [
     "triage_text_heuristics",
     "extract_triage_facts",
+    "batch_triage_text_heuristics",
+    "batch_extract_triage_facts",
     "generate_clarification_questions",
     "build_clinician_handoff",
     "compare_symptom_snapshots",
     "explain_urgency_level",
     "compute_risk_score",
+    "score_population_risk",
     "recommend_care_setting",
     "generate_self_care_plan",
     "generate_monitoring_schedule",
@@ -0,0 +1,243 @@
+"""PII redaction engine for free text."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from os import PathLike
+from typing import Any
+
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+PHONE_PATTERN = re.compile(r"\b(?:\+1[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?){2}\d{4}\b")
+SSN_PATTERN = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
+DOB_PATTERN = re.compile(r"\b(?:19|20)\d{2}[-/](?:0?[1-9]|1[0-2])[-/](?:0?[1-9]|[12]\d|3[01])\b")
+MRN_PATTERN = re.compile(r"\b(?:mrn|medical record number)[:\s#-]*[A-Za-z0-9-]{4,}\b", re.IGNORECASE)
+
+# Order is precedence: each rule only sees text that earlier rules left
+# unredacted, as if the patterns were substituted one after another.
+REDACTION_RULES: tuple[tuple[str, re.Pattern[str], str], ...] = (
+    ("email", EMAIL_PATTERN, "[REDACTED_EMAIL]"),
+    ("phone", PHONE_PATTERN, "[REDACTED_PHONE]"),
+    ("ssn", SSN_PATTERN, "[REDACTED_SSN]"),
+    ("dob", DOB_PATTERN, "[REDACTED_DOB]"),
+    ("mrn", MRN_PATTERN, "[REDACTED_MRN]"),
+)
+
+REDACTION_REPLACEMENTS = {label: replacement for label, _, replacement in REDACTION_RULES}
+
+# Stands in for already-redacted characters: a non-word character that no
+# rule can match, just like the brackets of a replacement.
+_MASK = "\0"
+
+
+def _mask(text: str, spans: list[tuple[int, int, str]]) -> str:
+    """``text`` with each span (in text order) blanked out, keeping offsets."""
+    pieces: list[str] = []
+    position = 0
+    for start, end, _ in spans:
+        pieces.append(text[position:start])
+        pieces.append(_MASK * (end - start))
+        position = end
+    pieces.append(text[position:])
+    return "".join(pieces)
+
+
+def pii_spans(text: str, pos: int = 0) -> list[tuple[int, int, str]]:
+    """Return ``(start, end, label)`` of the PII in ``text[pos:]``, in text order.
+
+    Each rule scans the text once, with the spans of earlier rules masked
+    out, so the result is the same as substituting one pattern after another:
+    a phone number after "MRN:" stays a phone number, and an MRN cut short by
+    one still matches its shorter prefix. The spans are sorted once at the end.
+    """
+    spans: list[tuple[int, int, str]] = []
+    masked = text
+    for label, pattern, _ in REDACTION_RULES:
+        found = [(*match.span(), label) for match in pattern.finditer(masked, pos)]
+        if not found:
+            continue
+        spans.extend(found)
+        if label != REDACTION_RULES[-1][0]:
+            masked = _mask(masked, found)
+    spans.sort()
+    return spans
+
+
+class RedactionCounter:
+    """Labels and counts matches as they are replaced."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self) -> None:
+        self.counts = dict.fromkeys(REDACTION_REPLACEMENTS, 0)
+
+    def __call__(self, label: str) -> str:
+        self.counts[label] += 1
+        return REDACTION_REPLACEMENTS[label]
+
+    @property
+    def redaction_count(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def redaction_types(self) -> list[str]:
+        return [label for label, count in self.counts.items() if count]
+
+
+def redact_text(text: str) -> dict[str, Any]:
+    """Redact email, phone, SSN, DOB, and MRN patterns, building the text once.
+
+    Overlapping matches follow rule precedence (see ``pii_spans``).
+    """
+    counter = RedactionCounter()
+    pieces: list[str] = []
+    position = 0
+    for start, end, label in pii_spans(text):
+        pieces.append(text[position:start])
+        pieces.append(counter(label))
+        position = end
+    pieces.append(text[position:])
+    redacted = "".join(pieces)
+    return {
+        "redacted_text": redacted,
+        "redaction_count": counter.redaction_count,
+        "redaction_types": counter.redaction_types,
+    }
+
+
+# Longest PII token the streaming redactor guarantees to catch across chunk
+# boundaries; generous next to real emails, phone numbers, and MRNs.
+DEFAULT_STREAM_OVERLAP = 256
+DEFAULT_STREAM_CHUNK_SIZE = 1 << 20
+# Characters of already-emitted input kept so ``\b`` sees its left neighbour.
+_STREAM_CONTEXT = 1
+
+
+class StreamingRedactor:
+    """Incrementally redact text fed in arbitrary chunks.
+
+    Text is emitted as soon as no PII match could still straddle it: the last
+    ``overlap`` characters of each feed are held back, as is any match that
+    runs into the end of the buffer. Memory stays bounded by
+    ``overlap + len(chunk)`` whatever the total input size. Matches longer than
+    ``overlap`` are still redacted, but may be split if they cross a boundary.
+    """
+
+    def __init__(self, overlap: int = DEFAULT_STREAM_OVERLAP) -> None:
+        if overlap <= 0:
+            raise ValueError("overlap must be > 0")
+        self.overlap = overlap
+        self.counter = RedactionCounter()
+        self._context = ""
+        self._pending = ""
+        self._closed = False
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk and return the redacted text that is now final."""
+        if self._closed:
+            raise ValueError("redactor is closed")
+        self._pending += chunk
+        return self._drain(final=False)
+
+    def close(self) -> str:
+        """Flush and redact everything still held back."""
+        if self._closed:
+            return ""
+        output = self._drain(final=True)
+        self._closed = True
+        return output
+
+    def _drain(self, final: bool) -> str:
+        buffer = self._context + self._pending
+        start = len(self._context)
+        end = len(buffer)
+        safe = end if final else max(start, end - self.overlap)
+        cut = safe
+        pieces: list[str] = []
+        position = start
+        for match_start, match_end, label in pii_spans(buffer, start):
+            if match_start >= safe:
+                break
+            if not final and match_end == end and match_end - match_start <= self.overlap:
+                # The match may keep growing with the next chunk.
+                cut = match_start
+                break
+            pieces.append(buffer[position:match_start])
+            pieces.append(self.counter(label))
+            position = match_end
+            cut = max(safe, position)
+        pieces.append(buffer[position:cut])
+        self._context = buffer[max(0, cut - _STREAM_CONTEXT) : cut]
+        self._pending = buffer[cut:]
+        return "".join(pieces)
+
+    @property
+    def redaction_count(self) -> int:
+        return self.counter.redaction_count
+
+    @property
+    def redaction_types(self) -> list[str]:
+        return self.counter.redaction_types
+
+    def stats(self) -> dict[str, Any]:
+        """Return counts in the same shape as ``redact_text`` minus the text."""
+        return {
+            "redaction_count": self.redaction_count,
+            "redaction_types": self.redaction_types,
+        }
+
+
+def redact_stream(
+    chunks: Iterable[str],
+    overlap: int = DEFAULT_STREAM_OVERLAP,
+    redactor: StreamingRedactor | None = None,
+) -> Iterator[str]:
+    """Yield redacted text for an iterable of text chunks.
+
+    Pass a ``redactor`` to read its counts once the generator is exhausted.
+    """
+    redactor = redactor or StreamingRedactor(overlap)
+    for chunk in chunks:
+        output = redactor.feed(chunk)
+        if output:
+            yield output
+    output = redactor.close()
+    if output:
+        yield output
+
+
+def redact_file(
+    source: str | PathLike[str],
+    destination: str | PathLike[str],
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    encoding: str = "utf-8",
+    overlap: int = DEFAULT_STREAM_OVERLAP,
+) -> dict[str, Any]:
+    """Redact ``source`` into ``destination`` without loading it whole."""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+    redactor = StreamingRedactor(overlap)
+    with open(source, encoding=encoding, newline="") as reader, open(
+        destination, "w", encoding=encoding, newline=""
+    ) as writer:
+        chunks = iter(lambda: reader.read(chunk_size), "")
+        for output in redact_stream(chunks, redactor=redactor):
+            writer.write(output)
+    return redactor.stats()
+
+
+__all__ = [
+    "EMAIL_PATTERN",
+    "PHONE_PATTERN",
+    "SSN_PATTERN",
+    "DOB_PATTERN",
+    "MRN_PATTERN",
+    "REDACTION_RULES",
+    "pii_spans",
+    "RedactionCounter",
+    "redact_text",
+    "DEFAULT_STREAM_OVERLAP",
+    "StreamingRedactor",
+    "redact_stream",
+    "redact_file",
+]
@@ -0,0 +1,195 @@
+"""Result cache for full symptom analyses.
+
+``analyze_symptoms`` runs the multi-agent LLM graph, so identical requests
+(frequent for templated web-chat phrases) are served from a cache keyed on a
+canonical hash of the request. Caller identity (``user_id``/``session_id``) is
+excluded from the key. Two backends share one async interface: an in-process
+TTL+LRU map and a Redis backend for sharing results across workers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Protocol
+
+try:
+    from ..config.settings import settings
+except ImportError:
+    from config.settings import settings
+from .models import SymptomAnalysisRequest
+
+KEY_PREFIX = "symptomsync:analysis:v1:"
+_IDENTITY_FIELDS = {"user_id", "session_id"}
+
+
+def _normalize_list(values: list[str] | None) -> list[str] | None:
+    if values is None:
+        return None
+    return sorted({value.strip().lower() for value in values if value.strip()})
+
+
+def analysis_cache_key(request: SymptomAnalysisRequest) -> str:
+    """Return the cache key for a request, ignoring caller identity."""
+    payload = request.model_dump(exclude=_IDENTITY_FIELDS)
+    payload["user_input"] = " ".join(request.user_input.split())
+    for field in ("medical_history", "current_medications", "allergies"):
+        payload[field] = _normalize_list(payload[field])
+    if payload["gender"] is not None:
+        payload["gender"] = payload["gender"].strip().lower()
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return KEY_PREFIX + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCacheBackend(Protocol):
+    """Async storage for serialized analysis responses."""
+
+    name: str
+
+    async def get(self, key: str) -> str | None:
+        """Return the stored value, or None when missing or expired."""
+
+    async def set(self, key: str, value: str) -> int:
+        """Store a value and return the number of entries evicted to make room."""
+
+    async def clear(self) -> None:
+        """Drop all entries."""
+
+
+class MemoryResultCache:
+    """In-process TTL + LRU result cache."""
+
+    name = "memory"
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be > 0")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> str | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str) -> int:
+        self._data[key] = (self._clock() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        evicted = 0
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class RedisResultCache:
+    """Redis-backed TTL + LRU result cache shared across workers.
+
+    Values are plain keys with an expiry; a sorted set scored by last access
+    time tracks recency so the least recently used keys are dropped once the
+    cache holds more than ``maxsize`` entries.
+    """
+
+    name = "redis"
+
+    def __init__(self, client: Any, maxsize: int, ttl_seconds: int, prefix: str = KEY_PREFIX) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be > 0")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+        self.client = client
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.index_key = f"{prefix}lru"
+
+    @classmethod
+    def from_settings(cls, maxsize: int, ttl_seconds: int) -> RedisResultCache:
+        """Create a client from the ``redis_*`` settings."""
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - redis ships in requirements
+            raise ValueError("The redis analysis cache backend requires the redis package") from exc
+        client = redis_asyncio.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+            password=settings.redis_password,
+            decode_responses=True,
+        )
+        return cls(client, maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    async def get(self, key: str) -> str | None:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.zadd(self.index_key, {key: time.time()}, xx=True)
+        value, _ = await pipe.execute()
+        if value is None:
+            await self.client.zrem(self.index_key, key)
+        return value
+
+    async def set(self, key: str, value: str) -> int:
+        now = time.time()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(key, value, ex=self.ttl_seconds)
+        pipe.zadd(self.index_key, {key: now})
+        # Members not touched within the TTL have already expired in Redis.
+        pipe.zremrangebyscore(self.index_key, "-inf", now - self.ttl_seconds)
+        pipe.zcard(self.index_key)
+        *_, size = await pipe.execute()
+        excess = size - self.maxsize
+        if excess <= 0:
+            return 0
+        evicted = [member for member, _ in await self.client.zpopmin(self.index_key, excess)]
+        if evicted:
+            await self.client.delete(*evicted)
+        return len(evicted)
+
+    async def clear(self) -> None:
+        members = await self.client.zrange(self.index_key, 0, -1)
+        await self.client.delete(self.index_key, *members)
+
+
+def build_result_cache(backend: str, maxsize: int, ttl_seconds: int) -> ResultCacheBackend | None:
+    """Create the configured backend; ``"none"`` disables result caching."""
+    backend = backend.lower()
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return MemoryResultCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+    if backend == "redis":
+        return RedisResultCache.from_settings(maxsize=maxsize, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown analysis cache backend '{backend}'; expected memory, redis, or none")
+
+
+__all__ = [
+    "KEY_PREFIX",
+    "MemoryResultCache",
+    "RedisResultCache",
+    "ResultCacheBackend",
+    "analysis_cache_key",
+    "build_result_cache",
+]
@@ -0,0 +1,323 @@
+"""Versioned triage rule packs that can be swapped at runtime.
+
+A rule pack is a JSON or YAML document carrying the phrase tables, weights, and
+guidance text used by the deterministic triage helpers. Documents are validated
+into a ``RulePackSpec`` and compiled into a ``CompiledRulePack`` (phrase
+matcher, lookup tables, and prebuilt response fragments). ``RulePackRegistry``
+holds the active pack and replaces it with a single reference swap, so a
+request reading ``registry.active`` once always sees one consistent pack.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable, Mapping
+from os import PathLike
+from pathlib import Path
+from threading import Lock
+from types import MappingProxyType
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
+
+from .phrase_matcher import PhraseMatcher
+
+RULE_PACK_FORMAT = 1
+URGENCY_LEVELS = ("low", "medium", "high", "emergency")
+CONTEXT_TERM_KEYS = ("fever", "pain", "worsening", "nighttime", "today", "yesterday")
+# Population scoring packs a patient's conditions into one int64 bitmask, and
+# ``1 << len(conditions)`` must still fit in it.
+MAX_RISK_CONDITIONS = 62
+
+
+def _normalize_phrases(table: dict[str, list[str]]) -> dict[str, list[str]]:
+    normalized: dict[str, list[str]] = {}
+    for label, phrases in table.items():
+        cleaned = [phrase.lower().strip() for phrase in phrases if phrase.strip()]
+        if not cleaned:
+            raise ValueError(f"'{label}' must list at least one non-empty phrase")
+        normalized[label] = cleaned
+    return normalized
+
+
+class RulePackSpec(BaseModel):
+    """Validated rule-pack document."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    format: int = Field(default=RULE_PACK_FORMAT, description="Rule-pack schema version")
+    version: str = Field(..., min_length=1, description="Content version of this pack")
+    description: str = Field(default="")
+    red_flags: dict[str, list[str]]
+    symptom_hints: dict[str, list[str]]
+    context_terms: dict[str, list[str]]
+    negation_cues: list[str]
+    red_flag_negation_cues: list[str]
+    risk_condition_weights: dict[str, int]
+    elevated_risk_conditions: list[str]
+    self_care: dict[str, list[str]]
+    general_monitoring: list[str]
+    seek_care_thresholds: dict[str, str]
+    urgency_explanations: dict[str, str]
+    immediate_actions: dict[str, list[str]]
+
+    @field_validator("format")
+    @classmethod
+    def _check_format(cls, value: int) -> int:
+        if value != RULE_PACK_FORMAT:
+            raise ValueError(f"unsupported rule-pack format {value}; expected {RULE_PACK_FORMAT}")
+        return value
+
+    @field_validator("red_flags", "symptom_hints", "context_terms")
+    @classmethod
+    def _check_phrases(cls, value: dict[str, list[str]]) -> dict[str, list[str]]:
+        return _normalize_phrases(value)
+
+    @field_validator("negation_cues", "red_flag_negation_cues")
+    @classmethod
+    def _check_cues(cls, value: list[str]) -> list[str]:
+        return [cue.lower().strip() for cue in value if cue.strip()]
+
+    @field_validator("risk_condition_weights")
+    @classmethod
+    def _check_weights(cls, value: dict[str, int]) -> dict[str, int]:
+        weights = {condition.lower().strip(): weight for condition, weight in value.items()}
+        if len(weights) > MAX_RISK_CONDITIONS:
+            raise ValueError(f"at most {MAX_RISK_CONDITIONS} risk conditions are supported, got {len(weights)}")
+        return weights
+
+    @field_validator("elevated_risk_conditions")
+    @classmethod
+    def _check_conditions(cls, value: list[str]) -> list[str]:
+        return [condition.lower().strip() for condition in value]
+
+    @field_validator("self_care")
+    @classmethod
+    def _check_self_care(cls, value: dict[str, list[str]]) -> dict[str, list[str]]:
+        return {symptom.lower().strip(): actions for symptom, actions in value.items()}
+
+    @model_validator(mode="after")
+    def _check_coverage(self) -> RulePackSpec:
+        missing_context = set(CONTEXT_TERM_KEYS) - set(self.context_terms)
+        if missing_context:
+            raise ValueError(f"context_terms is missing keys: {sorted(missing_context)}")
+        for name in ("seek_care_thresholds", "urgency_explanations", "immediate_actions"):
+            levels = set(getattr(self, name))
+            if levels != set(URGENCY_LEVELS):
+                raise ValueError(f"{name} must define exactly the urgency levels {list(URGENCY_LEVELS)}")
+        return self
+
+
+class CompiledRulePack:
+    """Read-only runtime form of a rule pack."""
+
+    __slots__ = (
+        "spec",
+        "version",
+        "source",
+        "generation",
+        "loaded_at",
+        "matcher",
+        "red_flag_order",
+        "risk_condition_weights",
+        "elevated_risk_conditions",
+        "self_care",
+        "general_monitoring",
+        "seek_care_thresholds",
+        "urgency_explanations",
+        "urgency_responses",
+        "urgency_matrix",
+    )
+
+    def __init__(self, spec: RulePackSpec, source: str, generation: int) -> None:
+        self.spec = spec
+        self.version = spec.version
+        self.source = source
+        self.generation = generation
+        self.loaded_at = time.time()
+        self.matcher = PhraseMatcher(
+            {
+                "red_flags": spec.red_flags,
+                "symptoms": spec.symptom_hints,
+                "context": spec.context_terms,
+            },
+            negation_cues=spec.negation_cues,
+            negatable_groups=("symptoms",),
+            # A missed red flag is the costly error, so only an explicit cue
+            # directly before one ("no chest pain", "denies fainting") hides it.
+            strict_negation_cues=spec.red_flag_negation_cues,
+            strict_negation_groups=("red_flags",),
+        )
+        self.red_flag_order = tuple(spec.red_flags)
+        self.risk_condition_weights = MappingProxyType(dict(spec.risk_condition_weights))
+        self.elevated_risk_conditions = frozenset(spec.elevated_risk_conditions)
+        self.self_care = MappingProxyType({symptom: tuple(actions) for symptom, actions in spec.self_care.items()})
+        self.general_monitoring = tuple(spec.general_monitoring)
+        self.seek_care_thresholds = MappingProxyType(dict(spec.seek_care_thresholds))
+        self.urgency_explanations = MappingProxyType(dict(spec.urgency_explanations))
+        # Urgency responses depend only on the level, so build them once.
+        self.urgency_responses = MappingProxyType(
+            {
+                level: {
+                    "urgency_level": level,
+                    "explanation": spec.urgency_explanations[level],
+                    "immediate_actions": tuple(spec.immediate_actions[level]),
+                    "seek_care_threshold": spec.seek_care_thresholds[level],
+                }
+                for level in URGENCY_LEVELS
+            }
+        )
+        self.urgency_matrix = MappingProxyType(
+            {
+                level: MappingProxyType(
+                    {
+                        "rank": rank,
+                        "explanation": spec.urgency_explanations[level],
+                        "seek_care_threshold": spec.seek_care_thresholds[level],
+                    }
+                )
+                for rank, level in enumerate(URGENCY_LEVELS)
+            }
+        )
+
+    def info(self) -> dict[str, Any]:
+        """Return version metadata and table sizes."""
+        return {
+            "version": self.version,
+            "format": self.spec.format,
+            "description": self.spec.description,
+            "source": self.source,
+            "generation": self.generation,
+            "loaded_at": self.loaded_at,
+            "counts": {
+                "red_flags": len(self.spec.red_flags),
+                "symptom_hints": len(self.spec.symptom_hints),
+                "context_terms": len(self.spec.context_terms),
+                "negation_cues": len(self.spec.negation_cues),
+                "red_flag_negation_cues": len(self.spec.red_flag_negation_cues),
+                "risk_conditions": len(self.risk_condition_weights),
+                "self_care": len(self.self_care),
+            },
+        }
+
+
+def parse_rule_pack(document: Mapping[str, Any], base: RulePackSpec | None = None) -> RulePackSpec:
+    """Validate a rule-pack document; sections it omits are taken from ``base``."""
+    if not isinstance(document, Mapping):
+        raise ValueError("rule pack document must be a mapping")
+    merged = {**base.model_dump(), **document} if base is not None else dict(document)
+    try:
+        return RulePackSpec.model_validate(merged)
+    except ValidationError as exc:
+        # Pydantic's message repeats the offending input; report locations only.
+        problems = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'document'}: {error['msg']}"
+            for error in exc.errors(include_url=False, include_input=False)
+        )
+        raise ValueError(f"invalid rule pack: {problems}") from None
+
+
+def resolve_rule_pack_path(path: str | PathLike[str], directory: str | PathLike[str] | None) -> Path:
+    """Resolve a requested rule-pack file, refusing anything outside ``directory``.
+
+    Relative paths are taken relative to ``directory``; symlinks are followed
+    before the check. Without a directory, loading by path is disabled.
+    """
+    if not directory:
+        raise ValueError("Loading rule packs by path is disabled; send the document inline")
+    root = Path(directory).resolve()
+    resolved = (root / path).resolve()
+    if not resolved.is_relative_to(root):
+        raise ValueError("rule pack path must be inside the configured rule-pack directory")
+    return resolved
+
+
+def read_rule_pack_file(path: str | PathLike[str]) -> dict[str, Any]:
+    """Read a JSON or YAML rule-pack document from disk.
+
+    Parse errors give the line only, never the file's contents.
+    """
+    file_path = Path(path)
+    text = file_path.read_text(encoding="utf-8")
+    if file_path.suffix.lower() in {".yaml", ".yml"}:
+        try:
+            import yaml
+        except ImportError as exc:  # pragma: no cover - pyyaml ships in requirements
+            raise ValueError("YAML rule packs require pyyaml") from exc
+        try:
+            document = yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            mark = getattr(exc, "problem_mark", None)
+            where = f" at line {mark.line + 1}" if mark is not None else ""
+            raise ValueError(f"rule pack {file_path.name} is not valid YAML{where}") from None
+    else:
+        try:
+            document = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"rule pack {file_path.name} is not valid JSON at line {exc.lineno}") from None
+    if not isinstance(document, dict):
+        raise ValueError(f"rule pack {file_path} must contain a mapping at the top level")
+    return document
+
+
+class RulePackRegistry:
+    """Holds the active compiled rule pack and swaps it atomically."""
+
+    def __init__(self, builtin: RulePackSpec) -> None:
+        self.builtin = builtin
+        self._lock = Lock()
+        self._generation = 0
+        self._listeners: list[Callable[[CompiledRulePack], None]] = []
+        self._active = CompiledRulePack(builtin, source="builtin", generation=0)
+
+    @property
+    def active(self) -> CompiledRulePack:
+        return self._active
+
+    def add_listener(self, callback: Callable[[CompiledRulePack], None]) -> None:
+        """Register a callback invoked with the new pack after every swap."""
+        self._listeners.append(callback)
+
+    def install(self, spec: RulePackSpec, source: str) -> CompiledRulePack:
+        """Compile ``spec`` and make it the active pack."""
+        with self._lock:
+            self._generation += 1
+            pack = CompiledRulePack(spec, source=source, generation=self._generation)
+            self._active = pack
+        for callback in self._listeners:
+            callback(pack)
+        return pack
+
+    def load(
+        self,
+        document: Mapping[str, Any] | None = None,
+        path: str | PathLike[str] | None = None,
+    ) -> CompiledRulePack:
+        """Validate, compile, and activate a pack from a document or a file."""
+        if (document is None) == (path is None):
+            raise ValueError("Provide exactly one of document or path")
+        if path is not None:
+            document = read_rule_pack_file(path)
+            source = str(path)
+        else:
+            source = "inline"
+        spec = parse_rule_pack(document, base=self.builtin)
+        return self.install(spec, source=source)
+
+    def reset(self) -> CompiledRulePack:
+        """Reactivate the built-in pack."""
+        return self.install(self.builtin, source="builtin")
+
+
+__all__ = [
+    "RULE_PACK_FORMAT",
+    "URGENCY_LEVELS",
+    "MAX_RISK_CONDITIONS",
+    "RulePackSpec",
+    "CompiledRulePack",
+    "RulePackRegistry",
+    "parse_rule_pack",
+    "read_rule_pack_file",
+    "resolve_rule_pack_path",
+]
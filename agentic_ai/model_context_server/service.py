@@ -4,35 +4,70 @@ from __future__ import annotations
 
 import asyncio
 import time
-from typing import TYPE_CHECKING, Any
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import structlog
 
 try:
     from ..config.settings import settings
+    from ..utils.concurrency import (
+        AdaptiveLimiter,
+        AdmissionController,
+        AdmissionRejectedError,
+        SingleFlight,
+    )
+    from ..utils.llm_clients import llm_clients
     from ..utils.monitoring import metrics
 except ImportError:
     from config.settings import settings
+    from utils.concurrency import (
+        AdaptiveLimiter,
+        AdmissionController,
+        AdmissionRejectedError,
+        SingleFlight,
+    )
+    from utils.llm_clients import llm_clients
     from utils.monitoring import metrics
+from .caching import LRUCache
 from .decision_support import (
+    URGENCY_RANK,
+    active_rule_pack,
     build_clarification_questions,
     build_monitoring_schedule,
     build_self_care_plan,
+    care_setting_key,
     compare_snapshots,
+    complete_partial_analysis,
     compute_risk_score,
-    detect_red_flags,
     emergency_checklist,
     explain_urgency,
     extract_triage_facts,
-    infer_symptoms,
+    extract_triage_facts_batch,
+    heuristic_analysis,
+    install_rule_pack,
+    load_rule_pack,
+    monitoring_schedule_key,
     recommend_care_setting,
+    red_flag_emergency_analysis,
     redact_sensitive_text,
-    suggest_urgency,
+    refine_heuristic_analysis,
+    reset_rule_pack,
+    risk_score_key,
     summarize_handoff,
+    triage_heuristics,
+    triage_heuristics_batch,
     urgency_matrix,
 )
 from .models import (
+    AnalysisStreamEvent,
     BatchAnalysisResponse,
+    BatchItemResult,
+    BatchTriageFactsResponse,
+    BatchTriageHeuristicsResponse,
     CapabilityCatalogResponse,
     CareSettingRecommendationResponse,
     ClarificationQuestionsResponse,
@@ -43,26 +78,64 @@ from .models import (
     HealthStatus,
     MetricsSnapshotResponse,
     MonitoringScheduleResponse,
+    PopulationRiskResponse,
     RiskScoreResponse,
+    RulePackStatusResponse,
     RuntimeConfig,
     RuntimePolicyValidationResponse,
     SelfCarePlanResponse,
+    StreamingBatchAnalysisResponse,
     SymptomAnalysisRequest,
     SymptomAnalysisResponse,
     SymptomComparisonResponse,
     TextRedactionResponse,
     TriageFactsResponse,
+    TriageHeuristicsRequest,
     TriageHeuristicsResponse,
     UrgencyExplanationResponse,
 )
+from .population_risk import encode_conditions, score_population
+from .result_cache import ResultCacheBackend, analysis_cache_key, build_result_cache
+from .rule_pack import resolve_rule_pack_path
 
 logger = structlog.get_logger()
 
+# Extra time past a run's deadline before the service gives up on it.
+DEADLINE_GRACE_SECONDS = 1.0
+# Longest wait between warm-up retries.
+WARMUP_RETRY_MAX_BACKOFF_SECONDS = 60.0
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 if TYPE_CHECKING:
     try:
         from ..graphs.assembly_line import SymptomSyncGraph
     except ImportError:
         from graphs.assembly_line import SymptomSyncGraph
+    try:
+        from ..chains.fast_triage_chain import FastTriageChain
+    except ImportError:
+        from chains.fast_triage_chain import FastTriageChain
+
+
+class _ResponseTables:
+    """Prebuilt responses for tools whose whole input domain is tiny."""
+
+    def __init__(self, generation: int) -> None:
+        self.generation = generation
+        self.urgency_explanations = {
+            level: UrgencyExplanationResponse(**explain_urgency(level)) for level in URGENCY_RANK
+        }
+        self.urgency_matrix = urgency_matrix()
+        self.care_settings = {
+            (level, score, has_primary_care): CareSettingRecommendationResponse(
+                **recommend_care_setting(level, score, has_primary_care)
+            )
+            for level in URGENCY_RANK
+            for score in range(101)
+            for has_primary_care in (True, False)
+        }
 
 
 class SymptomSyncMCPService:
@@ -70,97 +143,603 @@ class SymptomSyncMCPService:
 
     def __init__(self) -> None:
         self._graph: SymptomSyncGraph | None = None
+        self._graph_lock = Lock()
+        self._warmup_task: asyncio.Task | None = None
+        self.warmup_status = "pending"
+        self._warmup_error: str | None = None
+        self._fast_chain: FastTriageChain | None = None
+        self._triage_executor: ProcessPoolExecutor | None = None
+        self._response_tables: _ResponseTables | None = None
+        self._risk_score_cache: LRUCache[tuple, RiskScoreResponse] = LRUCache(settings.mcp_response_cache_size)
+        self._monitoring_cache: LRUCache[tuple, MonitoringScheduleResponse] = LRUCache(
+            settings.mcp_response_cache_size
+        )
         self.logger = logger.bind(component="SymptomSyncMCPService")
+        self.analysis_cache: ResultCacheBackend | None = build_result_cache(
+            settings.mcp_analysis_cache_backend,
+            maxsize=settings.mcp_analysis_cache_size,
+            ttl_seconds=settings.mcp_analysis_cache_ttl_seconds,
+        )
+        self._analysis_flights: SingleFlight[str, SymptomAnalysisResponse] = SingleFlight()
+        self._background_tasks: set[asyncio.Task] = set()
+        # When each red-flag key last got an enrichment run; repeats within
+        # the result-cache TTL reuse that attempt instead of starting another.
+        self._enrichment_attempts: LRUCache[str, float] = LRUCache(settings.mcp_analysis_cache_size)
+        # Shared by every LLM-bound analysis, single or batched.
+        self.admission = AdmissionController(
+            max_in_flight=settings.mcp_admission_max_in_flight,
+            max_queue=settings.mcp_admission_max_queue,
+            queue_timeout=settings.mcp_admission_queue_timeout_seconds,
+            on_change=lambda admission: metrics.set_admission_state(admission.in_flight, admission.queued),
+            on_shed=metrics.record_load_shed,
+        )
+        self.llm_limiter = AdaptiveLimiter(
+            initial=settings.mcp_llm_concurrency_initial,
+            min_limit=settings.mcp_llm_concurrency_min,
+            max_limit=settings.mcp_llm_concurrency_max,
+            latency_tolerance=settings.mcp_llm_latency_tolerance,
+            on_change=lambda limiter: metrics.set_llm_concurrency(limiter.limit, limiter.in_flight),
+            on_backoff=metrics.record_llm_backoff,
+        )
+        if settings.mcp_rule_pack_path:
+            # Deployment config is trusted; only tool calls are confined to mcp_rule_pack_dir.
+            self._activate_rule_pack(path=settings.mcp_rule_pack_path)
 
     def _get_graph(self) -> SymptomSyncGraph:
         """Lazy-load the graph so startup works without model credentials."""
         if self._graph is None:
+            # Warm-up builds the graph in a worker thread; never build it twice.
+            with self._graph_lock:
+                if self._graph is None:
+                    try:
+                        from ..graphs.assembly_line import SymptomSyncGraph
+                    except ImportError:
+                        from graphs.assembly_line import SymptomSyncGraph
+
+                    self.logger.info("Initializing symptom analysis graph")
+                    self._graph = SymptomSyncGraph()
+        return self._graph
+
+    def start_warmup(self) -> asyncio.Task:
+        """Start warm-up in the background once; later calls return the same task.
+
+        A failed warm-up is retried with exponential backoff until it succeeds,
+        so a provider or vector-store outage at startup does not leave the
+        service unready for good.
+        """
+        if self._warmup_task is None:
+            self._warmup_task = asyncio.ensure_future(self._warm_up_until_ready(settings.mcp_warmup_dry_run))
+        return self._warmup_task
+
+    async def stop_warmup(self) -> None:
+        """Cancel a warm-up that is still running or waiting to retry."""
+        task, self._warmup_task = self._warmup_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _warm_up_until_ready(self, dry_run: bool) -> None:
+        delay = settings.mcp_warmup_retry_backoff_seconds
+        await self.warm_up(dry_run=dry_run)
+        while self.warmup_status == "failed":
+            self.logger.info("Retrying warm-up", delay_seconds=delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WARMUP_RETRY_MAX_BACKOFF_SECONDS)
+            await self.warm_up(dry_run=dry_run)
+
+    async def warm_up(self, dry_run: bool = False) -> None:
+        """Pay graph construction before the first request instead of during it.
+
+        Builds the agents, embeddings, vector store and compiled graph off the
+        event loop. With ``dry_run`` a synthetic analysis then runs through
+        every stage with a stub chat model. ``warmup_status`` ends as
+        ``ready`` or ``failed``; failures are logged, not raised.
+        """
+        self.warmup_status = "running"
+        start_time = time.time()
+        try:
+            graph = await asyncio.to_thread(self._get_graph)
+            if dry_run:
+                await graph.dry_run()
+        except Exception as exc:
+            duration = time.time() - start_time
+            self.warmup_status = "failed"
+            self._warmup_error = str(exc)
+            self.logger.error("Warm-up failed", error=str(exc), duration=duration)
+            metrics.record_warmup(duration, status="error")
+            return
+
+        duration = time.time() - start_time
+        self.warmup_status = "ready"
+        self.logger.info("Warm-up complete", duration=duration, dry_run=dry_run)
+        metrics.record_warmup(duration)
+
+    def _get_fast_chain(self) -> FastTriageChain:
+        """Lazy-load the single-call chain used by fast-mode analyses."""
+        if self._fast_chain is None:
             try:
-                from ..graphs.assembly_line import SymptomSyncGraph
+                from ..chains.fast_triage_chain import FastTriageChain
             except ImportError:
-                from graphs.assembly_line import SymptomSyncGraph
+                from chains.fast_triage_chain import FastTriageChain
 
-            self.logger.info("Initializing symptom analysis graph")
-            self._graph = SymptomSyncGraph()
-        return self._graph
+            self._fast_chain = FastTriageChain()
+        return self._fast_chain
+
+    def _get_triage_executor(self) -> ProcessPoolExecutor:
+        """Lazy-create the process pool used for large deterministic batches."""
+        if self._triage_executor is None:
+            pack = active_rule_pack()
+            self._triage_executor = ProcessPoolExecutor(
+                max_workers=settings.mcp_triage_batch_workers,
+                initializer=install_rule_pack,
+                initargs=(pack.spec.model_dump(), pack.source),
+            )
+        return self._triage_executor
+
+    def _tables(self, cache: str) -> _ResponseTables:
+        """Return response tables for the active rule pack, rebuilding after a swap."""
+        generation = active_rule_pack().generation
+        tables = self._response_tables
+        if tables is None or tables.generation != generation:
+            metrics.record_cache_event(cache, "miss")
+            tables = self._response_tables = _ResponseTables(generation)
+        else:
+            metrics.record_cache_event(cache, "hit")
+        return tables
+
+    def _memoized(self, name: str, cache: LRUCache[tuple, T], key: tuple, factory: Callable[[], T]) -> T:
+        """Look up a frozen response, building and storing it on a miss."""
+        response = cache.get(key)
+        if response is None:
+            metrics.record_cache_event(name, "miss")
+            response = factory()
+            evictions = cache.evictions
+            cache.set(key, response)
+            if cache.evictions != evictions:
+                metrics.record_cache_event(name, "eviction", cache.evictions - evictions)
+        else:
+            metrics.record_cache_event(name, "hit")
+        return response
+
+    def shutdown_triage_executor(self) -> None:
+        """Stop triage pool workers; a new pool is created on next use."""
+        if self._triage_executor is not None:
+            self._triage_executor.shutdown(wait=False, cancel_futures=True)
+            self._triage_executor = None
+
+    async def _map_triage_batch(
+        self,
+        chunk_fn: Callable[[list[T]], list[R]],
+        items: Sequence[T],
+    ) -> list[R]:
+        """Run a chunk function inline for small batches or across the process pool."""
+        if len(items) <= settings.mcp_triage_batch_inline_threshold:
+            return chunk_fn(list(items))
+
+        chunk_size = settings.mcp_triage_batch_chunk_size
+        chunks = [list(items[i : i + chunk_size]) for i in range(0, len(items), chunk_size)]
+        loop = asyncio.get_running_loop()
+        try:
+            executor = self._get_triage_executor()
+            chunk_results = await asyncio.gather(
+                *(loop.run_in_executor(executor, chunk_fn, chunk) for chunk in chunks)
+            )
+        except BrokenProcessPool as exc:
+            self.logger.error("Triage process pool failed; running batch in a thread", error=str(exc))
+            metrics.record_error("mcp_service", "BrokenProcessPool")
+            self.shutdown_triage_executor()
+            # Keep the event loop free; a full batch takes long to score inline
+            return await asyncio.to_thread(chunk_fn, list(items))
+        return [result for chunk in chunk_results for result in chunk]
+
+    async def _cached_analysis(self, key: str) -> SymptomAnalysisResponse | None:
+        """Return a cached analysis; cache backend failures count as misses."""
+        try:
+            payload = await self.analysis_cache.get(key)
+        except Exception as exc:
+            self.logger.warning("Analysis cache lookup failed", error=str(exc))
+            metrics.record_error("analysis_cache", exc.__class__.__name__)
+            payload = None
+        if payload is None:
+            metrics.record_cache_event("analysis", "miss")
+            return None
+        metrics.record_cache_event("analysis", "hit")
+        return SymptomAnalysisResponse.model_validate_json(payload)
+
+    async def _store_analysis(self, key: str, response: SymptomAnalysisResponse) -> None:
+        try:
+            evicted = await self.analysis_cache.set(key, response.model_dump_json())
+        except Exception as exc:
+            self.logger.warning("Analysis cache store failed", error=str(exc))
+            metrics.record_error("analysis_cache", exc.__class__.__name__)
+            return
+        if evicted:
+            metrics.record_cache_event("analysis", "eviction", evicted)
 
     async def analyze_symptoms(self, request: SymptomAnalysisRequest) -> SymptomAnalysisResponse:
-        """Run the full graph for a single symptom analysis request."""
+        """Analyze a symptom description at the depth selected by ``request.mode``.
+
+        ``heuristic`` answers from ``decision_support`` alone, ``fast`` adds one
+        compact LLM call, and ``full`` runs the multi-agent graph. LLM-backed
+        results are cached by request content (see
+        ``result_cache.analysis_cache_key``), and identical requests arriving
+        while one is running share it. Full analyses in a session build on its
+        earlier turns and skip the result cache. LLM runs pass global admission control
+        and raise ``AdmissionRejectedError`` when the process is overloaded.
+        """
         start_time = time.time()
+        try:
+            return await self._analyze(request, start_time)
+        finally:
+            metrics.record_analysis_latency(request.mode, time.time() - start_time)
+
+    def _heuristic_response(self, request: SymptomAnalysisRequest, start_time: float) -> SymptomAnalysisResponse:
+        analysis = self._baseline_analysis(request)
+        return SymptomAnalysisResponse(**analysis, mode=request.mode, processing_time=time.time() - start_time)
+
+    async def _analyze(self, request: SymptomAnalysisRequest, start_time: float) -> SymptomAnalysisResponse:
+        if request.mode == "heuristic":
+            return self._heuristic_response(request, start_time)
+
+        key = self._analysis_key(request)
+        answered = await self._answer_without_llm(request, key, start_time)
+        if answered is not None:
+            return answered
+
+        response, shared = await self._analysis_flights.do(key, lambda: self._admitted_analysis(request, key))
+        if shared:
+            metrics.record_coalesced_request("analyze_symptoms")
+            return response.model_copy(deep=True)
+        return response
+
+    def _analysis_key(self, request: SymptomAnalysisRequest) -> str:
+        key = analysis_cache_key(request)
+        if self._session_scoped(request):
+            # Only identical requests of the same session may share a run
+            key = f"{key}:session:{request.user_id}:{request.session_id}"
+        return key
+
+    async def _answer_without_llm(
+        self, request: SymptomAnalysisRequest, key: str, start_time: float
+    ) -> SymptomAnalysisResponse | None:
+        """Red-flag short-circuit or cached result, if either applies."""
+        if settings.mcp_red_flag_short_circuit:
+            emergency = red_flag_emergency_analysis(request.user_input)
+            if emergency is not None:
+                return await self._red_flag_response(request, key, emergency, start_time)
+
+        if self.analysis_cache is not None and not self._session_scoped(request):
+            cached = await self._cached_analysis(key)
+            if cached is not None:
+                return cached.model_copy(update={"processing_time": time.time() - start_time})
+        return None
+
+    async def _red_flag_response(
+        self,
+        request: SymptomAnalysisRequest,
+        key: str,
+        emergency: dict[str, Any],
+        start_time: float,
+    ) -> SymptomAnalysisResponse:
+        """Answer a red-flag request without waiting for the graph.
+
+        A cached full analysis is preferred once background enrichment has
+        produced one, but only if the graph also escalated to emergency.
+        Enrichment runs at most once per key per result-cache TTL, so a graph
+        that did not escalate is not rerun on every repeat.
+        """
+        metrics.record_red_flag_short_circuit()
+        # Enrichment results are only reachable through the result cache.
+        if settings.mcp_red_flag_background_enrichment and self.analysis_cache is not None:
+            cached = await self._cached_analysis(key)
+            if cached is not None and cached.urgency_level == "emergency":
+                return cached.model_copy(update={"processing_time": time.time() - start_time})
+            now = time.monotonic()
+            attempted = self._enrichment_attempts.get(key)
+            if attempted is None or now - attempted >= settings.mcp_analysis_cache_ttl_seconds:
+                self._enrichment_attempts.set(key, now)
+                self._spawn_background(
+                    self._analysis_flights.do(key, lambda: self._admitted_analysis(request, key))
+                )
+        return SymptomAnalysisResponse(**emergency, mode=request.mode, processing_time=time.time() - start_time)
+
+    @staticmethod
+    def _session_scoped(request: SymptomAnalysisRequest) -> bool:
+        """Full analyses in a session build on its earlier turns, so they bypass the result cache."""
+        return (
+            request.mode == "full"
+            and request.session_id is not None
+            and settings.agent_session_store.lower() != "none"
+        )
+
+    def _spawn_background(self, coroutine: Awaitable[Any]) -> None:
+        """Run a coroutine detached from the caller, keeping a strong reference."""
+        task = asyncio.ensure_future(coroutine)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # Enrichment is best effort; a shed run just leaves the fast answer in place.
+            self.logger.warning("Background analysis did not run", error=str(task.exception()))
+
+    async def drain_background_tasks(self) -> None:
+        """Wait for background enrichment runs to finish."""
+        while self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+    @staticmethod
+    def _baseline_analysis(request: SymptomAnalysisRequest) -> dict[str, Any]:
+        return heuristic_analysis(
+            request.user_input,
+            age=request.age,
+            known_conditions=request.medical_history,
+            allergies=request.allergies,
+            current_medications=request.current_medications,
+        )
+
+    async def _graph_analysis(self, request: SymptomAnalysisRequest, deadline: float) -> dict[str, Any]:
+        # The graph budgets its agents against the deadline and reports
+        # ``partial`` when it had to stop early; fill the gaps from the rules.
+        result = await self._get_graph().analyze_symptoms({**request.model_dump(), "deadline": deadline})
+        return self._complete_graph_result(request, result)
+
+    def _complete_graph_result(self, request: SymptomAnalysisRequest, result: dict[str, Any]) -> dict[str, Any]:
+        if not result.get("partial"):
+            return result
+        return {**complete_partial_analysis(self._baseline_analysis(request), result), "partial": True}
+
+    async def _fast_analysis(self, request: SymptomAnalysisRequest, deadline: float) -> dict[str, Any]:
+        baseline = self._baseline_analysis(request)
+        refinement = await self._get_fast_chain().analyze(request.model_dump(), baseline)
+        return refine_heuristic_analysis(baseline, refinement)
+
+    async def _admitted_analysis(self, request: SymptomAnalysisRequest, key: str) -> SymptomAnalysisResponse:
+        """Run the LLM path once admission control grants a slot.
+
+        Raises ``AdmissionRejectedError`` when the process is too busy to start the
+        run within the queue-time budget.
+        """
+        # The deadline covers queueing too, so a run admitted late gets only what is left.
+        deadline = time.monotonic() + self._analysis_timeout(request.mode)
+        async with self.admission.admit():
+            return await self._run_analysis(request, key, deadline)
+
+    @staticmethod
+    def _analysis_timeout(mode: str) -> float:
+        return settings.mcp_fast_timeout_seconds if mode == "fast" else settings.mcp_tool_timeout_seconds
+
+    async def _run_analysis(
+        self, request: SymptomAnalysisRequest, key: str, deadline: float
+    ) -> SymptomAnalysisResponse:
+        """Run the LLM path once and cache a successful result under ``key``.
+
+        Waiting for an LLM slot counts against ``deadline``. Fast-mode failures
+        degrade to the heuristic answer instead of an error.
+        """
+        start_time = time.time()
+        runner = self._fast_analysis if request.mode == "fast" else self._graph_analysis
+        timeout = self._analysis_timeout(request.mode)
         metrics.increment_active_requests()
 
         try:
-            result = await asyncio.wait_for(
-                self._get_graph().analyze_symptoms(request.model_dump()),
-                timeout=settings.mcp_tool_timeout_seconds,
-            )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("deadline passed while waiting for admission")
+            async with self.llm_limiter.slot(latency_class=request.mode, timeout=remaining):
+                # The graph stops itself at the deadline; the grace period only
+                # catches runners that do not honor it.
+                result = await asyncio.wait_for(
+                    runner(request, deadline),
+                    timeout=max(0.0, deadline - time.monotonic()) + DEADLINE_GRACE_SECONDS,
+                )
             duration = time.time() - start_time
             metrics.record_pipeline_execution(duration, status="success")
-
-            return SymptomAnalysisResponse(
-                symptoms=result.get("symptoms", []),
-                preliminary_diagnosis=result.get("preliminary_diagnosis", []),
-                risk_assessment=result.get("risk_assessment", {}),
-                urgency_level=result.get("urgency_level", "unknown"),
-                recommendations=result.get("recommendations", []),
-                when_to_see_doctor=result.get(
-                    "when_to_see_doctor",
-                    "Consult a healthcare professional.",
-                ),
-                confidence_score=float(result.get("confidence_score", 0.0)),
-                processing_time=float(result.get("processing_time", duration)),
-            )
+            return await self._finish_analysis(request, key, result, duration)
 
         except TimeoutError as exc:  # pragma: no cover - protective fallback
             duration = time.time() - start_time
             self.logger.error(
                 "Symptom analysis timed out",
-                timeout_seconds=settings.mcp_tool_timeout_seconds,
+                mode=request.mode,
+                timeout_seconds=timeout,
                 error=str(exc),
             )
             metrics.record_error("mcp_service", "TimeoutError")
             metrics.record_pipeline_execution(duration, status="error")
-
-            return SymptomAnalysisResponse(
-                symptoms=[],
-                preliminary_diagnosis=[],
-                risk_assessment={},
-                urgency_level="unknown",
-                recommendations=[
-                    "The analysis timed out. Please retry or consult a healthcare professional."
-                ],
-                when_to_see_doctor="As soon as possible",
-                confidence_score=0.0,
-                processing_time=duration,
+            if request.mode == "fast":
+                return self._heuristic_response(request, start_time)
+            return self._failed_response(
+                request, duration, "The analysis timed out. Please retry or consult a healthcare professional."
             )
 
         except Exception as exc:  # pragma: no cover - protective fallback
             duration = time.time() - start_time
-            self.logger.error("Symptom analysis failed", error=str(exc))
+            self.logger.error("Symptom analysis failed", mode=request.mode, error=str(exc))
             metrics.record_error("mcp_service", exc.__class__.__name__)
             metrics.record_pipeline_execution(duration, status="error")
-
-            return SymptomAnalysisResponse(
-                symptoms=[],
-                preliminary_diagnosis=[],
-                risk_assessment={},
-                urgency_level="unknown",
-                recommendations=[
-                    "We encountered an error processing your request. Please consult a healthcare professional."
-                ],
-                when_to_see_doctor="As soon as possible",
-                confidence_score=0.0,
-                processing_time=duration,
+            if request.mode == "fast":
+                return self._heuristic_response(request, start_time)
+            return self._failed_response(
+                request,
+                duration,
+                "We encountered an error processing your request. Please consult a healthcare professional.",
             )
 
         finally:
             metrics.decrement_active_requests()
 
+    async def _finish_analysis(
+        self,
+        request: SymptomAnalysisRequest,
+        key: str,
+        result: dict[str, Any],
+        duration: float,
+    ) -> SymptomAnalysisResponse:
+        """Build the response for an LLM run and cache it when it is reusable."""
+        response = SymptomAnalysisResponse(
+            symptoms=result.get("symptoms", []),
+            preliminary_diagnosis=result.get("preliminary_diagnosis", []),
+            risk_assessment=result.get("risk_assessment", {}),
+            urgency_level=result.get("urgency_level", "unknown"),
+            recommendations=result.get("recommendations", []),
+            when_to_see_doctor=result.get(
+                "when_to_see_doctor",
+                "Consult a healthcare professional.",
+            ),
+            confidence_score=float(result.get("confidence_score", 0.0)),
+            processing_time=float(result.get("processing_time", duration)),
+            mode=request.mode,
+            partial=bool(result.get("partial", False)),
+        )
+        # The graph reports its own failures as an "unknown" fallback; never cache those,
+        # results cut short by the deadline, or answers that depend on a session's history.
+        if (
+            self.analysis_cache is not None
+            and response.urgency_level != "unknown"
+            and not response.partial
+            and not self._session_scoped(request)
+        ):
+            await self._store_analysis(key, response)
+        return response
+
+    @staticmethod
+    def _failed_response(request: SymptomAnalysisRequest, duration: float, message: str) -> SymptomAnalysisResponse:
+        return SymptomAnalysisResponse(
+            symptoms=[],
+            preliminary_diagnosis=[],
+            risk_assessment={},
+            urgency_level="unknown",
+            recommendations=[message],
+            when_to_see_doctor="As soon as possible",
+            confidence_score=0.0,
+            processing_time=duration,
+            mode=request.mode,
+        )
+
+    async def stream_analysis(self, request: SymptomAnalysisRequest) -> AsyncIterator[AnalysisStreamEvent]:
+        """Yield a full analysis stage by stage, ending with the complete response.
+
+        Each graph stage that produces output (symptoms and urgency first,
+        then diagnoses, risk, and recommendations) is yielded as a ``stage``
+        event as soon as it finishes; the last event has type ``result``.
+        Other modes, red-flag short-circuits, and cache hits have no stages
+        and yield only the result. Streamed runs are not shared with
+        identical in-flight requests. Raises ``AdmissionRejectedError`` before the
+        first event when the process is overloaded; closing the iterator
+        early cancels the run.
+
+        The graph runs in its own task and buffers events for the caller, so
+        its admission and LLM slots are returned when the graph finishes,
+        not when a slow client has read the last event.
+        """
+        start_time = time.time()
+        try:
+            if request.mode != "full":
+                response = await self._analyze(request, start_time)
+            else:
+                key = self._analysis_key(request)
+                response = await self._answer_without_llm(request, key, start_time)
+                if response is None:
+                    deadline = time.monotonic() + settings.mcp_tool_timeout_seconds
+                    events: asyncio.Queue[AnalysisStreamEvent | Exception | None] = asyncio.Queue()
+                    producer = asyncio.ensure_future(
+                        self._admitted_graph_stream(request, key, start_time, deadline, events)
+                    )
+                    try:
+                        while (event := await events.get()) is not None:
+                            if isinstance(event, Exception):
+                                raise event
+                            yield event
+                    finally:
+                        producer.cancel()
+                        await asyncio.gather(producer, return_exceptions=True)
+                    return
+            yield AnalysisStreamEvent(type="result", elapsed_seconds=time.time() - start_time, result=response)
+        finally:
+            metrics.record_analysis_latency(request.mode, time.time() - start_time)
+
+    async def _admitted_graph_stream(
+        self,
+        request: SymptomAnalysisRequest,
+        key: str,
+        start_time: float,
+        deadline: float,
+        events: asyncio.Queue[AnalysisStreamEvent | Exception | None],
+    ) -> None:
+        """Run a streamed analysis under admission, queueing its events and then ``None``.
+
+        A rejection by admission control is queued in place of the events.
+        """
+        try:
+            async with self.admission.admit():
+                async for event in self._stream_graph_analysis(request, key, start_time, deadline):
+                    events.put_nowait(event)
+        except Exception as exc:
+            events.put_nowait(exc)
+        finally:
+            events.put_nowait(None)
+
+    async def _stream_graph_analysis(
+        self,
+        request: SymptomAnalysisRequest,
+        key: str,
+        start_time: float,
+        deadline: float,
+    ) -> AsyncIterator[AnalysisStreamEvent]:
+        metrics.increment_active_requests()
+        try:
+            try:
+                async with self.llm_limiter.slot(latency_class="full", timeout=deadline - time.monotonic()):
+                    # The graph stops itself at the deadline and reports ``partial``.
+                    graph_input = {**request.model_dump(), "deadline": deadline}
+                    async for event in self._get_graph().stream_analysis(graph_input):
+                        if event["stage"] == "result":
+                            result = self._complete_graph_result(request, event["data"])
+                            continue
+                        yield AnalysisStreamEvent(
+                            type="stage",
+                            stage=event["stage"],
+                            elapsed_seconds=time.time() - start_time,
+                            **event["data"],
+                        )
+                duration = time.time() - start_time
+                metrics.record_pipeline_execution(duration, status="success")
+                response = await self._finish_analysis(request, key, result, duration)
+            except Exception as exc:  # pragma: no cover - protective fallback
+                duration = time.time() - start_time
+                self.logger.error("Streamed symptom analysis failed", mode=request.mode, error=str(exc))
+                metrics.record_error("mcp_service", exc.__class__.__name__)
+                metrics.record_pipeline_execution(duration, status="error")
+                response = self._failed_response(
+                    request,
+                    duration,
+                    "We encountered an error processing your request. Please consult a healthcare professional.",
+                )
+            yield AnalysisStreamEvent(type="result", elapsed_seconds=time.time() - start_time, result=response)
+        finally:
+            metrics.decrement_active_requests()
+
+    def parse_batch_requests(self, requests: list[dict[str, Any]]) -> list[SymptomAnalysisRequest]:
+        """Validate raw batch items against the configured batch size limit."""
+        if not requests:
+            raise ValueError("At least one request is required")
+        if len(requests) > settings.mcp_batch_max_requests:
+            raise ValueError(
+                f"A maximum of {settings.mcp_batch_max_requests} requests is allowed",
+            )
+        return [SymptomAnalysisRequest.model_validate(item) for item in requests]
+
     async def batch_analyze_symptoms(
         self,
         requests: list[SymptomAnalysisRequest],
     ) -> BatchAnalysisResponse:
-        """Run symptom analysis for a batch of requests."""
+        """Run symptom analysis for a batch of requests.
+
+        If any item is shed by admission control the whole batch fails and
+        the remaining items are cancelled rather than left running.
+        """
         start_time = time.time()
         semaphore = asyncio.Semaphore(max(1, settings.mcp_batch_max_concurrency))
 
@@ -168,10 +747,93 @@ class SymptomSyncMCPService:
             async with semaphore:
                 return await self.analyze_symptoms(request)
 
-        results = await asyncio.gather(*(run_single(request) for request in requests))
+        tasks = [asyncio.ensure_future(run_single(request)) for request in requests]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
         total_time = time.time() - start_time
         return BatchAnalysisResponse(results=results, total_processing_time=total_time)
 
+    async def stream_batch_analysis(
+        self,
+        requests: list[SymptomAnalysisRequest],
+        timeout_seconds: float | None = None,
+    ) -> AsyncIterator[BatchItemResult]:
+        """Yield batch items in completion order.
+
+        Items still running at the deadline are cancelled and yielded with
+        status ``timeout``, so callers always receive one entry per request.
+        Raises ``AdmissionRejectedError`` if the first item to finish was shed
+        by admission control; later shed items are yielded with status
+        ``error``. Closing the iterator early cancels the remaining work.
+        """
+        start_time = time.monotonic()
+        deadline = start_time + (timeout_seconds or settings.mcp_batch_stream_timeout_seconds)
+        semaphore = asyncio.Semaphore(max(1, settings.mcp_batch_max_concurrency))
+
+        async def run_single(request: SymptomAnalysisRequest) -> SymptomAnalysisResponse:
+            async with semaphore:
+                return await self.analyze_symptoms(request)
+
+        indexes = {asyncio.ensure_future(run_single(request)): index for index, request in enumerate(requests)}
+        pending = set(indexes)
+        yielded = False
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, deadline - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    break
+                for task in sorted(done, key=indexes.__getitem__):
+                    elapsed = time.monotonic() - start_time
+                    exc = task.exception()
+                    if isinstance(exc, AdmissionRejectedError) and not yielded:
+                        raise exc
+                    yielded = True
+                    if exc is not None:
+                        metrics.record_error("mcp_service", exc.__class__.__name__)
+                        yield BatchItemResult(index=indexes[task], status="error", elapsed_seconds=elapsed, error=str(exc))
+                    else:
+                        yield BatchItemResult(
+                            index=indexes[task],
+                            status="completed",
+                            elapsed_seconds=elapsed,
+                            result=task.result(),
+                        )
+
+            for task in sorted(pending, key=indexes.__getitem__):
+                task.cancel()
+                yield BatchItemResult(
+                    index=indexes[task],
+                    status="timeout",
+                    elapsed_seconds=time.monotonic() - start_time,
+                    error="Batch deadline reached before this item finished",
+                )
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def streaming_batch_summary(
+        items: list[BatchItemResult],
+        total_processing_time: float,
+    ) -> StreamingBatchAnalysisResponse:
+        """Wrap streamed items with per-status counts."""
+        statuses = [item.status for item in items]
+        return StreamingBatchAnalysisResponse(
+            items=items,
+            completed=statuses.count("completed"),
+            failed=statuses.count("error"),
+            timed_out=statuses.count("timeout"),
+            total_processing_time=total_processing_time,
+        )
+
     def get_graph_visualization(self) -> GraphVisualization:
         """Return a Mermaid representation of the graph."""
         diagram = self._get_graph().visualize()
@@ -195,8 +857,53 @@ class SymptomSyncMCPService:
             mcp_batch_max_requests=settings.mcp_batch_max_requests,
             mcp_batch_max_concurrency=settings.mcp_batch_max_concurrency,
             mcp_require_auth=settings.mcp_require_auth,
+            rule_pack_version=active_rule_pack().version,
+            rule_pack_source=active_rule_pack().source,
         )
 
+    def rule_pack_status(self) -> RulePackStatusResponse:
+        """Return metadata for the active triage rule pack."""
+        return RulePackStatusResponse(**active_rule_pack().info())
+
+    def load_rule_pack(
+        self,
+        document: dict[str, Any] | None = None,
+        path: str | None = None,
+    ) -> RulePackStatusResponse:
+        """Validate and atomically activate a triage rule pack.
+
+        Files are only read from inside ``mcp_rule_pack_dir``; without it,
+        packs must be sent inline.
+        """
+        if path is not None:
+            path = str(resolve_rule_pack_path(path, settings.mcp_rule_pack_dir))
+        return self._activate_rule_pack(document=document, path=path)
+
+    def _activate_rule_pack(
+        self,
+        document: dict[str, Any] | None = None,
+        path: str | None = None,
+    ) -> RulePackStatusResponse:
+        pack = load_rule_pack(document=document, path=path)
+        self._on_rule_pack_swapped()
+        self.logger.info("Activated triage rule pack", version=pack.version, source=pack.source)
+        return RulePackStatusResponse(**pack.info())
+
+    def reset_rule_pack(self) -> RulePackStatusResponse:
+        """Reactivate the built-in triage rule pack."""
+        pack = reset_rule_pack()
+        self._on_rule_pack_swapped()
+        self.logger.info("Restored built-in triage rule pack")
+        return RulePackStatusResponse(**pack.info())
+
+    def _on_rule_pack_swapped(self) -> None:
+        # Pool workers were initialized with the previous pack; memoized
+        # responses are keyed by pack generation, so dropping them frees memory.
+        self.shutdown_triage_executor()
+        self._response_tables = None
+        self._risk_score_cache.clear()
+        self._monitoring_cache.clear()
+
     def get_health_status(self) -> HealthStatus:
         """Return current service health metadata."""
         return HealthStatus(
@@ -212,24 +919,25 @@ class SymptomSyncMCPService:
         known_conditions: list[str] | None = None,
     ) -> TriageHeuristicsResponse:
         """Run deterministic triage heuristics without using LLM providers."""
-        red_flags = detect_red_flags(user_input)
-        symptoms = infer_symptoms(user_input)
-        urgency, reasons = suggest_urgency(
-            red_flags=red_flags,
-            severity_hint=severity_hint,
-            known_conditions=known_conditions,
-        )
-        next_step = (
-            "Seek emergency care immediately."
-            if urgency == "emergency"
-            else "Use symptom monitoring and seek care per urgency guidance."
-        )
         return TriageHeuristicsResponse(
-            detected_symptoms=symptoms,
-            detected_red_flags=red_flags,
-            suggested_urgency=urgency,
-            rationale=reasons,
-            recommended_next_step=next_step,
+            **triage_heuristics(
+                user_input=user_input,
+                severity_hint=severity_hint,
+                known_conditions=known_conditions,
+            )
+        )
+
+    async def batch_heuristic_triage(
+        self,
+        requests: list[TriageHeuristicsRequest],
+    ) -> BatchTriageHeuristicsResponse:
+        """Run deterministic triage heuristics for many texts, preserving input order."""
+        start_time = time.time()
+        items = [(item.user_input, item.severity_hint, item.known_conditions) for item in requests]
+        results = await self._map_triage_batch(triage_heuristics_batch, items)
+        return BatchTriageHeuristicsResponse(
+            results=[TriageHeuristicsResponse(**result) for result in results],
+            total_processing_time=time.time() - start_time,
         )
 
     def clarification_questions(
@@ -260,6 +968,15 @@ class SymptomSyncMCPService:
         """Extract structured triage facts from free text."""
         return TriageFactsResponse(**extract_triage_facts(user_input))
 
+    async def batch_extract_triage_facts(self, texts: list[str]) -> BatchTriageFactsResponse:
+        """Extract triage facts for many texts, preserving input order."""
+        start_time = time.time()
+        results = await self._map_triage_batch(extract_triage_facts_batch, texts)
+        return BatchTriageFactsResponse(
+            results=[TriageFactsResponse(**result) for result in results],
+            total_processing_time=time.time() - start_time,
+        )
+
     def clinician_handoff(
         self,
         user_input: str,
@@ -294,7 +1011,8 @@ class SymptomSyncMCPService:
 
     def explain_urgency_level(self, urgency_level: str) -> UrgencyExplanationResponse:
         """Explain urgency level in user-facing terms."""
-        return UrgencyExplanationResponse(**explain_urgency(urgency_level))
+        urgency = urgency_level if urgency_level in URGENCY_RANK else "medium"
+        return self._tables("urgency_explanation").urgency_explanations[urgency]
 
     def risk_score(
         self,
@@ -305,14 +1023,47 @@ class SymptomSyncMCPService:
         severity_hint: int | None = None,
     ) -> RiskScoreResponse:
         """Calculate deterministic risk score for triage prioritization."""
-        return RiskScoreResponse(
-            **compute_risk_score(
-                urgency_level=urgency_level,
-                red_flags=red_flags,
-                age=age,
-                known_conditions=known_conditions,
-                severity_hint=severity_hint,
-            )
+        key = (
+            active_rule_pack().generation,
+            *risk_score_key(urgency_level, red_flags, age, known_conditions, severity_hint),
+        )
+        return self._memoized(
+            "risk_score",
+            self._risk_score_cache,
+            key,
+            lambda: RiskScoreResponse(
+                **compute_risk_score(
+                    urgency_level=urgency_level,
+                    red_flags=red_flags,
+                    age=age,
+                    known_conditions=known_conditions,
+                    severity_hint=severity_hint,
+                )
+            ),
+        )
+
+    def population_risk(
+        self,
+        urgency_levels: list[str],
+        red_flag_counts: list[int],
+        ages: list[int | None],
+        severity_hints: list[int | None],
+        condition_masks: list[int] | None = None,
+        known_conditions: list[list[str]] | None = None,
+    ) -> PopulationRiskResponse:
+        """Score a population column-wise; conditions come as bitmasks or name lists."""
+        start_time = time.time()
+        if condition_masks is not None and known_conditions is not None:
+            raise ValueError("Provide condition_masks or known_conditions, not both")
+        if known_conditions is not None:
+            condition_masks = [encode_conditions(conditions) for conditions in known_conditions]
+        result = score_population(urgency_levels, red_flag_counts, ages, severity_hints, condition_masks)
+        return PopulationRiskResponse(
+            risk_scores=result.scores.tolist(),
+            risk_tiers=result.tiers.tolist(),
+            suggested_urgency=result.suggested_urgency.tolist(),
+            condition_order=list(result.condition_order),
+            total_processing_time=time.time() - start_time,
         )
 
     def recommend_care_setting(
@@ -322,13 +1073,8 @@ class SymptomSyncMCPService:
         has_primary_care: bool = True,
     ) -> CareSettingRecommendationResponse:
         """Recommend care setting and timing from urgency/risk."""
-        return CareSettingRecommendationResponse(
-            **recommend_care_setting(
-                urgency_level=urgency_level,
-                risk_score=risk_score_value,
-                has_primary_care=has_primary_care,
-            )
-        )
+        key = care_setting_key(urgency_level, risk_score_value, has_primary_care)
+        return self._tables("care_setting").care_settings[key]
 
     def self_care_plan(
         self,
@@ -358,35 +1104,83 @@ class SymptomSyncMCPService:
         red_flags: list[str] | None = None,
     ) -> MonitoringScheduleResponse:
         """Generate symptom monitoring schedule and escalation triggers."""
-        return MonitoringScheduleResponse(
-            **build_monitoring_schedule(
-                symptoms=symptoms,
-                urgency_level=urgency_level,
-                red_flags=red_flags,
-            )
+        return self._memoized(
+            "monitoring_schedule",
+            self._monitoring_cache,
+            monitoring_schedule_key(symptoms, urgency_level, red_flags),
+            lambda: MonitoringScheduleResponse(
+                **build_monitoring_schedule(
+                    symptoms=symptoms,
+                    urgency_level=urgency_level,
+                    red_flags=red_flags,
+                )
+            ),
         )
 
     def redact_text(self, text: str) -> TextRedactionResponse:
         """Redact common PII patterns from text payloads."""
         return TextRedactionResponse(**redact_sensitive_text(text))
 
-    def _extract_metric_value(self, metric, sample_name_suffix: str | None = None) -> float:
+    def _extract_metric_value(
+        self,
+        metric,
+        sample_name_suffix: str | None = None,
+        labels: dict[str, str] | None = None,
+    ) -> float:
         """Read current numeric value from a Prometheus metric collector."""
         value = 0.0
         for family in metric.collect():
             for sample in family.samples:
-                if sample_name_suffix is None or sample.name.endswith(sample_name_suffix):
-                    value += float(sample.value)
+                if sample_name_suffix is not None and not sample.name.endswith(sample_name_suffix):
+                    continue
+                if labels and any(sample.labels.get(name) != expected for name, expected in labels.items()):
+                    continue
+                value += float(sample.value)
         return value
 
     def metrics_snapshot(self) -> MetricsSnapshotResponse:
         """Return a compact operations snapshot for clients."""
+        speculative_hits = self._extract_metric_value(metrics.speculative_retrievals, "_total", {"outcome": "hit"})
+        speculative_misses = self._extract_metric_value(metrics.speculative_retrievals, "_total", {"outcome": "miss"})
+        speculative_checks = speculative_hits + speculative_misses
         return MetricsSnapshotResponse(
             active_requests=self._extract_metric_value(metrics.active_requests),
             pipeline_executions_total=self._extract_metric_value(metrics.pipeline_executions, "_total"),
             error_count_total=self._extract_metric_value(metrics.errors, "_total"),
             llm_calls_total=self._extract_metric_value(metrics.llm_calls, "_total"),
             vector_queries_total=self._extract_metric_value(metrics.vector_queries, "_total"),
+            cache_hits_total=self._extract_metric_value(metrics.cache_events, "_total", {"event": "hit"}),
+            cache_misses_total=self._extract_metric_value(metrics.cache_events, "_total", {"event": "miss"}),
+            cache_evictions_total=self._extract_metric_value(metrics.cache_events, "_total", {"event": "eviction"}),
+            analysis_cache_hits_total=self._extract_metric_value(
+                metrics.cache_events, "_total", {"cache": "analysis", "event": "hit"}
+            ),
+            analysis_cache_misses_total=self._extract_metric_value(
+                metrics.cache_events, "_total", {"cache": "analysis", "event": "miss"}
+            ),
+            analysis_cache_evictions_total=self._extract_metric_value(
+                metrics.cache_events, "_total", {"cache": "analysis", "event": "eviction"}
+            ),
+            coalesced_requests_total=self._extract_metric_value(metrics.coalesced_requests, "_total"),
+            red_flag_short_circuits_total=self._extract_metric_value(metrics.red_flag_short_circuits, "_total"),
+            llm_concurrency_limit=self.llm_limiter.limit,
+            llm_concurrency_in_flight=self.llm_limiter.in_flight,
+            llm_concurrency_backoffs_total=self._extract_metric_value(metrics.llm_concurrency_backoffs, "_total"),
+            llm_clients=len(llm_clients),
+            llm_http_pool_in_use=self._extract_metric_value(metrics.llm_http_pool_in_use),
+            speculative_retrieval_hits_total=speculative_hits,
+            speculative_retrieval_misses_total=speculative_misses,
+            speculative_retrieval_hit_rate=speculative_hits / speculative_checks if speculative_checks else 0.0,
+            session_stages_reused_total=self._extract_metric_value(
+                metrics.session_stages, "_total", {"outcome": "reused"}
+            ),
+            session_stages_rerun_total=self._extract_metric_value(
+                metrics.session_stages, "_total", {"outcome": "rerun"}
+            ),
+            session_evictions_total=self._extract_metric_value(metrics.session_evictions, "_total"),
+            admission_in_flight=self.admission.in_flight,
+            admission_queue_depth=self.admission.queued,
+            requests_shed_total=self._extract_metric_value(metrics.requests_shed, "_total"),
         )
 
     def dependency_status(self) -> DependencyStatusResponse:
@@ -396,6 +1190,7 @@ class SymptomSyncMCPService:
         checks = {
             "graph_ready": graph_ready,
             "graph_reason": reason,
+            "warmup_status": self.warmup_status,
             "openai_configured": bool(settings.openai_api_key),
             "anthropic_configured": bool(settings.anthropic_api_key),
             "google_ai_configured": bool(settings.google_ai_api_key),
@@ -475,6 +1270,7 @@ class SymptomSyncMCPService:
             limits={
                 "batch_max_requests": settings.mcp_batch_max_requests,
                 "batch_max_concurrency": settings.mcp_batch_max_concurrency,
+                "triage_batch_max_items": settings.mcp_triage_batch_max_items,
                 "tool_timeout_seconds": settings.mcp_tool_timeout_seconds,
             },
         )
@@ -494,10 +1290,17 @@ class SymptomSyncMCPService:
 
     def urgency_matrix_resource(self) -> dict[str, Any]:
         """Return urgency matrix for resource readers."""
-        return urgency_matrix()
+        return self._tables("urgency_matrix").urgency_matrix
 
     def is_ready(self, deep_check: bool = False) -> tuple[bool, str]:
-        """Return readiness status; deep mode validates graph initialization."""
+        """Return readiness status; deep mode validates graph initialization.
+
+        With warm-up enabled the service is not ready until warm-up succeeds.
+        """
+        if settings.mcp_warmup_enabled and self.warmup_status != "ready":
+            if self.warmup_status == "failed":
+                return False, f"warm-up failed: {self._warmup_error}"
+            return False, f"warm-up {self.warmup_status}"
         if not deep_check:
             return True, "ready"
 
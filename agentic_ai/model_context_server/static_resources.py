@@ -0,0 +1,102 @@
+"""Pre-serialized static MCP resources shared by resources, tools, and HTTP.
+
+Guideline, urgency-matrix, and capability-catalog payloads only change when the
+rule pack is swapped, primitives are (un)registered, or catalog limits change.
+Each is serialized once per such version and served with a SHA-256 ETag;
+registrations are versioned by ``mcp.registration_generation`` so a cached
+catalog read never lists primitives.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+
+try:
+    from ..config.settings import settings
+except ImportError:
+    from config.settings import settings
+from .caching import SerializedResource, VersionedCache
+from .decision_support import active_rule_pack
+from .mcp_instance import mcp
+from .models import CapabilityCatalogResponse
+from .service import service
+
+TRIAGE_GUIDELINES_URI = "symptomsync://guidelines/triage"
+URGENCY_MATRIX_URI = "symptomsync://guidelines/urgency-matrix"
+CAPABILITY_CATALOG_URI = "symptomsync://catalog/capabilities"
+
+static_resources = VersionedCache()
+
+
+async def registration_fingerprint() -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    """Return registered tool, resource, and prompt names."""
+    return (
+        tuple(tool.name for tool in await mcp.list_tools()),
+        tuple(str(resource.uri) for resource in await mcp.list_resources()),
+        tuple(prompt.name for prompt in await mcp.list_prompts()),
+    )
+
+
+def _catalog_limits() -> tuple[int, ...]:
+    return (
+        settings.mcp_batch_max_requests,
+        settings.mcp_batch_max_concurrency,
+        settings.mcp_triage_batch_max_items,
+        settings.mcp_tool_timeout_seconds,
+    )
+
+
+async def capability_catalog() -> SerializedResource:
+    """Return the serialized capability catalog for current registrations."""
+    version = (mcp.registration_generation, _catalog_limits())
+    cached = static_resources.peek(CAPABILITY_CATALOG_URI, version)
+    if cached is not None:
+        return cached
+    tools, resources, prompts = await registration_fingerprint()
+    catalog = service.capability_catalog(tools=list(tools), resources=list(resources), prompts=list(prompts))
+    return static_resources.get_or_build(
+        CAPABILITY_CATALOG_URI,
+        version,
+        lambda: SerializedResource(catalog, media_type="application/json"),
+    )
+
+
+async def capability_catalog_model() -> CapabilityCatalogResponse:
+    """Return the cached capability catalog model."""
+    return (await capability_catalog()).value
+
+
+async def triage_guidelines() -> SerializedResource:
+    """Return the serialized triage guidelines markdown."""
+    return static_resources.get_or_build(
+        TRIAGE_GUIDELINES_URI,
+        active_rule_pack().generation,
+        lambda: SerializedResource(service.triage_guidelines_markdown(), media_type="text/markdown"),
+    )
+
+
+async def urgency_matrix() -> SerializedResource:
+    """Return the serialized urgency matrix for the active rule pack."""
+    return static_resources.get_or_build(
+        URGENCY_MATRIX_URI,
+        active_rule_pack().generation,
+        lambda: SerializedResource(service.urgency_matrix_resource(), media_type="application/json"),
+    )
+
+
+STATIC_RESOURCES: dict[str, Callable[[], Awaitable[SerializedResource]]] = {
+    TRIAGE_GUIDELINES_URI: triage_guidelines,
+    URGENCY_MATRIX_URI: urgency_matrix,
+    CAPABILITY_CATALOG_URI: capability_catalog,
+}
+
+
+__all__ = [
+    "STATIC_RESOURCES",
+    "capability_catalog",
+    "capability_catalog_model",
+    "registration_fingerprint",
+    "static_resources",
+    "triage_guidelines",
+    "urgency_matrix",
+]
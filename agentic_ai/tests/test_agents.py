@@ -2,14 +2,24 @@
 Tests for individual agents
 """
 
+import asyncio
+import time
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 pytest.importorskip("langchain_core")
 
+from langchain_core.runnables import RunnableLambda  # noqa: E402
+
+from agentic_ai.agents.diagnostic_analyzer import DiagnosticAnalyzerAgent  # noqa: E402
 from agentic_ai.agents.knowledge_retriever import KnowledgeRetrieverAgent  # noqa: E402
+from agentic_ai.agents.orchestrator import OrchestratorAgent  # noqa: E402
+from agentic_ai.agents.recommendation_generator import RecommendationGeneratorAgent  # noqa: E402
+from agentic_ai.agents.risk_assessor import RiskAssessorAgent  # noqa: E402
 from agentic_ai.agents.symptom_extractor import SymptomExtractorAgent  # noqa: E402
+from agentic_ai.config.settings import settings  # noqa: E402
+from agentic_ai.utils.concurrency import AdaptiveLimiter  # noqa: E402
 
 
 @pytest.mark.asyncio
@@ -90,5 +100,235 @@ class TestKnowledgeRetrieverAgent:
         assert docs == []
 
 
+@pytest.mark.asyncio
+class TestSpeculativeRetrieval:
+    """Tests for speculative knowledge retrieval"""
+
+    async def test_speculative_retrieval_uses_heuristic_symptoms(self):
+        """Retrieval is seeded from the rule-based symptoms"""
+        agent = KnowledgeRetrieverAgent()
+        documents = [{"content": "Migraines often cause nausea.", "source": "kb"}]
+
+        with patch.object(agent, "_retrieve_documents", AsyncMock(return_value=documents)) as retrieve:
+            result = await agent.retrieve_speculatively({"heuristic_symptoms": ["headache"], "age": 40})
+
+        assert "headache" in retrieve.call_args.args[0]
+        assert result["speculative_retrieval"] == {"symptoms": ["headache"], "documents": documents}
+
+    async def test_speculative_documents_reused_when_symptoms_overlap(self):
+        """Overlapping symptom sets reuse the speculative documents"""
+        agent = KnowledgeRetrieverAgent()
+        documents = [{"content": "Migraines often cause nausea.", "source": "kb"}]
+        state = {
+            "symptoms": ["Headache", "nausea"],
+            "speculative_retrieval": {"symptoms": ["headache", "nausea", "dizziness"], "documents": documents},
+            "warnings": [],
+        }
+
+        with patch.object(agent, "_retrieve_documents", new_callable=AsyncMock) as retrieve, \
+                patch.object(agent, "_synthesize_knowledge", AsyncMock(return_value="summary")):
+            result = await agent.process(state)
+
+        retrieve.assert_not_called()
+        assert result["retrieved_documents"] == documents
+
+    async def test_speculation_miss_queries_extracted_symptoms(self):
+        """Symptom sets that differ too much trigger a fresh query"""
+        agent = KnowledgeRetrieverAgent()
+        state = {
+            "symptoms": ["chest pain"],
+            "speculative_retrieval": {"symptoms": ["headache"], "documents": [{"content": "x", "source": "kb"}]},
+            "warnings": [],
+        }
+
+        with patch.object(agent, "_retrieve_documents", AsyncMock(return_value=[])) as retrieve, \
+                patch.object(agent, "_synthesize_knowledge", AsyncMock(return_value="summary")):
+            result = await agent.process(state)
+
+        assert "chest pain" in retrieve.call_args.args[0]
+        assert result["retrieved_documents"] == []
+
+
+@pytest.mark.asyncio
+class TestAgentDeadlines:
+    """Tests for deadline budgeting in BaseAgent"""
+
+    async def test_agent_past_deadline_is_skipped(self):
+        """An agent whose deadline has passed does not run"""
+        agent = SymptomExtractorAgent()
+        state = {"deadline": time.monotonic() - 1, "warnings": [], "agent_history": []}
+
+        with patch.object(agent, "process", new_callable=AsyncMock) as process:
+            result = await agent(state)
+
+        process.assert_not_called()
+        assert result["deadline_exceeded"] is True
+        assert result["agent_history"] == ["SymptomExtractor"]
+        assert "errors" not in result
+
+    async def test_slow_agent_is_stopped_at_deadline(self):
+        """Work still running at the deadline is dropped, not reported as an error"""
+        agent = SymptomExtractorAgent()
+
+        async def slow(state):
+            await asyncio.sleep(1)
+            return {"symptoms": ["headache"]}
+
+        with patch.object(agent, "process", side_effect=slow):
+            result = await agent({"deadline": time.monotonic() + 0.01, "warnings": [], "agent_history": []})
+
+        assert "symptoms" not in result
+        assert result["deadline_exceeded"] is True
+
+    async def test_knowledge_synthesis_skipped_when_time_is_short(self):
+        """Knowledge synthesis falls back to excerpts near the deadline"""
+        agent = KnowledgeRetrieverAgent()
+        documents = [{"content": "Tension headaches are common.", "source": "kb"}]
+        state = {"symptoms": ["headache"], "deadline": time.monotonic() + 1, "warnings": []}
+
+        with patch.object(agent, "_retrieve_documents", AsyncMock(return_value=documents)), \
+                patch.object(agent, "_synthesize_knowledge", new_callable=AsyncMock) as synthesize, \
+                patch.object(settings, "agent_optional_min_budget_seconds", 5.0):
+            result = await agent.process(state)
+
+        synthesize.assert_not_called()
+        assert result["synthesized_knowledge"] == "Source 1: Tension headaches are common."
+        assert result["warnings"]
+
+    async def test_orchestrator_ends_run_after_deadline(self):
+        """The orchestrator still runs past the deadline, and ends the run"""
+        agent = OrchestratorAgent()
+        state = {
+            "deadline": time.monotonic() - 1,
+            "warnings": [],
+            "agent_history": ["SymptomExtractor"],
+            "current_agent": "SymptomExtractor",
+        }
+
+        result = await agent(state)
+
+        assert result["next_action"] == "end"
+        assert result["deadline_exceeded"] is True
+
+
+class ProviderThrottledError(Exception):
+    status_code = 429
+
+
+async def _throttled(_prompt):
+    raise ProviderThrottledError("429 Too Many Requests")
+
+
+def _throttled_sync(_prompt):
+    raise ProviderThrottledError("429 Too Many Requests")
+
+
+THROTTLED_LLM = RunnableLambda(_throttled_sync, afunc=_throttled)
+
+
+@pytest.mark.asyncio
+class TestProviderOverload:
+    """Provider throttling swallowed by an agent still backs the LLM limiter off"""
+
+    @pytest.mark.parametrize(
+        "agent_class",
+        [SymptomExtractorAgent, DiagnosticAnalyzerAgent, RiskAssessorAgent, RecommendationGeneratorAgent],
+    )
+    async def test_provider_429_shrinks_the_limiter(self, agent_class):
+        agent = agent_class(llm=THROTTLED_LLM)
+        state = {
+            "user_input": "I have had a headache since yesterday",
+            "symptoms": ["headache"],
+            "symptom_severity": {"headache": 4},
+            "preliminary_diagnosis": ["tension headache"],
+            "risk_assessment": {},
+            "urgency_level": "low",
+            "warnings": [],
+            "errors": [],
+            "agent_history": [],
+        }
+        limiter = AdaptiveLimiter(initial=4)
+
+        async with limiter.slot():
+            result = await agent(state)
+
+        assert result["errors"]
+        assert limiter.limit == 2
+
+    async def test_throttled_knowledge_synthesis_shrinks_the_limiter(self):
+        agent = KnowledgeRetrieverAgent(llm=THROTTLED_LLM)
+        limiter = AdaptiveLimiter(initial=4)
+
+        async with limiter.slot():
+            summary = await agent._synthesize_knowledge([{"content": "Rest helps.", "source": "kb"}], ["headache"])
+
+        assert summary == "Failed to synthesize knowledge."
+        assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+class TestRiskAssessorAgent:
+    """Tests for the rule-based risk screen and the diagnosis-aware assessment"""
+
+    async def test_assessment_reads_the_diagnosis(self):
+        prompts = []
+
+        def low_risk(prompt):
+            prompts.append(prompt.to_string())
+            return (
+                '{"overall_risk_level": "low", "risk_factors": [], "urgency_recommendation": "If it persists", '
+                '"red_flags": [], "monitoring_advice": "Monitor symptoms"}'
+            )
+
+        agent = RiskAssessorAgent(llm=RunnableLambda(low_risk))
+        state = {
+            "symptoms": ["shortness of breath"],
+            "symptom_severity": {"shortness of breath": 5},
+            "errors": [],
+            "warnings": [],
+            "agent_history": [],
+        }
+        diagnosed = {**state, "preliminary_diagnosis": ["pulmonary embolism"], "requires_immediate_care": True}
+
+        without_diagnosis = await agent(state)
+        with_diagnosis = await agent(diagnosed)
+
+        assert "pulmonary embolism" not in prompts[0]
+        assert "pulmonary embolism" in prompts[1]
+        assert "Requires Immediate Care: True" in prompts[1]
+        assert without_diagnosis["urgency_level"] == "low"
+        assert with_diagnosis["urgency_level"] == "emergency"
+
+    async def test_screen_red_flags_escalate_the_assessment(self):
+        agent = RiskAssessorAgent(llm=RunnableLambda(lambda prompt: (
+            '{"overall_risk_level": "low", "risk_factors": [], "urgency_recommendation": "If it persists", '
+            '"red_flags": [], "monitoring_advice": "Monitor symptoms"}'
+        )))
+        state = {
+            "symptoms": ["chest pain"],
+            "symptom_severity": {"chest pain": 8},
+            "age": 70,
+            "errors": [],
+            "warnings": [],
+            "agent_history": [],
+        }
+
+        screen = agent.screen(state, "Chest pain when climbing stairs")
+        result = await agent({**state, **screen})
+
+        assert screen["heuristic_risk"]["red_flags"] == ["chest pain"]
+        assert screen["heuristic_risk"]["suggested_urgency"] == "emergency"
+        assert result["risk_assessment"]["red_flags"] == ["chest pain"]
+        assert result["urgency_level"] == "high"
+
+
+class TestSharedLLMClients:
+    """Tests for the shared LLM client registry"""
+
+    def test_agents_share_one_llm_client(self):
+        """Agents with the same model settings reuse one client and connection pool"""
+        assert SymptomExtractorAgent().llm is KnowledgeRetrieverAgent().llm
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
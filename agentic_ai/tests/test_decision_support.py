@@ -0,0 +1,511 @@
+"""
+Tests for deterministic decision-support helpers
+"""
+
+import random
+
+import pytest
+
+from agentic_ai.model_context_server import decision_support, population_risk, redaction, rule_pack
+from agentic_ai.model_context_server.phrase_matcher import PhraseMatcher, tokenize
+
+TRIAGE_TABLES = {
+    "red_flags": decision_support.RED_FLAG_PATTERNS,
+    "symptoms": decision_support.SYMPTOM_HINTS,
+    "context": decision_support.CONTEXT_TERMS,
+}
+
+
+def _triage_matcher(**kwargs):
+    return PhraseMatcher(
+        TRIAGE_TABLES,
+        negation_cues=decision_support.NEGATION_CUES,
+        negatable_groups=("symptoms",),
+        strict_negation_cues=decision_support.RED_FLAG_NEGATION_CUES,
+        strict_negation_groups=("red_flags",),
+        **kwargs,
+    )
+
+
+class TestPhraseMatcher:
+    """Tests for the compiled triage phrase matcher"""
+
+    def test_overlapping_phrases_are_all_reported(self):
+        """Phrases nested in or overlapping other phrases are still matched"""
+        found = _triage_matcher().scan("crushing chest pain with sore throat pain, getting worse at night")
+
+        assert found["red_flags"] == {"chest pain"}
+        assert found["symptoms"] == {"sore throat"}
+        assert found["context"] == {"pain", "worsening", "nighttime"}
+
+    def test_phrases_match_whole_tokens_only(self):
+        """Phrases never fire inside longer words"""
+        found = _triage_matcher().scan("visited the vomitorium, then a painting class; feverishly typing")
+
+        assert found == {"red_flags": set(), "symptoms": set(), "context": set()}
+        assert _triage_matcher().scan("he vomited twice")["symptoms"] == {"vomiting"}
+
+    def test_tokenizer_keeps_contractions(self):
+        """Apostrophes (including typographic ones) stay inside words"""
+        assert tokenize("i can’t breathe, it's bad") == ["i", "can't", "breathe", ",", "it's", "bad"]
+        assert _triage_matcher().scan("i can’t breathe")["red_flags"] == {"difficulty breathing"}
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "no chest pain",
+            "patient denies chest pain or shortness of breath",
+            "negative for seizures",
+            "i don't have a headache",
+            "without any fever",
+        ],
+    )
+    def test_negated_findings_are_dropped(self, text):
+        """Red flags and symptoms inside a negation scope are not reported"""
+        found = _triage_matcher().scan(text)
+
+        assert found["red_flags"] == set()
+        assert found["symptoms"] == set()
+
+    def test_negation_scope_is_bounded(self):
+        """Negation only spans a few unmatched tokens after the cue"""
+        matcher = _triage_matcher()
+
+        assert matcher.scan("no idea why my headache started")["symptoms"] == {"headache"}
+        assert matcher.scan("no real headache")["symptoms"] == set()
+        assert _triage_matcher(negation_scope=1).scan("no real headache")["symptoms"] == {"headache"}
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "I have never had chest pain this bad before",
+            "not only chest pain but also numbness",
+            "pain meds are not helping my chest pain",
+            "no real chest pain relief from rest",
+            "no idea why my chest pain started",
+            "denies fever but has chest pain",
+        ],
+    )
+    def test_red_flags_need_explicit_adjacent_negation(self, text):
+        """Only an explicit cue directly before a red flag hides it"""
+        assert "chest pain" in _triage_matcher().scan(text)["red_flags"]
+        assert "chest pain" in decision_support.detect_red_flags(text)
+        assert decision_support.red_flag_emergency_analysis(text) is not None
+
+    def test_strict_negation_chains_through_lists(self):
+        """"denies X or Y" negates every red flag in the list"""
+        found = _triage_matcher().scan("denies chest pain or shortness of breath or seizures")
+
+        assert found["red_flags"] == set()
+        assert _triage_matcher().scan("denies chest pain, then seizures")["red_flags"] == {"seizure activity"}
+
+    def test_group_cannot_use_both_negation_modes(self):
+        with pytest.raises(ValueError):
+            PhraseMatcher({"a": {"x": ["x"]}}, negatable_groups=("a",), strict_negation_groups=("a",))
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "no fever, chest pain since this morning",
+            "no fever. chest pain since this morning",
+            "not dizzy but chest pain since this morning",
+        ],
+    )
+    def test_terminators_end_negation(self, text):
+        """Clause punctuation and contrastive words close the negation scope"""
+        found = _triage_matcher().scan(text)
+
+        assert found["red_flags"] == {"chest pain"}
+        assert found["symptoms"] == set()
+
+    def test_negation_spans_consecutive_findings(self):
+        """Matched findings do not use up the scope of the cue before them"""
+        found = _triage_matcher().scan("denies fever cough or headache")
+
+        assert found["symptoms"] == set()
+
+    def test_cue_inside_phrase_is_not_negation(self):
+        """A cue word that is part of a phrase does not negate it"""
+        found = _triage_matcher().scan("fainted and not waking")
+
+        assert found["red_flags"] == {"loss of consciousness"}
+
+    def test_context_ignores_negation(self):
+        """Context terms record what was mentioned, negated or not"""
+        facts = decision_support.extract_triage_facts("No fever or pain today")
+
+        assert facts["inferred_context"]["mentions_fever"] is True
+        assert facts["inferred_context"]["mentions_pain"] is True
+        assert decision_support.infer_symptoms("No fever or pain today") == []
+
+    def test_negation_scope_must_be_positive(self):
+        with pytest.raises(ValueError):
+            PhraseMatcher({}, negation_scope=0)
+
+    def test_detectors_keep_existing_output_shape(self):
+        """Red flags keep table order and symptoms stay sorted"""
+        text = "Seizure earlier, now SLURRED SPEECH, chest pain, vomiting and a headache"
+
+        assert decision_support.detect_red_flags(text) == [
+            "chest pain",
+            "stroke-like symptoms",
+            "seizure activity",
+        ]
+        assert decision_support.infer_symptoms(text) == ["headache", "vomiting"]
+
+    def test_extract_triage_facts_context(self):
+        """Context flags and relative durations come from the same scan"""
+        facts = decision_support.extract_triage_facts("Fever since yesterday, worse at night, 7/10")
+
+        assert facts["inferred_duration"] == "since yesterday"
+        assert facts["inferred_severity"] == 7
+        assert facts["inferred_context"] == {
+            "mentions_fever": True,
+            "mentions_pain": False,
+            "mentions_worsening": True,
+            "mentions_nighttime": True,
+        }
+
+
+class TestTextAnalysis:
+    """Tests for the shared memoized text analysis"""
+
+    def test_analysis_is_immutable(self):
+        """Cached analyses cannot be mutated by callers"""
+        analysis = decision_support.analyze_text("Headache for 2 days, 6/10")
+
+        assert analysis.symptoms == ("headache",)
+        assert analysis.duration == "2 days"
+        assert analysis.severity == 6
+        with pytest.raises(AttributeError):
+            analysis.symptoms = ()
+        with pytest.raises(TypeError):
+            analysis.context_flags["mentions_pain"] = True
+
+    def test_helpers_share_one_analysis(self):
+        """Heuristics, facts, and clarification reuse the same cached scan"""
+        text = f"Dizzy and nauseous since yesterday ({random.random()})"
+        before = decision_support.text_analysis_cache_stats()
+
+        decision_support.detect_red_flags(text)
+        decision_support.extract_triage_facts(text)
+        decision_support.build_clarification_questions(text)
+
+        after = decision_support.text_analysis_cache_stats()
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 2
+        assert decision_support.analyze_text(text) is decision_support.analyze_text(text)
+
+
+class TestHeuristicAnalysis:
+    """Tests for LLM-free analyses used by the heuristic and fast modes"""
+
+    def test_red_flags_produce_emergency_analysis(self):
+        """Red-flag input is escalated regardless of severity"""
+        result = decision_support.heuristic_analysis("sudden slurred speech, 2/10")
+
+        assert result["urgency_level"] == "emergency"
+        assert result["risk_assessment"]["red_flags"] == ["stroke-like symptoms"]
+        assert result["confidence_score"] == decision_support.RED_FLAG_SCREEN_CONFIDENCE
+
+    def test_refinement_never_lowers_urgency(self):
+        """The fast-mode LLM can raise but not lower the deterministic urgency"""
+        baseline = decision_support.heuristic_analysis("bad headache, 8/10")
+        lowered = decision_support.refine_heuristic_analysis(baseline, {"urgency_level": "low", "confidence": 3})
+        raised = decision_support.refine_heuristic_analysis(baseline, {"urgency_level": "emergency"})
+
+        assert baseline["urgency_level"] == "high"
+        assert lowered["urgency_level"] == "high"
+        assert lowered["confidence_score"] == 1.0
+        assert raised["urgency_level"] == "emergency"
+        assert raised["when_to_see_doctor"] == decision_support.explain_urgency("emergency")["seek_care_threshold"]
+
+    def test_partial_run_keeps_graph_output_and_fills_gaps(self):
+        """A deadline-truncated graph run keeps its findings and borrows the rest from rules"""
+        baseline = decision_support.heuristic_analysis("bad headache, 8/10")
+        partial = {
+            "symptoms": ["headache", "light sensitivity"],
+            "urgency_level": "medium",
+            "recommendations": [],
+            "when_to_see_doctor": "Within a week",
+            "confidence_score": 0.9,
+        }
+
+        completed = decision_support.complete_partial_analysis(baseline, partial)
+
+        assert completed["symptoms"][:2] == ["headache", "light sensitivity"]
+        assert completed["urgency_level"] == "high"
+        assert completed["when_to_see_doctor"] == decision_support.explain_urgency("high")["seek_care_threshold"]
+        assert completed["risk_assessment"] == baseline["risk_assessment"]
+        assert set(baseline["recommendations"]) <= set(completed["recommendations"])
+        assert completed["confidence_score"] == baseline["confidence_score"]
+
+
+class TestRulePack:
+    """Tests for hot-swappable triage rule packs"""
+
+    def teardown_method(self):
+        decision_support.reset_rule_pack()
+
+    def test_builtin_pack_matches_module_tables(self):
+        """The built-in pack reproduces the module-level tables"""
+        pack = decision_support.active_rule_pack()
+        assert pack.version == "builtin"
+        assert pack.red_flag_order == tuple(decision_support.RED_FLAG_PATTERNS)
+        assert dict(pack.risk_condition_weights) == decision_support.RISK_CONDITION_WEIGHTS
+        assert decision_support.explain_urgency("high")["immediate_actions"] == decision_support.IMMEDIATE_ACTIONS["high"]
+
+    def test_swap_replaces_tables_and_invalidates_analysis(self):
+        """Cached analyses from the previous pack are not served after a swap"""
+        text = "Swollen tongue and a mild headache"
+        assert decision_support.detect_red_flags(text) == []
+
+        pack = decision_support.load_rule_pack(
+            {
+                "version": "test-1",
+                "red_flags": {"anaphylaxis": ["Swollen Tongue"]},
+                "risk_condition_weights": {"Asthma": 20},
+            }
+        )
+
+        assert pack.generation > 0
+        assert decision_support.detect_red_flags(text) == ["anaphylaxis"]
+        assert decision_support.infer_symptoms(text) == ["headache"]
+        score = decision_support.compute_risk_score("low", [], known_conditions=["asthma"])
+        assert score["risk_score"] == 20
+
+        decision_support.reset_rule_pack()
+        assert decision_support.detect_red_flags(text) == []
+
+    def test_invalid_pack_keeps_active_pack(self):
+        """Validation errors leave the current pack in place"""
+        with pytest.raises(ValueError):
+            decision_support.load_rule_pack({"version": "bad", "context_terms": {"fever": ["fever"]}})
+        with pytest.raises(ValueError):
+            decision_support.load_rule_pack({"version": "bad", "format": 2})
+        assert decision_support.active_rule_pack().version == "builtin"
+
+
+class TestPopulationRisk:
+    """Tests for vectorized population risk scoring"""
+
+    def teardown_method(self):
+        decision_support.reset_rule_pack()
+
+    def test_matches_scalar_risk_score(self):
+        """Every row scores exactly as compute_risk_score would"""
+        rng = random.Random(9)
+        order = population_risk.condition_order()
+        rows = []
+        for _ in range(3000):
+            conditions = rng.sample(list(order) + ["seasonal allergies"], rng.randint(0, 4))
+            rows.append(
+                (
+                    rng.choice(["low", "medium", "high", "emergency", "unknown"]),
+                    rng.randint(0, 5),
+                    rng.choice([None, *range(0, 100)]),
+                    rng.choice([None, *range(-2, 13)]),
+                    [condition.upper() if rng.random() < 0.3 else condition for condition in conditions],
+                )
+            )
+
+        result = population_risk.score_population(
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            [row[2] for row in rows],
+            [row[3] for row in rows],
+            [population_risk.encode_conditions(row[4]) for row in rows],
+        )
+
+        for index, (urgency, flag_count, age, severity, conditions) in enumerate(rows):
+            expected = decision_support.compute_risk_score(urgency, ["flag"] * flag_count, age, conditions, severity)
+            assert result.scores[index] == expected["risk_score"]
+            assert result.tiers[index] == expected["risk_tier"]
+            assert result.suggested_urgency[index] == expected["suggested_urgency"]
+
+    def test_condition_bits_follow_active_rule_pack(self):
+        """Bitmask order tracks the active pack and rejects bits it does not define"""
+        decision_support.load_rule_pack({"version": "bits", "risk_condition_weights": {"asthma": 40, "copd": 1}})
+        assert population_risk.condition_order() == ("asthma", "copd")
+
+        result = population_risk.score_population(["low"], [0], [None], [None], [population_risk.encode_conditions(["Asthma"])])
+        assert result.scores.tolist() == [40]
+        with pytest.raises(ValueError):
+            population_risk.score_population(["low"], [0], [None], [None], [1 << 2])
+
+    def test_rule_packs_fit_condition_masks_in_int64(self):
+        """Packs with more conditions than an int64 mask holds are refused; the largest allowed pack scores"""
+        limit = rule_pack.MAX_RISK_CONDITIONS
+        with pytest.raises(ValueError, match="risk conditions"):
+            decision_support.load_rule_pack(
+                {"version": "wide", "risk_condition_weights": {f"c{i}": 1 for i in range(limit + 1)}}
+            )
+        assert decision_support.active_rule_pack().version != "wide"
+
+        decision_support.load_rule_pack({"version": "max", "risk_condition_weights": {f"c{i}": 1 for i in range(limit)}})
+        everything = population_risk.encode_conditions([f"c{i}" for i in range(limit)])
+        result = population_risk.score_population(["low"], [0], [None], [None], [everything])
+        assert result.scores.tolist() == [limit]
+
+    def test_mismatched_columns_are_rejected(self):
+        """Columns must all have one entry per row"""
+        with pytest.raises(ValueError):
+            population_risk.score_population(["low", "high"], [0], [30, 40], [1, 2])
+
+
+def _legacy_redact(text):
+    redacted = text
+    count = 0
+    types = []
+    for label, pattern, replacement in redaction.REDACTION_RULES:
+        matches = pattern.findall(redacted)
+        if matches:
+            types.append(label)
+            count += len(matches)
+            redacted = pattern.sub(replacement, redacted)
+    return {"redacted_text": redacted, "redaction_count": count, "redaction_types": types}
+
+
+class TestRedaction:
+    """Tests for the PII redaction engine"""
+
+    def test_each_pii_type_is_labelled_and_counted(self):
+        """Every rule contributes its label, replacement, and count"""
+        text = (
+            "Reach me at jane.doe@example.com or (555) 123-4567, alt 555-987-6543. "
+            "SSN 123-45-6789, born 1984-07-21, MRN: A1234567."
+        )
+        result = decision_support.redact_sensitive_text(text)
+
+        assert result["redaction_types"] == ["email", "phone", "ssn", "dob", "mrn"]
+        assert result["redaction_count"] == 6
+        for replacement in redaction.REDACTION_REPLACEMENTS.values():
+            assert replacement in result["redacted_text"]
+        assert "example.com" not in result["redacted_text"]
+        assert "A1234567" not in result["redacted_text"]
+
+    def test_text_without_pii_is_unchanged(self):
+        """Clean text passes through with no redactions"""
+        result = redaction.redact_text("headache since this morning, mild nausea")
+        assert result == {
+            "redacted_text": "headache since this morning, mild nausea",
+            "redaction_count": 0,
+            "redaction_types": [],
+        }
+
+    def test_matches_sequential_redaction_on_transcripts(self):
+        """Single pass agrees with per-pattern substitution on non-overlapping PII"""
+        rng = random.Random(4)
+        filler = "patient reports cough fever and fatigue after the trip".split()
+        pii = [
+            "jane.doe@example.com",
+            "(555) 123-4567",
+            "+1 555.987.6543",
+            "123-45-6789",
+            "1999/12/31",
+            "medical record number 77-1234",
+        ]
+        for _ in range(50):
+            tokens = [rng.choice(pii) if rng.random() < 0.2 else rng.choice(filler) for _ in range(60)]
+            text = " ".join(tokens)
+            assert redaction.redact_text(text) == _legacy_redact(text)
+
+    def test_overlapping_matches_keep_rule_precedence(self):
+        """Where patterns overlap, types and counts match per-pattern substitution"""
+        for text in (
+            "MRN: 555-123-4567",
+            "medical record number 123-45-6789",
+            "call 555-123-4567 or MRN 1999/12/31",
+            "mrn 2024-01-15 and jane@example.com",
+        ):
+            assert redaction.redact_text(text) == _legacy_redact(text)
+
+        result = redaction.redact_text("MRN: 555-123-4567")
+        assert result["redacted_text"] == "MRN: [REDACTED_PHONE]"
+        assert result["redaction_types"] == ["phone"]
+
+    def test_later_rule_retries_a_shorter_match_after_an_overlap(self):
+        """An MRN cut short by a phone number still redacts its own digits"""
+        result = redaction.redact_text("mrn 1234-555-123-4567")
+
+        assert result == _legacy_redact("mrn 1234-555-123-4567")
+        assert result["redacted_text"] == "[REDACTED_MRN]-[REDACTED_PHONE]"
+        assert result["redaction_count"] == 2
+
+    def test_matches_sequential_redaction_on_adjacent_pii(self):
+        """PII fragments glued together resolve exactly as per-pattern substitution"""
+        rng = random.Random(9)
+        fragments = [
+            "mrn ",
+            "MRN: ",
+            "medical record number ",
+            "1234",
+            "-",
+            "555-123-4567",
+            "(555) 123-4567",
+            "123-45-6789",
+            "1999/12/31",
+            "a@b.co",
+            "+1 ",
+            "x",
+            " ",
+        ]
+        for _ in range(2000):
+            text = "".join(rng.choice(fragments) for _ in range(rng.randint(1, 10)))
+            assert redaction.redact_text(text) == _legacy_redact(text)
+
+    def test_streaming_matches_whole_text_for_any_chunking(self):
+        """PII split across chunk boundaries is still redacted exactly once"""
+        rng = random.Random(7)
+        filler = "patient reports cough fever and fatigue after the trip".split()
+        pii = [
+            "jane.doe@example.com",
+            "(555) 123-4567",
+            "123-45-6789",
+            "1999/12/31",
+            "MRN: A1234567",
+            "MRN: 555-123-4567",
+        ]
+        for _ in range(100):
+            text = " ".join(rng.choice(pii) if rng.random() < 0.3 else rng.choice(filler) for _ in range(80))
+            chunks = []
+            index = 0
+            while index < len(text):
+                size = rng.randint(1, 40)
+                chunks.append(text[index : index + size])
+                index += size
+
+            redactor = redaction.StreamingRedactor(overlap=64)
+            streamed = "".join(redaction.redact_stream(chunks, redactor=redactor))
+            expected = redaction.redact_text(text)
+
+            assert streamed == expected["redacted_text"]
+            assert redactor.redaction_count == expected["redaction_count"]
+            assert redactor.redaction_types == expected["redaction_types"]
+
+    def test_streaming_buffer_stays_bounded(self):
+        """Held-back text never grows beyond the overlap window plus one chunk"""
+        redactor = redaction.StreamingRedactor(overlap=128)
+        chunk = "no identifiers in this line, call (555) 123-4567 later\n" * 20
+        for _ in range(500):
+            redactor.feed(chunk)
+            assert len(redactor._pending) <= redactor.overlap + len(chunk)
+        redactor.close()
+        assert redactor.redaction_count == 500 * 20
+
+    def test_redact_file(self, tmp_path):
+        """File helper writes redacted output and returns counts"""
+        source = tmp_path / "export.txt"
+        destination = tmp_path / "export.redacted.txt"
+        text = "line with jane.doe@example.com\r\nssn 123-45-6789\n" * 1000
+        source.write_bytes(text.encode("utf-8"))
+
+        stats = redaction.redact_file(source, destination, chunk_size=97)
+
+        expected = redaction.redact_text(text)
+        assert destination.read_bytes().decode("utf-8") == expected["redacted_text"]
+        assert stats == {"redaction_count": 2000, "redaction_types": ["email", "ssn"]}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,6 +2,10 @@
 Tests for LangGraph assembly line
 """
 
+import asyncio
+import itertools
+import time
+import tracemalloc
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -9,10 +13,26 @@ import pytest
 pytest.importorskip("langgraph")
 pytest.importorskip("langchain_core")
 
+from langgraph.checkpoint.base import empty_checkpoint  # noqa: E402
+
 from agentic_ai.graphs.assembly_line import SymptomSyncGraph  # noqa: E402
+from agentic_ai.graphs.sessions import BoundedMemorySaver, BoundedSqliteSaver, session_config  # noqa: E402
 from agentic_ai.graphs.state import SymptomAnalysisInput  # noqa: E402
 
 
+def _session_turn(user_input, session_id="s1", user_id=None) -> SymptomAnalysisInput:
+    return {
+        "user_input": user_input,
+        "user_id": user_id,
+        "session_id": session_id,
+        "age": 40,
+        "gender": None,
+        "medical_history": None,
+        "current_medications": None,
+        "allergies": None,
+    }
+
+
 @pytest.mark.asyncio
 class TestSymptomSyncGraph:
     """Tests for SymptomSyncGraph"""
@@ -96,6 +116,346 @@ class TestSymptomSyncGraph:
             assert len(result["recommendations"]) > 0
             assert "processing_time" in result
 
+    async def test_analyze_symptoms_returns_partial_results_at_deadline(self):
+        """Stages finished before the deadline survive a slow later stage"""
+        graph = SymptomSyncGraph()
+
+        async def slow(state):
+            await asyncio.sleep(5)
+            return {}
+
+        input_data: SymptomAnalysisInput = {
+            "user_input": "I have a headache",
+            "user_id": None,
+            "session_id": None,
+            "age": None,
+            "gender": None,
+            "medical_history": None,
+            "current_medications": None,
+            "allergies": None,
+            "deadline": time.monotonic() + 0.2,
+        }
+        extracted = {"symptoms": ["headache"], "urgency_level": "low", "next_action": "continue"}
+
+        with patch.object(graph.symptom_extractor, "process", AsyncMock(return_value=extracted)), \
+                patch.object(graph.risk_assessor, "process", AsyncMock(return_value={"next_action": "continue"})), \
+                patch.object(graph.diagnostic_analyzer, "process", side_effect=slow):
+            result = await graph.analyze_symptoms(input_data)
+
+        assert result["partial"] is True
+        assert result["symptoms"] == ["headache"]
+        assert result["urgency_level"] == "low"
+        assert result["processing_time"] < 2
+
+    async def test_risk_screen_runs_alongside_diagnosis(self):
+        """The rule-based risk screen overlaps diagnosis; the risk assessment then reads both"""
+        graph = SymptomSyncGraph()
+        assessed = []
+
+        def delayed(seconds, updates):
+            async def run(state):
+                await asyncio.sleep(seconds)
+                return updates
+            return run
+
+        async def assess(state):
+            assessed.append(state)
+            return {
+                "risk_assessment": {"risk_level": "high", "risk_factors": [], "red_flags": [], "monitoring_advice": ""},
+                "urgency_level": "emergency",
+                "next_action": "continue",
+            }
+
+        extracted = {
+            "symptoms": ["chest pain"],
+            "symptom_severity": {"chest pain": 7},
+            "urgency_level": "medium",
+            "next_action": "continue",
+        }
+        diagnosis = {"preliminary_diagnosis": ["angina"], "requires_immediate_care": True, "next_action": "continue"}
+        input_data: SymptomAnalysisInput = {
+            "user_input": "Chest pain when climbing stairs",
+            "user_id": None,
+            "session_id": None,
+            "age": 60,
+            "gender": None,
+            "medical_history": None,
+            "current_medications": None,
+            "allergies": None,
+        }
+        screen = graph.risk_assessor.screen
+
+        with patch.object(graph.symptom_extractor, "process", AsyncMock(return_value=extracted)), \
+                patch.object(graph.knowledge_retriever, "process", side_effect=delayed(0.3, {"synthesized_knowledge": "kb"})), \
+                patch.object(graph.diagnostic_analyzer, "process", side_effect=delayed(0.3, diagnosis)), \
+                patch.object(graph.risk_assessor, "screen", side_effect=screen) as screened, \
+                patch.object(graph.risk_assessor, "process", side_effect=assess), \
+                patch.object(graph.recommendation_generator, "process", AsyncMock(return_value={"recommendations": ["Call 911"]})):
+            result = await graph.analyze_symptoms(input_data)
+
+        # The screen ran on the extracted symptoms, before the diagnosis was in
+        assert screened.call_args.args[0]["preliminary_diagnosis"] is None
+        assert assessed[0]["preliminary_diagnosis"] == ["angina"]
+        assert assessed[0]["requires_immediate_care"] is True
+        assert assessed[0]["heuristic_risk"]["red_flags"] == ["chest pain"]
+        assert result["risk_assessment"]["risk_level"] == "high"
+        assert result["urgency_level"] == "emergency"
+        assert result["recommendations"] == ["Call 911"]
+
+    async def test_node_allocations_do_not_grow_with_state(self):
+        """Nodes return deltas, so a stage allocates the same however much state has built up"""
+        graph = SymptomSyncGraph()
+        risk = {
+            "risk_assessment": {"risk_level": "low", "risk_factors": [], "red_flags": [], "monitoring_advice": ""},
+            "urgency_level": "low",
+            "next_action": "continue",
+        }
+
+        async def allocated(size):
+            state = {
+                "symptoms": ["headache"],
+                "agent_history": ["SymptomExtractor"] * size,
+                "warnings": ["note"] * size,
+                "errors": [],
+                "retrieved_documents": [{"content": "kb"}] * size,
+            }
+            tracemalloc.start()
+            try:
+                await graph._risk_assessor_node(state)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        with patch.object(graph.risk_assessor, "process", AsyncMock(return_value=risk)):
+            await allocated(10)  # warm up logging and mock internals
+            small = await allocated(10)
+            large = await allocated(20_000)
+
+        # Copying the history and warnings lists alone would take ~320 KB
+        assert large - small < 20_000
+
+    async def test_follow_up_turn_reruns_only_changed_stages(self):
+        """A follow-up re-extracts from the conversation and reuses stages whose inputs did not change"""
+        graph = SymptomSyncGraph(session_store=BoundedMemorySaver(max_sessions=10, ttl_seconds=60))
+        extracted = {
+            "symptoms": ["headache"],
+            "symptom_severity": {"headache": 4},
+            "urgency_level": "low",
+            "next_action": "continue",
+        }
+        risk = {
+            "risk_assessment": {"risk_level": "low", "risk_factors": [], "red_flags": [], "monitoring_advice": ""},
+            "urgency_level": "low",
+            "next_action": "continue",
+        }
+        extractor = AsyncMock(return_value=extracted)
+        knowledge = AsyncMock(return_value={"synthesized_knowledge": "kb", "next_action": "continue"})
+        diagnosis = AsyncMock(return_value={"preliminary_diagnosis": ["tension headache"], "next_action": "continue"})
+        assessor = AsyncMock(return_value=risk)
+        recommendations = AsyncMock(return_value={"recommendations": ["Rest"], "next_action": "continue"})
+
+        with patch.object(graph.symptom_extractor, "process", extractor), \
+                patch.object(graph.knowledge_retriever, "retrieve_speculatively",
+                             AsyncMock(return_value={"speculative_retrieval": None})), \
+                patch.object(graph.knowledge_retriever, "process", knowledge), \
+                patch.object(graph.diagnostic_analyzer, "process", diagnosis), \
+                patch.object(graph.risk_assessor, "process", assessor), \
+                patch.object(graph.recommendation_generator, "process", recommendations):
+            first = await graph.analyze_symptoms(_session_turn("I have a headache"))
+            second = await graph.analyze_symptoms(_session_turn("It is still there this morning"))
+            stored = await graph._graph_for_session().aget_state(session_config("s1"))
+            extractor.return_value = {**extracted, "symptoms": ["headache", "fever"]}
+            third = await graph.analyze_symptoms(_session_turn("Now I have a fever too"))
+
+        assert extractor.await_count == 3
+        assert knowledge.await_count == diagnosis.await_count == assessor.await_count == 2
+        assert recommendations.await_count == 2
+        assert {key: value for key, value in second.items() if key != "processing_time"} == {
+            key: value for key, value in first.items() if key != "processing_time"
+        }
+        assert third["symptoms"] == ["headache", "fever"]
+        # Per-turn fields start over; the follow-up only ran the extractor and the orchestrator
+        assert stored.values["agent_history"] == ["SymptomExtractor", "Orchestrator"]
+        extractor_state = extractor.await_args.args[0]
+        assert [message.content for message in extractor_state["messages"]] == [
+            "I have a headache",
+            "It is still there this morning",
+            "Now I have a fever too",
+        ]
+
+    async def test_concurrent_turns_of_a_session_run_in_order(self):
+        """A turn sent while the previous one is running builds on its result"""
+        graph = SymptomSyncGraph(session_store=BoundedMemorySaver(max_sessions=10, ttl_seconds=60))
+        seen = []
+
+        async def extract(state):
+            seen.append([message.content for message in state["messages"]])
+            await asyncio.sleep(0.05)
+            return {"symptoms": ["cough"], "urgency_level": "low", "next_action": "continue"}
+
+        with patch.object(graph.symptom_extractor, "process", AsyncMock(side_effect=extract)), \
+                patch.object(graph.knowledge_retriever, "retrieve_speculatively",
+                             AsyncMock(return_value={"speculative_retrieval": None})), \
+                patch.object(graph.knowledge_retriever, "process", AsyncMock(return_value={"next_action": "continue"})), \
+                patch.object(graph.diagnostic_analyzer, "process", AsyncMock(return_value={"next_action": "continue"})), \
+                patch.object(graph.risk_assessor, "process", AsyncMock(return_value={"next_action": "continue"})), \
+                patch.object(graph.recommendation_generator, "process", AsyncMock(return_value={"recommendations": []})):
+            await asyncio.gather(
+                graph.analyze_symptoms(_session_turn("I have a cough")),
+                graph.analyze_symptoms(_session_turn("Now it is worse at night")),
+            )
+
+        assert seen == [["I have a cough"], ["I have a cough", "Now it is worse at night"]]
+        assert not graph._session_locks
+
+    async def test_sessions_are_kept_apart(self):
+        """Another session, or the same session id of another user, starts from scratch"""
+        graph = SymptomSyncGraph(session_store=BoundedMemorySaver(max_sessions=10, ttl_seconds=60))
+        extracted = {"symptoms": ["cough"], "urgency_level": "low", "next_action": "continue"}
+        diagnosis = AsyncMock(return_value={"preliminary_diagnosis": ["common cold"], "next_action": "continue"})
+
+        with patch.object(graph.symptom_extractor, "process", AsyncMock(return_value=extracted)), \
+                patch.object(graph.knowledge_retriever, "retrieve_speculatively",
+                             AsyncMock(return_value={"speculative_retrieval": None})), \
+                patch.object(graph.knowledge_retriever, "process", AsyncMock(return_value={"next_action": "continue"})), \
+                patch.object(graph.diagnostic_analyzer, "process", diagnosis), \
+                patch.object(graph.risk_assessor, "process", AsyncMock(return_value={"next_action": "continue"})), \
+                patch.object(graph.recommendation_generator, "process", AsyncMock(return_value={"recommendations": []})):
+            await graph.analyze_symptoms(_session_turn("I have a cough", session_id="s1", user_id="alice"))
+            await graph.analyze_symptoms(_session_turn("I have a cough", session_id="s2", user_id="alice"))
+            await graph.analyze_symptoms(_session_turn("I have a cough", session_id="s1", user_id="bob"))
+
+        assert diagnosis.await_count == 3
+        assert graph.session_store.session_count() == 3
+
+    async def test_stream_analysis_reports_stages_as_they_finish(self):
+        """Urgency arrives before the slow diagnosis, and the final event matches analyze_symptoms"""
+        graph = SymptomSyncGraph(session_store=None)
+
+        async def slow_diagnosis(state):
+            await asyncio.sleep(0.3)
+            return {"preliminary_diagnosis": ["tension headache"], "next_action": "continue"}
+
+        extracted = {"symptoms": ["headache"], "urgency_level": "low", "next_action": "continue"}
+        risk = {
+            "risk_assessment": {"risk_level": "low", "risk_factors": [], "red_flags": [], "monitoring_advice": ""},
+            "urgency_level": "low",
+            "next_action": "continue",
+        }
+        arrivals = []
+
+        with patch.object(graph.symptom_extractor, "process", AsyncMock(return_value=extracted)), \
+                patch.object(graph.knowledge_retriever, "retrieve_speculatively",
+                             AsyncMock(return_value={"speculative_retrieval": None})), \
+                patch.object(graph.knowledge_retriever, "process", AsyncMock(return_value={"next_action": "continue"})), \
+                patch.object(graph.diagnostic_analyzer, "process", side_effect=slow_diagnosis), \
+                patch.object(graph.risk_assessor, "process", AsyncMock(return_value=risk)), \
+                patch.object(graph.recommendation_generator, "process", AsyncMock(return_value={"recommendations": ["Rest"]})):
+            start = time.monotonic()
+            async for event in graph.stream_analysis(_session_turn("I have a headache", session_id=None)):
+                arrivals.append((event, time.monotonic() - start))
+            expected = await graph.analyze_symptoms(_session_turn("I have a headache", session_id=None))
+
+        events = [event for event, _ in arrivals]
+        stages = [event["stage"] for event in events]
+        assert stages[0] == "symptom_extractor"
+        assert events[0]["data"] == {"symptoms": ["headache"], "urgency_level": "low"}
+        assert arrivals[0][1] < 0.2
+        assert stages.index("symptom_extractor") < stages.index("diagnostic_analyzer") < stages.index(
+            "recommendation_generator"
+        )
+        assert stages[-1] == "result"
+        assert {key: value for key, value in events[-1]["data"].items() if key != "processing_time"} == {
+            key: value for key, value in expected.items() if key != "processing_time"
+        }
+
+    async def test_stream_analysis_ends_with_partial_result_at_deadline(self):
+        """A stage still running at the deadline is cut off and the result is marked partial"""
+        graph = SymptomSyncGraph(session_store=None)
+
+        async def slow(state):
+            await asyncio.sleep(5)
+            return {}
+
+        extracted = {"symptoms": ["headache"], "urgency_level": "low", "next_action": "continue"}
+        input_data = {**_session_turn("I have a headache", session_id=None), "deadline": time.monotonic() + 0.2}
+
+        with patch.object(graph.symptom_extractor, "process", AsyncMock(return_value=extracted)), \
+                patch.object(graph.risk_assessor, "process", AsyncMock(return_value={"next_action": "continue"})), \
+                patch.object(graph.diagnostic_analyzer, "process", side_effect=slow):
+            events = [event async for event in graph.stream_analysis(input_data)]
+
+        result = events[-1]["data"]
+        assert events[0]["stage"] == "symptom_extractor"
+        assert result["partial"] is True
+        assert result["urgency_level"] == "low"
+        assert result["processing_time"] < 2
+
+    async def test_dry_run_exercises_every_stage_without_provider_calls(self):
+        """The warm-up dry run completes with the stub model and leaves agents untouched"""
+        graph = SymptomSyncGraph()
+        original_llm = graph.diagnostic_analyzer.llm
+
+        result = await graph.dry_run()
+
+        assert result["symptoms"] == ["headache"]
+        assert result["preliminary_diagnosis"] == ["tension headache"]
+        assert result["urgency_level"] == "low"
+        assert result["partial"] is False
+        assert graph.diagnostic_analyzer.llm is original_llm
+
+
+def _memory_store(max_sessions, ttl_seconds, clock):
+    return BoundedMemorySaver(max_sessions=max_sessions, ttl_seconds=ttl_seconds, clock=clock)
+
+
+def _sqlite_store(max_sessions, ttl_seconds, clock):
+    store = BoundedSqliteSaver.from_path(":memory:", max_sessions=max_sessions, ttl_seconds=ttl_seconds)
+    store._clock = clock
+    return store
+
+
+@pytest.mark.parametrize("make_store", [_memory_store, _sqlite_store])
+class TestSessionStores:
+    """Tests for the bounded session checkpointers"""
+
+    @staticmethod
+    def _put(store, session_id):
+        checkpoint = empty_checkpoint()
+        store.put(session_config(session_id), checkpoint, {"source": "loop", "step": 0, "writes": None})
+        return checkpoint["id"]
+
+    def test_keeps_only_the_latest_checkpoint(self, make_store):
+        store = make_store(max_sessions=10, ttl_seconds=60, clock=lambda: 0.0)
+
+        self._put(store, "s1")
+        latest = self._put(store, "s1")
+
+        assert [saved.checkpoint["id"] for saved in store.list(session_config("s1"))] == [latest]
+        assert store.get_tuple(session_config("s1")).checkpoint["id"] == latest
+
+    def test_evicts_least_recently_used_sessions_beyond_capacity(self, make_store):
+        ticks = itertools.count()
+        store = make_store(max_sessions=2, ttl_seconds=60, clock=lambda: float(next(ticks)))
+
+        for session_id in ("s1", "s2", "s1", "s3"):
+            self._put(store, session_id)
+
+        assert store.session_count() == 2
+        assert store.get_tuple(session_config("s2")) is None
+        assert store.get_tuple(session_config("s1")) is not None
+
+    def test_drops_idle_sessions_after_ttl(self, make_store):
+        now = [0.0]
+        store = make_store(max_sessions=10, ttl_seconds=60, clock=lambda: now[0])
+        self._put(store, "s1")
+
+        now[0] = 30.0
+        assert store.get_tuple(session_config("s1")) is not None
+        now[0] = 61.0
+        assert store.get_tuple(session_config("s1")) is None
+        assert store.session_count() == 0
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -2,16 +2,80 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import threading
+import time
 import uuid
+from concurrent.futures.process import BrokenProcessPool
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.shared.memory import create_connected_server_and_client_session
+from pydantic import ValidationError
 
 from agentic_ai.config.settings import settings
-from agentic_ai.model_context_server.models import SymptomAnalysisResponse
+from agentic_ai.model_context_server import decision_support
+from agentic_ai.model_context_server.models import SymptomAnalysisRequest, SymptomAnalysisResponse
+from agentic_ai.model_context_server.result_cache import (
+    MemoryResultCache,
+    RedisResultCache,
+    analysis_cache_key,
+)
 from agentic_ai.model_context_server.runtime import run_server
 from agentic_ai.model_context_server.server import create_http_app, mcp
 from agentic_ai.model_context_server.service import service
+from agentic_ai.model_context_server.static_resources import static_resources, urgency_matrix
+from agentic_ai.utils.concurrency import (
+    AdaptiveLimiter,
+    AdmissionController,
+    AdmissionRejectedError,
+    SingleFlight,
+    report_overload,
+)
+from agentic_ai.utils.llm_clients import LLMClientRegistry, PooledTransport
+from agentic_ai.utils.monitoring import metrics
+
+
+class StagedGraph:
+    """Fake graph streaming two stages, then a result cut short by the deadline."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def stream_analysis(self, input_data):
+        self.calls.append(input_data)
+        yield {"stage": "symptom_extractor", "data": {"symptoms": ["headache"], "urgency_level": "medium"}}
+        yield {"stage": "diagnostic_analyzer", "data": {"preliminary_diagnosis": ["tension headache"]}}
+        yield {
+            "stage": "result",
+            "data": {
+                "symptoms": ["headache"],
+                "preliminary_diagnosis": ["tension headache"],
+                "risk_assessment": {},
+                "urgency_level": "medium",
+                "recommendations": [],
+                "when_to_see_doctor": "Consult a healthcare professional",
+                "confidence_score": 0.0,
+                "processing_time": 0.1,
+                "partial": True,
+            },
+        }
+
+
+def _analysis_response(symptom):
+    return SymptomAnalysisResponse(
+        symptoms=[symptom],
+        preliminary_diagnosis=[],
+        risk_assessment={},
+        urgency_level="low",
+        recommendations=[],
+        when_to_see_doctor="If symptoms persist",
+        confidence_score=0.5,
+        processing_time=0.0,
+    )
 
 
 @pytest.mark.asyncio
@@ -25,16 +89,21 @@ class TestMCPServer:
         expected = {
             "analyze_symptoms",
             "batch_analyze_symptoms",
+            "stream_batch_analyze_symptoms",
+            "stream_analyze_symptoms",
             "visualize_graph",
             "get_runtime_config",
             "health_check",
             "triage_text_heuristics",
             "extract_triage_facts",
+            "batch_triage_text_heuristics",
+            "batch_extract_triage_facts",
             "generate_clarification_questions",
             "build_clinician_handoff",
             "compare_symptom_snapshots",
             "explain_urgency_level",
             "compute_risk_score",
+            "score_population_risk",
             "recommend_care_setting",
             "generate_self_care_plan",
             "generate_monitoring_schedule",
@@ -44,6 +113,9 @@ class TestMCPServer:
             "check_dependencies",
             "validate_runtime_policy",
             "get_capability_catalog",
+            "get_rule_pack_status",
+            "load_rule_pack",
+            "reset_rule_pack",
         }
         assert expected.issubset(tool_names)
 
@@ -127,6 +199,512 @@ class TestMCPServer:
         assert structured["symptoms"] == ["headache"]
         assert structured["urgency_level"] == "low"
 
+    async def test_analysis_cache_skips_graph_for_repeated_requests(self, monkeypatch):
+        calls = []
+
+        class FakeGraph:
+            async def analyze_symptoms(self, input_data):
+                calls.append(input_data)
+                return {
+                    "symptoms": ["headache"],
+                    "preliminary_diagnosis": ["tension headache"],
+                    "risk_assessment": {"risk_level": "low"},
+                    "urgency_level": "unknown" if "fallback" in input_data["user_input"] else "low",
+                    "recommendations": ["rest"],
+                    "when_to_see_doctor": "If symptoms persist",
+                    "confidence_score": 0.8,
+                    "processing_time": 1.5,
+                }
+
+        monkeypatch.setattr(service, "_graph", FakeGraph())
+        monkeypatch.setattr(service, "analysis_cache", MemoryResultCache(maxsize=1, ttl_seconds=60))
+        before = service.metrics_snapshot()
+        text = f"Template headache question {uuid.uuid4()}"
+
+        first = await service.analyze_symptoms(SymptomAnalysisRequest(user_input=text, user_id="a"))
+        second = await service.analyze_symptoms(SymptomAnalysisRequest(user_input=text, user_id="b"))
+        await service.analyze_symptoms(SymptomAnalysisRequest(user_input=f"{text} fallback"))
+        await service.analyze_symptoms(SymptomAnalysisRequest(user_input=f"{text} fallback"))
+        await service.analyze_symptoms(SymptomAnalysisRequest(user_input=f"{text} other"))
+
+        assert len(calls) == 4
+        assert second.model_dump(exclude={"processing_time"}) == first.model_dump(exclude={"processing_time"})
+        after = service.metrics_snapshot()
+        assert after.analysis_cache_hits_total - before.analysis_cache_hits_total == 1
+        assert after.analysis_cache_misses_total - before.analysis_cache_misses_total == 4
+        assert after.analysis_cache_evictions_total - before.analysis_cache_evictions_total == 1
+        assert after.cache_evictions_total >= after.analysis_cache_evictions_total
+
+    async def test_session_turns_bypass_analysis_cache(self, monkeypatch):
+        calls = []
+
+        class FakeGraph:
+            async def analyze_symptoms(self, input_data):
+                calls.append(input_data)
+                return {"symptoms": ["headache"], "urgency_level": "low", "recommendations": ["rest"]}
+
+        cache = MemoryResultCache(maxsize=8, ttl_seconds=60)
+        monkeypatch.setattr(service, "_graph", FakeGraph())
+        monkeypatch.setattr(service, "analysis_cache", cache)
+        monkeypatch.setattr(settings, "agent_session_store", "memory")
+        text = f"Still have the headache {uuid.uuid4()}"
+
+        await service.analyze_symptoms(SymptomAnalysisRequest(user_input=text, session_id="s1"))
+        await service.analyze_symptoms(SymptomAnalysisRequest(user_input=text, session_id="s1"))
+
+        # Each turn of the session reaches the graph and nothing is cached for it
+        assert [call["session_id"] for call in calls] == ["s1", "s1"]
+        assert len(cache) == 0
+
+    async def test_identical_in_flight_analyses_share_one_run(self, monkeypatch):
+        release = asyncio.Event()
+        calls = []
+
+        class SlowGraph:
+            async def analyze_symptoms(self, input_data):
+                calls.append(input_data)
+                await release.wait()
+                return {"symptoms": ["cough"], "urgency_level": "low", "confidence_score": 0.5}
+
+        monkeypatch.setattr(service, "_graph", SlowGraph())
+        monkeypatch.setattr(service, "analysis_cache", None)
+        before = service.metrics_snapshot()
+        request = SymptomAnalysisRequest(user_input=f"Cough for a week {uuid.uuid4()}")
+
+        waiters = [asyncio.create_task(service.analyze_symptoms(request)) for _ in range(4)]
+        await asyncio.sleep(0)
+        waiters[0].cancel()
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters[1:])
+
+        assert len(calls) == 1
+        assert waiters[0].cancelled()
+        assert all(result.symptoms == ["cough"] for result in results)
+        assert results[1] is not results[2]
+        after = service.metrics_snapshot()
+        assert after.coalesced_requests_total - before.coalesced_requests_total == 3
+
+    async def test_provider_overload_shrinks_llm_concurrency(self, monkeypatch):
+        class RateLimitedGraph:
+            async def analyze_symptoms(self, input_data):
+                # Agents swallow provider errors and report them instead.
+                report_overload("rate_limit")
+                return {"symptoms": ["cough"], "urgency_level": "low", "confidence_score": 0.5}
+
+        limiter = AdaptiveLimiter(initial=4, on_backoff=metrics.record_llm_backoff)
+        monkeypatch.setattr(service, "llm_limiter", limiter)
+        monkeypatch.setattr(service, "_graph", RateLimitedGraph())
+        monkeypatch.setattr(service, "analysis_cache", None)
+        before = service.metrics_snapshot()
+
+        response = await service.analyze_symptoms(
+            SymptomAnalysisRequest(user_input=f"Cough for a week {uuid.uuid4()}")
+        )
+
+        assert response.symptoms == ["cough"]
+        assert limiter.limit == 2
+        assert limiter.in_flight == 0
+        after = service.metrics_snapshot()
+        assert after.llm_concurrency_limit == 2
+        assert after.llm_concurrency_backoffs_total - before.llm_concurrency_backoffs_total == 1
+
+    async def test_waiting_for_an_llm_slot_counts_against_the_deadline(self, monkeypatch):
+        class UnusedChain:
+            async def analyze(self, input_data, baseline):
+                raise AssertionError("fast chain should not run after the deadline")
+
+        limiter = AdaptiveLimiter(initial=1)
+        held = await limiter.acquire()
+        monkeypatch.setattr(service, "llm_limiter", limiter)
+        monkeypatch.setattr(service, "_fast_chain", UnusedChain())
+        monkeypatch.setattr(service, "analysis_cache", None)
+        monkeypatch.setattr(settings, "mcp_fast_timeout_seconds", 0.05)
+
+        response = await asyncio.wait_for(
+            service.analyze_symptoms(
+                SymptomAnalysisRequest(user_input=f"Cough and fever {uuid.uuid4()}", mode="fast")
+            ),
+            timeout=1,
+        )
+
+        assert response.symptoms == ["cough", "fever"]
+        assert limiter.stats()["waiting"] == 0
+        limiter.release(held)
+        assert limiter.in_flight == 0
+
+    async def test_overloaded_analysis_fails_fast_with_structured_error(self, monkeypatch):
+        release = asyncio.Event()
+
+        class SlowGraph:
+            async def analyze_symptoms(self, input_data):
+                await release.wait()
+                return {"symptoms": ["cough"], "urgency_level": "low", "confidence_score": 0.5}
+
+        admission = AdmissionController(
+            max_in_flight=1, max_queue=0, queue_timeout=1, on_shed=metrics.record_load_shed
+        )
+        monkeypatch.setattr(service, "admission", admission)
+        monkeypatch.setattr(service, "_graph", SlowGraph())
+        monkeypatch.setattr(service, "analysis_cache", None)
+        before = service.metrics_snapshot()
+
+        running = asyncio.create_task(
+            service.analyze_symptoms(SymptomAnalysisRequest(user_input=f"Cough for a week {uuid.uuid4()}"))
+        )
+        await asyncio.sleep(0)
+        with pytest.raises(ToolError) as excinfo:
+            await mcp.call_tool("analyze_symptoms", {"user_input": f"Sore throat {uuid.uuid4()}"})
+        release.set()
+        await running
+
+        payload = json.loads(str(excinfo.value).split(": ", 1)[1])
+        assert payload == {"error": "overloaded", "reason": "queue_full", "retry_after_seconds": 1}
+        assert service.admission.in_flight == 0
+        after = service.metrics_snapshot()
+        assert after.requests_shed_total - before.requests_shed_total == 1
+
+    async def test_deadline_truncated_graph_returns_completed_partial_result(self, monkeypatch):
+        seen = []
+
+        class TruncatedGraph:
+            async def analyze_symptoms(self, input_data):
+                seen.append(input_data)
+                return {"symptoms": ["cough"], "urgency_level": "low", "partial": True}
+
+        monkeypatch.setattr(service, "_graph", TruncatedGraph())
+        monkeypatch.setattr(service, "analysis_cache", MemoryResultCache(maxsize=4, ttl_seconds=60))
+        request = SymptomAnalysisRequest(user_input=f"Cough and a fever for three days {uuid.uuid4()}")
+
+        first = await service.analyze_symptoms(request)
+        second = await service.analyze_symptoms(request)
+
+        assert len(seen) == 2
+        assert 0 < seen[0]["deadline"] - time.monotonic() <= settings.mcp_tool_timeout_seconds
+        assert first.partial and second.partial
+        assert first.symptoms[0] == "cough"
+        assert "fever" in first.symptoms
+        assert first.recommendations
+        assert first.risk_assessment["source"] == "heuristics"
+
+    async def test_failed_warmup_keeps_service_not_ready(self, monkeypatch):
+        class BrokenGraph:
+            async def dry_run(self):
+                raise RuntimeError("Graph dry run did not complete")
+
+        monkeypatch.setattr(settings, "mcp_warmup_enabled", True)
+        monkeypatch.setattr(service, "_graph", BrokenGraph())
+        monkeypatch.setattr(service, "warmup_status", "pending")
+
+        assert service.is_ready() == (False, "warm-up pending")
+        await service.warm_up(dry_run=True)
+
+        assert service.warmup_status == "failed"
+        assert service.is_ready() == (False, "warm-up failed: Graph dry run did not complete")
+
+    async def test_failed_warmup_is_retried_until_ready(self, monkeypatch):
+        attempts = []
+
+        class FlakyGraph:
+            async def dry_run(self):
+                attempts.append(True)
+                if len(attempts) < 3:
+                    raise RuntimeError("vector store unavailable")
+
+        monkeypatch.setattr(settings, "mcp_warmup_enabled", True)
+        monkeypatch.setattr(settings, "mcp_warmup_dry_run", True)
+        monkeypatch.setattr(settings, "mcp_warmup_retry_backoff_seconds", 0.01)
+        monkeypatch.setattr(service, "_graph", FlakyGraph())
+        monkeypatch.setattr(service, "_warmup_task", None)
+        monkeypatch.setattr(service, "warmup_status", "pending")
+
+        await asyncio.wait_for(service.start_warmup(), timeout=5)
+
+        assert len(attempts) == 3
+        assert service.is_ready() == (True, "ready")
+
+    async def test_red_flags_short_circuit_the_graph(self, monkeypatch):
+        class UnusedGraph:
+            async def analyze_symptoms(self, input_data):
+                raise AssertionError("graph should not run for red-flag input")
+
+        monkeypatch.setattr(service, "_graph", UnusedGraph())
+        monkeypatch.setattr(settings, "mcp_red_flag_background_enrichment", False)
+        before = service.metrics_snapshot()
+
+        response = await service.analyze_symptoms(
+            SymptomAnalysisRequest(user_input="Crushing chest pain and slurred speech, also a headache")
+        )
+
+        assert response.urgency_level == "emergency"
+        assert response.symptoms == ["headache"]
+        assert response.risk_assessment["red_flags"] == ["chest pain", "stroke-like symptoms"]
+        assert "Call emergency services now." in response.recommendations
+        assert "Note symptom onset time for emergency responders." in response.recommendations
+        assert response.when_to_see_doctor == decision_support.explain_urgency("emergency")["seek_care_threshold"]
+        after = service.metrics_snapshot()
+        assert after.red_flag_short_circuits_total - before.red_flag_short_circuits_total == 1
+        assert decision_support.red_flag_emergency_analysis("denies chest pain") is None
+
+    async def test_red_flag_enrichment_runs_graph_in_background(self, monkeypatch):
+        calls = []
+
+        class EmergencyGraph:
+            async def analyze_symptoms(self, input_data):
+                calls.append(input_data)
+                await asyncio.sleep(0)
+                return {
+                    "symptoms": ["chest pain"],
+                    "preliminary_diagnosis": ["possible acute coronary syndrome"],
+                    "urgency_level": "emergency",
+                    "confidence_score": 0.7,
+                }
+
+        monkeypatch.setattr(service, "_graph", EmergencyGraph())
+        monkeypatch.setattr(service, "analysis_cache", MemoryResultCache(maxsize=8, ttl_seconds=60))
+        monkeypatch.setattr(settings, "mcp_red_flag_background_enrichment", True)
+        request = SymptomAnalysisRequest(user_input=f"chest pain radiating to my arm {uuid.uuid4()}")
+
+        first = await service.analyze_symptoms(request)
+        await service.analyze_symptoms(request)
+        await service.drain_background_tasks()
+        enriched = await service.analyze_symptoms(request)
+
+        assert first.preliminary_diagnosis == []
+        assert len(calls) == 1
+        assert enriched.urgency_level == "emergency"
+        assert enriched.preliminary_diagnosis == ["possible acute coronary syndrome"]
+
+    async def test_red_flag_enrichment_is_not_repeated_for_the_same_input(self, monkeypatch):
+        calls = []
+
+        class CalmGraph:
+            async def analyze_symptoms(self, input_data):
+                calls.append(input_data)
+                return {"symptoms": ["chest pain"], "urgency_level": "high", "confidence_score": 0.6}
+
+        monkeypatch.setattr(service, "_graph", CalmGraph())
+        monkeypatch.setattr(service, "analysis_cache", MemoryResultCache(maxsize=8, ttl_seconds=60))
+        monkeypatch.setattr(settings, "mcp_red_flag_background_enrichment", True)
+        request = SymptomAnalysisRequest(user_input=f"chest pain after lifting {uuid.uuid4()}")
+
+        for _ in range(3):
+            response = await service.analyze_symptoms(request)
+            await service.drain_background_tasks()
+
+        assert response.urgency_level == "emergency"
+        assert len(calls) == 1
+
+    async def test_analysis_modes(self, monkeypatch):
+        class FastChain:
+            def __init__(self, fail=False):
+                self.fail = fail
+
+            async def analyze(self, input_data, baseline):
+                if self.fail:
+                    raise RuntimeError("provider unavailable")
+                assert baseline["symptoms"] == ["cough", "fever"]
+                return {
+                    "symptoms": ["cough", "sore throat"],
+                    "possible_conditions": ["viral infection"],
+                    "urgency_level": "low",
+                    "recommendations": ["Rest and fluids."],
+                    "confidence": 0.6,
+                }
+
+        def histogram_count(mode):
+            return service._extract_metric_value(metrics.analysis_duration, "_count", {"mode": mode})
+
+        monkeypatch.setattr(service, "analysis_cache", None)
+        before = {mode: histogram_count(mode) for mode in ("heuristic", "fast")}
+        text = f"Cough and fever, 6/10 {uuid.uuid4()}"
+
+        _, heuristic = await mcp.call_tool("analyze_symptoms", {"user_input": text, "mode": "heuristic"})
+        assert heuristic["mode"] == "heuristic"
+        assert heuristic["symptoms"] == ["cough", "fever"]
+        assert heuristic["urgency_level"] == "medium"
+        assert heuristic["risk_assessment"]["source"] == "heuristics"
+
+        monkeypatch.setattr(service, "_fast_chain", FastChain())
+        fast = await service.analyze_symptoms(SymptomAnalysisRequest(user_input=text, mode="fast"))
+        assert fast.mode == "fast"
+        assert fast.symptoms == ["cough", "fever", "sore throat"]
+        assert fast.preliminary_diagnosis == ["viral infection"]
+        assert fast.urgency_level == "medium"
+
+        monkeypatch.setattr(service, "_fast_chain", FastChain(fail=True))
+        degraded = await service.analyze_symptoms(SymptomAnalysisRequest(user_input=f"{text} again", mode="fast"))
+        assert degraded.urgency_level == "medium"
+        assert degraded.risk_assessment["source"] == "heuristics"
+
+        assert histogram_count("heuristic") - before["heuristic"] == 1
+        assert histogram_count("fast") - before["fast"] == 2
+        with pytest.raises(ValidationError):
+            SymptomAnalysisRequest(user_input=text, mode="instant")
+
+    async def test_stream_batch_yields_in_completion_order_with_partial_results(self, monkeypatch):
+        delays = {"slow": 5.0, "medium": 0.02, "quick": 0.0}
+
+        async def fake_analyze(request):
+            await asyncio.sleep(delays[request.user_input])
+            return _analysis_response(request.user_input)
+
+        monkeypatch.setattr(service, "analyze_symptoms", fake_analyze)
+        monkeypatch.setattr(settings, "mcp_batch_max_concurrency", 3)
+        requests = [SymptomAnalysisRequest(user_input=text) for text in ("slow", "medium", "quick")]
+
+        items = [item async for item in service.stream_batch_analysis(requests, timeout_seconds=0.2)]
+
+        assert [(item.index, item.status) for item in items] == [(2, "completed"), (1, "completed"), (0, "timeout")]
+        assert items[0].result.symptoms == ["quick"]
+        assert items[0].elapsed_seconds <= items[1].elapsed_seconds <= items[2].elapsed_seconds
+        summary = service.streaming_batch_summary(items, 0.2)
+        assert (summary.completed, summary.failed, summary.timed_out) == (2, 0, 1)
+
+    async def test_stream_batch_tool_reports_progress_per_item(self, monkeypatch):
+        async def fake_analyze(request):
+            return _analysis_response(request.user_input)
+
+        monkeypatch.setattr(service, "analyze_symptoms", fake_analyze)
+        progress = []
+
+        async def on_progress(done, total, message):
+            progress.append((done, total, json.loads(message)["index"]))
+
+        async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+            result = await session.call_tool(
+                "stream_batch_analyze_symptoms",
+                {"requests": [{"user_input": "a"}, {"user_input": "b"}]},
+                progress_callback=on_progress,
+            )
+
+        assert sorted(progress) == [(1, 2, 0), (2, 2, 1)]
+        assert result.structuredContent["completed"] == 2
+        assert {item["index"] for item in result.structuredContent["items"]} == {0, 1}
+
+    async def test_mcp_analysis_tools_report_shedding_as_tool_errors(self, monkeypatch):
+        admission = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=1)
+        admission.in_flight = 1
+        monkeypatch.setattr(service, "admission", admission)
+        monkeypatch.setattr(service, "analysis_cache", None)
+
+        async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+            results = [
+                await session.call_tool(name, arguments)
+                for name, arguments in (
+                    ("analyze_symptoms", {"user_input": f"Cough for two days {uuid.uuid4()}"}),
+                    ("stream_analyze_symptoms", {"user_input": f"Cough for two days {uuid.uuid4()}"}),
+                    ("stream_batch_analyze_symptoms", {"requests": [{"user_input": f"Cough {uuid.uuid4()}"}]}),
+                )
+            ]
+
+        for result in results:
+            assert result.isError
+            payload = json.loads(result.content[0].text.split(": ", 1)[1])
+            assert payload == {"error": "overloaded", "reason": "queue_full", "retry_after_seconds": 1}
+
+    async def test_stream_analysis_yields_stages_then_completed_result(self, monkeypatch):
+        graph = StagedGraph()
+        monkeypatch.setattr(service, "_graph", graph)
+        monkeypatch.setattr(service, "analysis_cache", MemoryResultCache(maxsize=8, ttl_seconds=60))
+        request = SymptomAnalysisRequest(user_input=f"Headache since this morning {uuid.uuid4()}")
+
+        events = [event async for event in service.stream_analysis(request)]
+
+        assert [(event.type, event.stage) for event in events] == [
+            ("stage", "symptom_extractor"),
+            ("stage", "diagnostic_analyzer"),
+            ("result", None),
+        ]
+        assert events[0].urgency_level == "medium" and events[0].preliminary_diagnosis is None
+        assert "deadline" in graph.calls[0]
+        result = events[-1].result
+        assert result.partial
+        # Stages the deadline cut off are filled from the rules, as for analyze_symptoms
+        assert result.recommendations and result.risk_assessment
+        assert len(service.analysis_cache) == 0
+
+        heuristic = [event async for event in service.stream_analysis(request.model_copy(update={"mode": "heuristic"}))]
+        assert [event.type for event in heuristic] == ["result"]
+        assert heuristic[0].result.mode == "heuristic"
+        assert len(graph.calls) == 1
+
+    async def test_stream_analysis_releases_slots_when_the_graph_finishes(self, monkeypatch):
+        admission = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=1)
+        limiter = AdaptiveLimiter(initial=1)
+        monkeypatch.setattr(service, "admission", admission)
+        monkeypatch.setattr(service, "llm_limiter", limiter)
+        monkeypatch.setattr(service, "_graph", StagedGraph())
+        monkeypatch.setattr(service, "analysis_cache", None)
+        stream = service.stream_analysis(SymptomAnalysisRequest(user_input=f"Headache {uuid.uuid4()}"))
+
+        first = await anext(stream)
+        for _ in range(50):
+            if admission.in_flight == 0:
+                break
+            await asyncio.sleep(0)
+
+        # The client has read one event, but the graph is done and holds nothing
+        assert admission.in_flight == 0
+        assert limiter.in_flight == 0
+        rest = [event async for event in stream]
+        assert first.stage == "symptom_extractor"
+        assert [event.type for event in rest] == ["stage", "result"]
+
+    async def test_closing_a_stream_early_cancels_the_graph(self, monkeypatch):
+        cancelled = asyncio.Event()
+
+        class StuckGraph:
+            async def stream_analysis(self, input_data):
+                yield {"stage": "symptom_extractor", "data": {"symptoms": ["headache"]}}
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+                yield {"stage": "result", "data": {}}
+
+        admission = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=1)
+        monkeypatch.setattr(service, "admission", admission)
+        monkeypatch.setattr(service, "_graph", StuckGraph())
+        monkeypatch.setattr(service, "analysis_cache", None)
+        stream = service.stream_analysis(SymptomAnalysisRequest(user_input=f"Headache {uuid.uuid4()}"))
+
+        assert (await anext(stream)).stage == "symptom_extractor"
+        await stream.aclose()
+
+        assert cancelled.is_set()
+        assert admission.in_flight == 0
+
+    async def test_stream_analysis_tool_reports_progress_per_stage(self, monkeypatch):
+        monkeypatch.setattr(service, "_graph", StagedGraph())
+        monkeypatch.setattr(service, "analysis_cache", None)
+        progress = []
+
+        async def on_progress(done, total, message):
+            progress.append((done, json.loads(message)))
+
+        async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+            result = await session.call_tool(
+                "stream_analyze_symptoms",
+                {"user_input": f"Headache since this morning {uuid.uuid4()}"},
+                progress_callback=on_progress,
+            )
+
+        assert [(done, message["stage"]) for done, message in progress] == [
+            (1, "symptom_extractor"),
+            (2, "diagnostic_analyzer"),
+        ]
+        assert progress[0][1] == {
+            "type": "stage",
+            "stage": "symptom_extractor",
+            "elapsed_seconds": progress[0][1]["elapsed_seconds"],
+            "symptoms": ["headache"],
+            "urgency_level": "medium",
+        }
+        assert result.structuredContent["preliminary_diagnosis"] == ["tension headache"]
+        assert result.structuredContent["partial"] is True
+
     async def test_compute_risk_score_tool(self):
         _, structured = await mcp.call_tool(
             "compute_risk_score",
@@ -143,6 +721,236 @@ class TestMCPServer:
         assert structured["risk_tier"] in {"high", "critical"}
         assert structured["suggested_urgency"] in {"high", "emergency"}
 
+    async def test_scoring_tools_serve_memoized_responses(self):
+        before = service.metrics_snapshot()
+
+        first = service.risk_score("high", ["chest pain"], age=70, known_conditions=["Diabetes"], severity_hint=6)
+        second = service.risk_score("high", ["stroke-like symptoms"], age=64, known_conditions=["Diabetes"], severity_hint=5)
+        assert second is first
+        assert first.model_dump(mode="json") == decision_support.compute_risk_score(
+            "high", ["stroke-like symptoms"], age=64, known_conditions=["Diabetes"], severity_hint=5
+        )
+
+        for level in ("low", "medium", "high", "emergency", "unknown"):
+            assert service.explain_urgency_level(level).model_dump(mode="json") == decision_support.explain_urgency(level)
+            for score in (-5, 0, 34, 35, 59, 60, 79, 80, 140):
+                for has_primary_care in (True, False):
+                    assert service.recommend_care_setting(level, score, has_primary_care).model_dump(mode="json") == (
+                        decision_support.recommend_care_setting(level, score, has_primary_care)
+                    )
+            schedule = service.monitoring_schedule(["Cough", "fever"], level, ["difficulty breathing"])
+            assert schedule.model_dump(mode="json") == decision_support.build_monitoring_schedule(
+                ["Cough", "fever"], level, ["difficulty breathing"]
+            )
+
+        with pytest.raises(ValidationError):
+            first.risk_score = 0
+        # Shared responses hold tuples, so one caller cannot change what the next one gets
+        with pytest.raises(AttributeError):
+            first.contributing_factors.append("tampered")
+        with pytest.raises(AttributeError):
+            service.explain_urgency_level("high").immediate_actions.append("tampered")
+        with pytest.raises(AttributeError):
+            service.recommend_care_setting("high", 70, True).rationale.append("tampered")
+        with pytest.raises(AttributeError):
+            schedule.escalation_triggers.append("tampered")
+
+        after = service.metrics_snapshot()
+        assert after.cache_hits_total > before.cache_hits_total
+        assert after.cache_misses_total > before.cache_misses_total
+
+    async def test_score_population_risk_tool(self):
+        _, structured = await mcp.call_tool(
+            "score_population_risk",
+            {
+                "urgency_levels": ["low", "emergency"],
+                "red_flag_counts": [0, 2],
+                "ages": [30, None],
+                "severity_hints": [None, 9],
+                "known_conditions": [[], ["Heart Disease"]],
+            },
+        )
+
+        assert structured["risk_scores"] == [0, 100]
+        assert structured["risk_tiers"] == ["low", "critical"]
+        assert structured["suggested_urgency"] == ["low", "emergency"]
+        assert structured["condition_order"][1] == "heart disease"
+
+    async def test_batch_triage_tools_inline(self):
+        _, structured = await mcp.call_tool(
+            "batch_triage_text_heuristics",
+            {
+                "requests": [
+                    {"user_input": "Crushing chest pain"},
+                    {"user_input": "Mild headache", "severity_hint": 6},
+                ],
+            },
+        )
+
+        assert [item["suggested_urgency"] for item in structured["results"]] == ["emergency", "medium"]
+
+    async def test_batch_triage_facts_uses_process_pool_in_order(self, monkeypatch):
+        monkeypatch.setattr(settings, "mcp_triage_batch_inline_threshold", 0)
+        monkeypatch.setattr(settings, "mcp_triage_batch_chunk_size", 3)
+        monkeypatch.setattr(settings, "mcp_triage_batch_workers", 2)
+        texts = [f"fever for {n} days" for n in range(1, 11)]
+
+        try:
+            _, structured = await mcp.call_tool("batch_extract_triage_facts", {"texts": texts})
+        finally:
+            service.shutdown_triage_executor()
+
+        assert [item["inferred_duration"] for item in structured["results"]] == [
+            f"{n} days" for n in range(1, 11)
+        ]
+
+    async def test_broken_triage_pool_falls_back_off_the_event_loop(self, monkeypatch):
+        class BrokenExecutor:
+            def submit(self, fn, *args):
+                raise BrokenProcessPool("worker died")
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                pass
+
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def chunk_fn(items):
+            threads.append(threading.get_ident())
+            return [item.upper() for item in items]
+
+        monkeypatch.setattr(settings, "mcp_triage_batch_inline_threshold", 0)
+        monkeypatch.setattr(service, "_triage_executor", BrokenExecutor())
+
+        assert await service._map_triage_batch(chunk_fn, ["a", "b"]) == ["A", "B"]
+        assert threads and threads[0] != loop_thread
+        assert service._triage_executor is None
+
+    async def test_rule_pack_hot_swap(self, tmp_path, monkeypatch):
+        pack_path = tmp_path / "pack.yaml"
+        pack_path.write_text(
+            "version: '2026.10'\n"
+            "red_flags:\n"
+            "  anaphylaxis: [throat closing, swollen tongue]\n",
+            encoding="utf-8",
+        )
+        monkeypatch.setattr(settings, "mcp_triage_batch_inline_threshold", 0)
+        monkeypatch.setattr(settings, "mcp_triage_batch_chunk_size", 1)
+        monkeypatch.setattr(settings, "mcp_rule_pack_dir", str(tmp_path))
+
+        try:
+            _, structured = await mcp.call_tool("load_rule_pack", {"path": str(pack_path)})
+            assert structured["version"] == "2026.10"
+            assert structured["counts"]["red_flags"] == 1
+
+            _, config = await mcp.call_tool("get_runtime_config", {})
+            assert config["rule_pack_version"] == "2026.10"
+
+            _, structured = await mcp.call_tool(
+                "batch_triage_text_heuristics",
+                {"requests": [{"user_input": "my throat closing"}, {"user_input": "crushing chest pain"}]},
+            )
+            assert [item["detected_red_flags"] for item in structured["results"]] == [["anaphylaxis"], []]
+        finally:
+            await mcp.call_tool("reset_rule_pack", {})
+            service.shutdown_triage_executor()
+
+        _, structured = await mcp.call_tool("get_rule_pack_status", {})
+        assert structured["version"] == "builtin"
+        result = service.heuristic_triage("crushing chest pain")
+        assert result.detected_red_flags == ["chest pain"]
+
+    async def test_load_rule_pack_only_reads_the_rule_pack_directory(self, tmp_path, monkeypatch):
+        packs = tmp_path / "packs"
+        packs.mkdir()
+        secret = tmp_path / "secret.json"
+        secret.write_text('{"version": "x", "format": "api-key-123"}', encoding="utf-8")
+        (packs / "link.json").symlink_to(secret)
+        (packs / "broken.json").write_text('{"version": "x", "format": "api-key-123"}', encoding="utf-8")
+
+        monkeypatch.setattr(settings, "mcp_rule_pack_dir", None)
+        with pytest.raises(ToolError, match="disabled"):
+            await mcp.call_tool("load_rule_pack", {"path": str(packs / "broken.json")})
+
+        monkeypatch.setattr(settings, "mcp_rule_pack_dir", str(packs))
+        for path in (str(secret), "../secret.json", "link.json"):
+            with pytest.raises(ToolError, match="inside the configured rule-pack directory"):
+                await mcp.call_tool("load_rule_pack", {"path": path})
+
+        with pytest.raises(ToolError, match="format") as excinfo:
+            await mcp.call_tool("load_rule_pack", {"path": "broken.json"})
+        assert "api-key-123" not in str(excinfo.value)
+
+        _, structured = await mcp.call_tool("get_rule_pack_status", {})
+        assert structured["version"] == "builtin"
+
+    async def test_load_rule_pack_rejects_invalid_document(self):
+        with pytest.raises(Exception, match="urgency levels"):
+            await mcp.call_tool(
+                "load_rule_pack",
+                {"document": {"version": "bad", "urgency_explanations": {"low": "only one level"}}},
+            )
+
+        _, structured = await mcp.call_tool("get_rule_pack_status", {})
+        assert structured["version"] == "builtin"
+
+    async def test_static_resources_are_serialized_once_per_version(self):
+        static_resources.clear()
+        first = await mcp.read_resource("symptomsync://catalog/capabilities")
+        builds = static_resources.builds
+        second = await mcp.read_resource("symptomsync://catalog/capabilities")
+        assert static_resources.builds == builds
+        assert list(first)[0].content == list(second)[0].content
+
+        catalog = json.loads(list(first)[0].content)
+        assert "get_capability_catalog" in catalog["tools"]
+        _, structured = await mcp.call_tool("get_capability_catalog", {})
+        assert structured == catalog
+
+        matrix_etag = (await urgency_matrix()).etag
+        try:
+            service.load_rule_pack(
+                document={
+                    "version": "etag-test",
+                    "urgency_explanations": {
+                        "low": "Mild.",
+                        "medium": "Moderate.",
+                        "high": "Elevated.",
+                        "emergency": "Life-threatening.",
+                    },
+                }
+            )
+            assert (await urgency_matrix()).etag != matrix_etag
+            contents = await mcp.read_resource("symptomsync://guidelines/urgency-matrix")
+            assert json.loads(list(contents)[0].content)["low"]["explanation"] == "Mild."
+        finally:
+            service.reset_rule_pack()
+
+    async def test_cached_capability_catalog_does_not_list_primitives(self, monkeypatch):
+        static_resources.clear()
+        await mcp.read_resource("symptomsync://catalog/capabilities")
+
+        async def fail_listing():
+            raise AssertionError("cached catalog read listed primitives")
+
+        for method in ("list_tools", "list_resources", "list_prompts"):
+            monkeypatch.setattr(mcp, method, fail_listing)
+        contents = await mcp.read_resource("symptomsync://catalog/capabilities")
+        assert "get_capability_catalog" in json.loads(list(contents)[0].content)["tools"]
+        monkeypatch.undo()
+
+        def probe_tool() -> str:
+            return "ok"
+
+        mcp.add_tool(probe_tool, name="catalog_probe_tool")
+        try:
+            contents = await mcp.read_resource("symptomsync://catalog/capabilities")
+            assert "catalog_probe_tool" in json.loads(list(contents)[0].content)["tools"]
+        finally:
+            mcp.remove_tool("catalog_probe_tool")
+        contents = await mcp.read_resource("symptomsync://catalog/capabilities")
+        assert "catalog_probe_tool" not in json.loads(list(contents)[0].content)["tools"]
+
     async def test_redact_sensitive_text_tool(self):
         _, structured = await mcp.call_tool(
             "redact_sensitive_text",
@@ -180,6 +988,85 @@ def test_http_gateway_health_and_metrics_endpoints(monkeypatch):
     assert "text/plain" in metrics_response.headers["content-type"]
 
 
+def test_http_gateway_streams_batch_as_ndjson(monkeypatch):
+    async def fake_analyze(request):
+        if request.user_input == "hangs":
+            await asyncio.sleep(5)
+        return _analysis_response(request.user_input)
+
+    monkeypatch.setattr(settings, "mcp_require_auth", False)
+    monkeypatch.setattr(service, "analyze_symptoms", fake_analyze)
+    client = TestClient(create_http_app())
+
+    response = client.post(
+        "/batch/analyze/stream",
+        json={"requests": [{"user_input": "hangs"}, {"user_input": "cough"}], "timeout_seconds": 0.1},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [(line["type"], line.get("index"), line.get("status")) for line in lines[:2]] == [
+        ("item", 1, "completed"),
+        ("item", 0, "timeout"),
+    ]
+    assert lines[2]["type"] == "summary"
+    assert (lines[2]["completed"], lines[2]["timed_out"]) == (1, 1)
+
+    too_many = [{"user_input": "x"}] * (settings.mcp_batch_max_requests + 1)
+    assert client.post("/batch/analyze/stream", json={"requests": too_many}).status_code == 422
+
+
+def test_http_gateway_streams_analysis_as_ndjson_or_sse(monkeypatch):
+    monkeypatch.setattr(settings, "mcp_require_auth", False)
+    monkeypatch.setattr(service, "_graph", StagedGraph())
+    monkeypatch.setattr(service, "analysis_cache", None)
+    client = TestClient(create_http_app())
+    body = {"user_input": f"Headache since this morning {uuid.uuid4()}"}
+
+    response = client.post("/analyze/stream", json=body)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [(line["type"], line.get("stage")) for line in lines] == [
+        ("stage", "symptom_extractor"),
+        ("stage", "diagnostic_analyzer"),
+        ("result", None),
+    ]
+    assert lines[0]["urgency_level"] == "medium"
+    assert lines[2]["result"]["partial"] is True
+
+    response = client.post("/analyze/stream", json=body, headers={"Accept": "text/event-stream"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = [message.split("\n") for message in response.text.strip().split("\n\n")]
+    assert [message[0] for message in messages] == ["event: stage", "event: stage", "event: result"]
+    assert json.loads(messages[0][1].removeprefix("data: "))["symptoms"] == ["headache"]
+
+    assert client.post("/analyze/stream", json={}).status_code == 422
+
+
+def test_http_gateway_static_resources_support_etags(monkeypatch):
+    monkeypatch.setattr(settings, "mcp_require_auth", False)
+    client = TestClient(create_http_app())
+
+    response = client.get("/resources/guidelines/urgency-matrix")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    assert "emergency" in response.json()
+    etag = response.headers["etag"]
+
+    not_modified = client.get("/resources/guidelines/urgency-matrix", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.content == b""
+
+    stale = client.get("/resources/guidelines/urgency-matrix", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+
+    assert client.get("/resources/guidelines/triage").headers["content-type"].startswith("text/markdown")
+    assert client.get("/resources/catalog/capabilities").status_code == 200
+    assert client.get("/resources/unknown").status_code == 404
+
+
 def test_http_gateway_authentication(monkeypatch):
     monkeypatch.setattr(settings, "mcp_require_auth", True)
     monkeypatch.setattr(settings, "mcp_auth_token", "test-token")
@@ -209,6 +1096,100 @@ def test_http_gateway_rate_limiting(monkeypatch):
     assert second.status_code == 429
 
 
+def test_http_gateway_sheds_analysis_when_saturated(monkeypatch):
+    monkeypatch.setattr(settings, "mcp_require_auth", False)
+    admission = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=1)
+    admission.in_flight = 1
+    monkeypatch.setattr(service, "admission", admission)
+    client = TestClient(create_http_app())
+
+    shed = client.post("/batch/analyze/stream", json={"requests": [{"user_input": "Cough for two days"}]})
+    health = client.get("/health")
+
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "1"
+    assert shed.json()["detail"] == "Server overloaded"
+    assert health.status_code == 200
+
+
+class _UnsaturatedLookingAdmission(AdmissionController):
+    """Passes the gateway's saturation check, then sheds at admission time."""
+
+    saturated = False
+
+
+def test_http_gateway_streams_answer_503_when_shed_after_the_saturation_check(monkeypatch):
+    monkeypatch.setattr(settings, "mcp_require_auth", False)
+    admission = _UnsaturatedLookingAdmission(max_in_flight=1, max_queue=0, queue_timeout=1)
+    admission.in_flight = 1
+    monkeypatch.setattr(service, "admission", admission)
+    monkeypatch.setattr(service, "analysis_cache", None)
+    client = TestClient(create_http_app())
+
+    for path, body in (
+        ("/analyze/stream", {"user_input": f"Cough for two days {uuid.uuid4()}"}),
+        ("/batch/analyze/stream", {"requests": [{"user_input": f"Cough for two days {uuid.uuid4()}"}]}),
+    ):
+        shed = client.post(path, json=body, headers={"Accept": "text/event-stream"})
+
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "1"
+        assert shed.json() == {"detail": "Server overloaded", "retry_after_seconds": 1}
+    assert admission.shed == 2
+
+
+def test_http_gateway_does_not_shed_the_mcp_endpoint(monkeypatch):
+    monkeypatch.setattr(settings, "mcp_require_auth", False)
+    admission = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=1)
+    admission.in_flight = 1
+    monkeypatch.setattr(service, "admission", admission)
+    client = TestClient(create_http_app(), raise_server_exceptions=False)
+    before = service.metrics_snapshot().requests_shed_total
+
+    response = client.post(
+        settings.mcp_http_path,
+        json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+        headers={"Accept": "application/json, text/event-stream"},
+    )
+
+    assert response.status_code != 503
+    assert service.metrics_snapshot().requests_shed_total == before
+
+
+def test_http_gateway_readyz_waits_for_warmup(monkeypatch):
+    release = threading.Event()
+    dry_runs = []
+
+    class WarmGraph:
+        async def dry_run(self):
+            await asyncio.to_thread(release.wait, 5)
+            dry_runs.append(True)
+
+    monkeypatch.setattr(settings, "mcp_require_auth", False)
+    monkeypatch.setattr(settings, "mcp_warmup_enabled", True)
+    monkeypatch.setattr(settings, "mcp_warmup_dry_run", True)
+    monkeypatch.setattr(service, "_graph", WarmGraph())
+    monkeypatch.setattr(service, "_warmup_task", None)
+    monkeypatch.setattr(service, "warmup_status", "pending")
+
+    with TestClient(create_http_app()) as client:
+        warming = client.get("/readyz")
+        live = client.get("/livez")
+        release.set()
+        for _ in range(100):
+            ready = client.get("/readyz")
+            if ready.status_code == 200:
+                break
+            time.sleep(0.01)
+
+    assert warming.status_code == 503
+    assert "warm-up" in warming.json()["detail"]
+    assert live.status_code == 200
+    assert ready.status_code == 200
+    assert dry_runs == [True]
+    assert service.warmup_status == "ready"
+
+
 def test_runtime_rejects_missing_token_when_auth_enabled(monkeypatch):
     monkeypatch.setattr(settings, "mcp_workers", 1)
     monkeypatch.setattr(settings, "mcp_require_auth", True)
@@ -228,5 +1209,361 @@ def test_runtime_rejects_unauthenticated_http_in_production(monkeypatch):
         run_server(transport="streamable-http", host="127.0.0.1", port=8012)
 
 
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Coalescing of concurrent identical calls."""
+
+    async def test_last_waiter_leaving_cancels_run(self):
+        flights = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def run():
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.create_task(flights.do("k", run)) for _ in range(2)]
+        await started.wait()
+        waiters[0].cancel()
+        await asyncio.sleep(0)
+        assert not cancelled.is_set()
+        waiters[1].cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert len(flights) == 0
+        assert await flights.do("k", lambda: asyncio.sleep(0, result="fresh")) == ("fresh", False)
+
+    async def test_errors_reach_every_waiter(self):
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(flights.do("k", fail), flights.do("k", fail), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+class TestAdmissionController:
+    """Global admission control with a bounded queue."""
+
+    async def test_slots_are_handed_to_waiters_in_order(self):
+        admission = AdmissionController(max_in_flight=1, max_queue=2, queue_timeout=1)
+        order = []
+        release = asyncio.Event()
+
+        async def run(name):
+            async with admission.admit():
+                order.append(name)
+                await release.wait()
+
+        tasks = [asyncio.create_task(run(name)) for name in ("a", "b", "c")]
+        await asyncio.sleep(0)
+        assert admission.stats()["queued"] == 2
+        with pytest.raises(AdmissionRejectedError) as excinfo:
+            async with admission.admit():
+                pass
+        assert excinfo.value.reason == "queue_full"
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b", "c"]
+        assert admission.in_flight == 0
+        assert admission.queued == 0
+
+    async def test_waiters_are_shed_after_queue_timeout(self):
+        admission = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=0.01)
+        async with admission.admit():
+            with pytest.raises(AdmissionRejectedError) as excinfo:
+                async with admission.admit():
+                    pass
+        assert excinfo.value.reason == "queue_timeout"
+        assert excinfo.value.retry_after >= 1
+        assert admission.queued == 0
+        assert admission.in_flight == 0
+
+    async def test_expected_wait_beyond_budget_is_shed_immediately(self):
+        admission = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=1)
+        admission._service_time = 5.0
+        async with admission.admit():
+            assert admission.saturated
+            with pytest.raises(AdmissionRejectedError) as excinfo:
+                async with admission.admit():
+                    pass
+        assert excinfo.value.reason == "queue_budget"
+        assert excinfo.value.to_dict()["retry_after_seconds"] >= 5
+        assert not admission.saturated
+
+
+async def _release_after(limiter, ticket, latency):
+    ticket.started -= latency
+    limiter.release(ticket)
+
+
+@pytest.mark.asyncio
+class TestAdaptiveLimiter:
+    """AIMD limit for LLM-bound work."""
+
+    async def test_limit_grows_only_while_saturated(self):
+        limiter = AdaptiveLimiter(initial=2, max_limit=3)
+
+        for _ in range(5):
+            await _release_after(limiter, await limiter.acquire(), 0.1)
+        assert limiter.limit == 2
+
+        for _ in range(20):
+            tickets = [await limiter.acquire() for _ in range(limiter.capacity)]
+            for ticket in tickets:
+                await _release_after(limiter, ticket, 0.1)
+        assert limiter.limit == 3
+
+    async def test_overload_halves_limit_once_per_epoch(self):
+        reasons = []
+        limiter = AdaptiveLimiter(initial=8, on_backoff=reasons.append)
+        tickets = [await limiter.acquire() for _ in range(4)]
+        for ticket in tickets:
+            ticket.overload = "rate_limit"
+            limiter.release(ticket)
+        assert limiter.limit == 4
+        assert reasons == ["rate_limit"]
+
+        ticket = await limiter.acquire()
+        ticket.overload = "timeout"
+        limiter.release(ticket)
+        assert limiter.limit == 2
+        assert limiter.stats()["backoffs"] == 2
+
+    async def test_latency_spike_backs_off(self):
+        reasons = []
+        limiter = AdaptiveLimiter(initial=4, window=10, on_backoff=reasons.append)
+        for _ in range(10):
+            await _release_after(limiter, await limiter.acquire(), 0.1)
+        assert reasons == []
+
+        await _release_after(limiter, await limiter.acquire(), 1.0)
+        assert reasons == ["latency"]
+        assert limiter.limit == 2
+
+    async def test_latency_is_compared_within_its_class(self):
+        reasons = []
+        limiter = AdaptiveLimiter(initial=8, window=10, on_backoff=reasons.append)
+        for _ in range(10):
+            await _release_after(limiter, await limiter.acquire("fast"), 1.0)
+            await _release_after(limiter, await limiter.acquire("full"), 10.0)
+        assert reasons == []
+        assert limiter.limit == 8
+
+        await _release_after(limiter, await limiter.acquire("fast"), 10.0)
+        assert reasons == ["latency"]
+
+    async def test_waiters_block_at_capacity(self):
+        limiter = AdaptiveLimiter(initial=1)
+        first = await limiter.acquire()
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not second.done()
+        assert limiter.stats()["waiting"] == 1
+
+        limiter.release(first)
+        limiter.release(await asyncio.wait_for(second, 1))
+        assert limiter.in_flight == 0
+
+    async def test_slot_marks_timeouts_and_reported_overload(self):
+        limiter = AdaptiveLimiter(initial=8)
+        with pytest.raises(TimeoutError):
+            async with limiter.slot():
+                raise TimeoutError
+        assert limiter.limit == 4
+
+        async with limiter.slot() as ticket:
+            report_overload("rate_limit")
+        assert ticket.overload == "rate_limit"
+        assert limiter.limit == 2
+        report_overload("ignored outside a slot")
+
+    async def test_slot_wait_is_bounded_by_timeout(self):
+        limiter = AdaptiveLimiter(initial=1)
+        held = await limiter.acquire()
+        with pytest.raises(TimeoutError):
+            async with limiter.slot(timeout=0.01):
+                raise AssertionError("slot should not be granted")
+        assert limiter.stats()["waiting"] == 0
+        assert limiter.limit == 1
+
+        limiter.release(held)
+        assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+class TestLLMClientRegistry:
+    async def test_pooled_transport_counts_requests_until_body_closed(self):
+        limits = httpx.Limits(max_connections=4)
+        transport = PooledTransport(
+            "test-pool", limits, httpx.MockTransport(lambda request: httpx.Response(200, text="ok"))
+        )
+        pool_gauge = metrics.llm_http_pool_in_use.labels(provider="test-pool")
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("POST", "https://llm.test/v1/chat") as response:
+                assert transport.in_use == 1
+                assert pool_gauge._value.get() == 1
+                assert await response.aread() == b"ok"
+            assert transport.in_use == 0
+            assert pool_gauge._value.get() == 0
+            assert metrics.llm_http_pool_max.labels(provider="test-pool")._value.get() == 4
+
+            await client.get("https://llm.test/v1/models")
+            assert transport.in_use == 0
+
+    async def test_registry_shares_pools_per_provider(self):
+        registry = LLMClientRegistry(httpx.Limits(max_connections=2, max_keepalive_connections=1))
+
+        sync_client, async_client = registry.http_clients("openai")
+        assert registry.http_clients("openai") == (sync_client, async_client)
+        assert registry.http_clients("anthropic")[1] is not async_client
+        assert registry.stats()["pools"]["openai"] == {"in_use": 0, "max_connections": 2}
+
+        with pytest.raises(ValueError):
+            registry.get("unknown", "model")
+        assert len(registry) == 0
+
+        await registry.aclose()
+        assert async_client.is_closed
+        assert registry.stats() == {"clients": 0, "pools": {}}
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio commands the cache uses."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.values = {}
+        self.sorted_sets = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def _live(self, key):
+        entry = self.values.get(key)
+        if entry is not None and entry[1] <= self.now:
+            del self.values[key]
+            return None
+        return entry
+
+    async def get(self, key):
+        entry = self._live(key)
+        return None if entry is None else entry[0]
+
+    async def set(self, key, value, ex):
+        self.values[key] = (value, self.now + ex)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sorted_sets.pop(key, None)
+
+    async def zadd(self, name, mapping, xx=False):
+        members = self.sorted_sets.setdefault(name, {})
+        for member, score in mapping.items():
+            if not xx or member in members:
+                members[member] = score
+
+    async def zrem(self, name, *members):
+        for member in members:
+            self.sorted_sets.get(name, {}).pop(member, None)
+
+    async def zremrangebyscore(self, name, low, high):
+        members = self.sorted_sets.get(name, {})
+        for member in [m for m, score in members.items() if score <= high]:
+            del members[member]
+
+    async def zcard(self, name):
+        return len(self.sorted_sets.get(name, {}))
+
+    async def zrange(self, name, start, end):
+        return sorted(self.sorted_sets.get(name, {}), key=self.sorted_sets[name].get)
+
+    async def zpopmin(self, name, count):
+        members = self.sorted_sets.get(name, {})
+        popped = sorted(members.items(), key=lambda item: item[1])[:count]
+        for member, _ in popped:
+            del members[member]
+        return popped
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    async def execute(self):
+        return [await getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class TestAnalysisResultCache:
+    """Analysis result cache keys and backends."""
+
+    def test_key_ignores_identity_and_formatting(self):
+        base = SymptomAnalysisRequest(user_input="Headache  since\nyesterday", medical_history=["Asthma", "diabetes"])
+        same = SymptomAnalysisRequest(
+            user_input="Headache since yesterday",
+            medical_history=["Diabetes", "asthma"],
+            user_id="u-1",
+            session_id="s-1",
+        )
+        different = SymptomAnalysisRequest(user_input="Headache since yesterday", age=40)
+
+        assert analysis_cache_key(base) == analysis_cache_key(same)
+        assert analysis_cache_key(base) != analysis_cache_key(different)
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_expires_and_evicts_least_recent(self):
+        now = [0.0]
+        cache = MemoryResultCache(maxsize=2, ttl_seconds=10, clock=lambda: now[0])
+
+        assert await cache.set("a", "1") == 0
+        assert await cache.set("b", "2") == 0
+        assert await cache.get("a") == "1"
+        assert await cache.set("c", "3") == 1
+        assert await cache.get("b") is None
+        now[0] = 11.0
+        assert await cache.get("a") is None
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_backend_expires_and_evicts_least_recent(self, monkeypatch):
+        client = FakeRedis()
+        monkeypatch.setattr("agentic_ai.model_context_server.result_cache.time.time", lambda: client.now)
+        cache = RedisResultCache(client, maxsize=2, ttl_seconds=10)
+
+        assert await cache.set("a", "1") == 0
+        client.now += 1
+        assert await cache.set("b", "2") == 0
+        client.now += 1
+        assert await cache.get("a") == "1"
+        assert await cache.set("c", "3") == 1
+        assert await cache.get("b") is None
+        assert set(client.sorted_sets[cache.index_key]) == {"a", "c"}
+
+        client.now += 20
+        assert await cache.get("a") is None
+        assert await cache.set("d", "4") == 0
+        assert set(client.sorted_sets[cache.index_key]) == {"d"}
+
+        await cache.clear()
+        assert await client.get("d") is None
+        assert await client.zcard(cache.index_key) == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
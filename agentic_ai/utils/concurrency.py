@@ -0,0 +1,415 @@
+"""
+Concurrency helpers shared by the service layer
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class _Flight(Generic[T]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future[T]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[K, T]):
+    """
+    Run at most one task per key; concurrent callers with the same key share it.
+
+    Each caller awaits the shared task through ``asyncio.shield``, so a caller
+    being cancelled (for example a client disconnecting) does not cancel the
+    run for the others. The task is cancelled only when its last waiter leaves.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[K, _Flight[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def _forget(self, key: K, flight: _Flight[T]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(self, key: K, factory: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Return ``(result, shared)`` for ``key``.
+
+        ``factory`` is only called when no task for ``key`` is in flight;
+        ``shared`` is True when this caller joined an existing task.
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Last waiter gone: stop the run and let the next caller start fresh.
+                self._forget(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+
+class LimiterTicket:
+    """A held concurrency slot; ``overload`` is set when the work hit provider limits."""
+
+    __slots__ = ("epoch", "started", "latency_class", "overload")
+
+    def __init__(self, epoch: int, started: float, latency_class: str = "default") -> None:
+        self.epoch = epoch
+        self.started = started
+        self.latency_class = latency_class
+        self.overload: str | None = None
+
+
+_current_ticket: ContextVar[LimiterTicket | None] = ContextVar("symptomsync_limiter_ticket", default=None)
+
+
+def report_overload(reason: str) -> None:
+    """
+    Mark the slot held by the current task as overloaded.
+
+    Called from code that runs under ``AdaptiveLimiter.slot()`` but handles
+    errors itself (for example agents catching provider 429s), so the limiter
+    still backs off. A no-op outside a slot.
+    """
+    ticket = _current_ticket.get()
+    if ticket is not None and ticket.overload is None:
+        ticket.overload = reason
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """Return True for provider rate-limit/overload errors (HTTP 429/503/529)."""
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if status in {429, 503, 529}:
+        return True
+    name = type(exc).__name__
+    return "RateLimit" in name or "Overloaded" in name
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for LLM-bound work.
+
+    The limit grows additively (about ``increase`` per limit's worth of
+    successful calls, as TCP congestion avoidance does) while the pool is
+    saturated and latency is flat. It is cut multiplicatively by ``backoff``
+    when a call reports overload (provider 429s, timeouts) or when the p95 of
+    recent latencies exceeds ``latency_tolerance`` times the long-run
+    average. Work of different expected cost shares the slots but keeps its
+    own average per ``latency_class``, so a mix of short and long calls is
+    not read as a slowdown. At most one cut happens per epoch: calls that
+    started before the latest cut do not cut again.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        window: int = 50,
+        on_change: Callable[[AdaptiveLimiter], None] | None = None,
+        on_backoff: Callable[[str], None] | None = None,
+    ) -> None:
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.backoffs = 0
+        self._epoch = 0
+        self._baselines: dict[str, float] = {}
+        # Recent latencies as multiples of their class baseline.
+        self._recent: deque[float] = deque(maxlen=window)
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._on_change = on_change
+        self._on_backoff = on_backoff
+        self._notify()
+
+    @property
+    def capacity(self) -> int:
+        """Slots currently allowed (the integer part of the limit)."""
+        return max(self.min_limit, math.floor(self.limit))
+
+    def _notify(self) -> None:
+        if self._on_change is not None:
+            self._on_change(self)
+
+    def _wake(self) -> None:
+        free = self.capacity - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def acquire(self, latency_class: str = "default") -> LimiterTicket:
+        """Wait for a free slot."""
+        while self.in_flight >= self.capacity:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    self._wake()  # pass the wake-up we consumed on to the next waiter
+                raise
+        self.in_flight += 1
+        self._notify()
+        return LimiterTicket(self._epoch, time.monotonic(), latency_class)
+
+    def release(self, ticket: LimiterTicket) -> None:
+        """Return a slot and adapt the limit from its latency and outcome."""
+        self.in_flight -= 1
+        latency = time.monotonic() - ticket.started
+        if ticket.overload is not None:
+            self._decrease(ticket)
+        else:
+            self._record_success(ticket, latency)
+        self._notify()
+        self._wake()
+
+    def _record_success(self, ticket: LimiterTicket, latency: float) -> None:
+        previous = self._baselines.get(ticket.latency_class)
+        baseline = latency if previous is None else 0.95 * previous + 0.05 * latency
+        self._baselines[ticket.latency_class] = baseline
+        self._recent.append(latency / baseline if baseline > 0 else 1.0)
+        if len(self._recent) >= max(5, self._recent.maxlen // 2):
+            ordered = sorted(self._recent)
+            p95 = ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+            if p95 > self.latency_tolerance:
+                ticket.overload = "latency"
+                self._decrease(ticket)
+                return
+        # Only grow while the limit is actually the bottleneck.
+        if self.in_flight + 1 >= self.capacity:
+            self.limit = min(float(self.max_limit), self.limit + self.increase / self.limit)
+
+    def _decrease(self, ticket: LimiterTicket) -> None:
+        if ticket.epoch != self._epoch:
+            return
+        self._epoch += 1
+        self.backoffs += 1
+        self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        self._recent.clear()
+        if self._on_backoff is not None:
+            self._on_backoff(ticket.overload or "unknown")
+
+    @asynccontextmanager
+    async def slot(
+        self, latency_class: str = "default", timeout: float | None = None
+    ) -> AsyncIterator[LimiterTicket]:
+        """Hold a slot for the duration of the block; exposes it to ``report_overload``.
+
+        Raises ``TimeoutError`` if no slot frees up within ``timeout`` seconds.
+        """
+        async with asyncio.timeout(timeout):
+            ticket = await self.acquire(latency_class)
+        token = _current_ticket.set(ticket)
+        try:
+            yield ticket
+        except BaseException as exc:
+            if is_overload_error(exc) or isinstance(exc, TimeoutError):
+                report_overload("timeout" if isinstance(exc, TimeoutError) else "rate_limit")
+            raise
+        finally:
+            _current_ticket.reset(token)
+            self.release(ticket)
+
+    def stats(self) -> dict[str, float]:
+        """Return the current limit, slots in use, and number of backoffs."""
+        return {
+            "limit": self.limit,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "backoffs": self.backoffs,
+        }
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when admission control sheds a request instead of queueing it."""
+
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(f"Server overloaded ({reason}); retry after {retry_after:.0f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "error": "overloaded",
+            "reason": self.reason,
+            "retry_after_seconds": math.ceil(self.retry_after),
+        }
+
+
+class AdmissionController:
+    """
+    Process-wide cap on in-flight work with a bounded FIFO wait queue.
+
+    At most ``max_in_flight`` holders run at once and at most ``max_queue``
+    callers wait. A caller is shed with ``AdmissionRejectedError`` when the queue
+    is full, when the expected wait (queue position times the average
+    service time) already exceeds ``queue_timeout``, or when it has waited
+    ``queue_timeout`` seconds without getting a slot. Freed slots are handed
+    straight to the oldest waiter so newcomers cannot overtake the queue.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout: float,
+        on_change: Callable[[AdmissionController], None] | None = None,
+        on_shed: Callable[[str], None] | None = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must be >= 0")
+        if queue_timeout <= 0:
+            raise ValueError("queue_timeout must be > 0")
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.shed = 0
+        self._service_time: float | None = None
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._on_change = on_change
+        self._on_shed = on_shed
+        self._notify()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def saturated(self) -> bool:
+        """True when a new caller would be shed immediately."""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            return False
+        return len(self._waiters) >= self.max_queue or self.estimated_wait(len(self._waiters) + 1) > self.queue_timeout
+
+    def estimated_wait(self, position: int) -> float:
+        """Expected seconds until queue ``position`` (1-based) gets a slot."""
+        if self._service_time is None or position <= 0:
+            return 0.0
+        return self._service_time * math.ceil(position / self.max_in_flight)
+
+    def retry_after(self) -> float:
+        """Seconds a shed caller should wait before retrying (at least one)."""
+        return max(1.0, self.estimated_wait(len(self._waiters) + 1))
+
+    def _notify(self) -> None:
+        if self._on_change is not None:
+            self._on_change(self)
+
+    def _reject(self, reason: str) -> AdmissionRejectedError:
+        self.shed += 1
+        if self._on_shed is not None:
+            self._on_shed(reason)
+        return AdmissionRejectedError(reason, self.retry_after())
+
+    async def _acquire(self) -> None:
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full")
+        if self.estimated_wait(len(self._waiters) + 1) > self.queue_timeout:
+            raise self._reject("queue_budget")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._notify()
+        try:
+            # A slot handed over by _release keeps in_flight unchanged.
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except TimeoutError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise self._reject("queue_timeout") from None
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                self._release()  # we were handed a slot; pass it on
+            raise
+        finally:
+            self._notify()
+
+    def _release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold an admission slot for the duration of the block."""
+        await self._acquire()
+        self._notify()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self._service_time = elapsed if self._service_time is None else 0.8 * self._service_time + 0.2 * elapsed
+            self._release()
+            self._notify()
+
+    def stats(self) -> dict[str, float]:
+        """Return slots in use, queue depth, and number of shed requests."""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "shed": self.shed,
+        }
+
+
+__all__ = [
+    "AdaptiveLimiter",
+    "AdmissionController",
+    "AdmissionRejectedError",
+    "LimiterTicket",
+    "SingleFlight",
+    "is_overload_error",
+    "report_overload",
+]
@@ -0,0 +1,193 @@
+"""
+Process-wide registry of chat-model clients and their HTTP connection pools
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable, Hashable
+from threading import Lock
+from typing import Any
+
+import httpx
+import structlog
+
+from ..config.settings import settings
+from .monitoring import metrics
+
+logger = structlog.get_logger()
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response body that reports when the connection goes back to the pool."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]) -> None:
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport that counts requests holding a pooled connection.
+
+    A request holds its connection from send until the response body is
+    closed, which is what ``in_use`` reports against ``max_connections``.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        limits: httpx.Limits,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.provider = provider
+        self.max_connections = limits.max_connections
+        self.in_use = 0
+        self._transport = transport or httpx.AsyncHTTPTransport(limits=limits)
+        self._report()
+
+    def _report(self) -> None:
+        metrics.set_llm_http_pool(self.provider, self.in_use, self.max_connections)
+
+    def _release(self) -> None:
+        self.in_use -= 1
+        self._report()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_use += 1
+        self._report()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TrackedStream(response.stream, self._release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class _ProviderPool:
+    __slots__ = ("client", "async_client", "transport")
+
+    def __init__(self, provider: str, limits: httpx.Limits) -> None:
+        self.transport = PooledTransport(provider, limits)
+        self.client = httpx.Client(limits=limits)
+        self.async_client = httpx.AsyncClient(transport=self.transport)
+
+
+class LLMClientRegistry:
+    """
+    Hand out one chat-model client per (provider, model, parameters).
+
+    Agents and chains configured alike share a client, and clients of the
+    same provider share one keep-alive connection pool, so TLS sessions are
+    reused across the whole pipeline instead of once per agent.
+    """
+
+    def __init__(self, limits: httpx.Limits | None = None) -> None:
+        self.limits = limits or httpx.Limits(
+            max_connections=settings.llm_http_max_connections,
+            max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+            keepalive_expiry=settings.llm_http_keepalive_expiry_seconds,
+        )
+        self._clients: dict[tuple[Hashable, ...], Any] = {}
+        self._pools: dict[str, _ProviderPool] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _pool(self, provider: str) -> _ProviderPool:
+        pool = self._pools.get(provider)
+        if pool is None:
+            pool = self._pools[provider] = _ProviderPool(provider, self.limits)
+        return pool
+
+    def http_clients(self, provider: str) -> tuple[httpx.Client, httpx.AsyncClient]:
+        """Sync and async HTTP clients sharing the provider's connection limits"""
+        with self._lock:
+            pool = self._pool(provider)
+        return pool.client, pool.async_client
+
+    def get(self, provider: str, model: str, **params: Any) -> Any:
+        """Return the shared client for this configuration, creating it once"""
+        key = (provider, model, *sorted(params.items()))
+        with self._lock:
+            client = self._clients.get(key)
+            reused = client is not None
+            if client is None:
+                client = self._clients[key] = self._create(provider, model, params)
+                logger.info("Created LLM client", provider=provider, model=model, clients=len(self._clients))
+        metrics.record_llm_client_lookup(provider, reused)
+        return client
+
+    def _create(self, provider: str, model: str, params: dict[str, Any]) -> Any:
+        # Provider packages are imported on first use so the registry stays
+        # importable wherever only some of them are installed. Only the OpenAI
+        # client accepts injected httpx clients; the others keep the pool of
+        # their single shared instance.
+        if provider == "openai":
+            from langchain_openai import ChatOpenAI
+
+            pool = self._pool(provider)
+            return ChatOpenAI(
+                model=model,
+                http_client=pool.client,
+                http_async_client=pool.async_client,
+                **params,
+            )
+        if provider == "anthropic":
+            from langchain_anthropic import ChatAnthropic
+
+            return ChatAnthropic(model=model, **params)
+        if provider == "google":
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            return ChatGoogleGenerativeAI(model=model, **params)
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
+    def stats(self) -> dict[str, Any]:
+        """Client count and per-provider pool usage"""
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "pools": {
+                    provider: {
+                        "in_use": pool.transport.in_use,
+                        "max_connections": pool.transport.max_connections,
+                    }
+                    for provider, pool in self._pools.items()
+                },
+            }
+
+    async def aclose(self) -> None:
+        """Close pooled connections and forget every client"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            self._clients.clear()
+        for pool in pools:
+            pool.client.close()
+            await pool.async_client.aclose()
+
+
+# Global registry instance
+llm_clients = LLMClientRegistry()
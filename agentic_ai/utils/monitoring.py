@@ -49,6 +49,13 @@ class MetricsCollector:
             'Pipeline execution duration'
         )
 
+        self.analysis_duration = Histogram(
+            'symptomsync_analysis_duration_seconds',
+            'End-to-end analyze_symptoms latency by analysis mode',
+            ['mode'],
+            buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+        )
+
         # LLM metrics
         self.llm_calls = Counter(
             'symptomsync_llm_calls_total',
@@ -80,6 +87,108 @@ class MetricsCollector:
             ['component', 'error_type']
         )
 
+        # Cache metrics
+        self.cache_events = Counter(
+            'symptomsync_cache_events_total',
+            'Cache lookups and evictions',
+            ['cache', 'event']  # event is "hit", "miss", or "eviction"
+        )
+        # Lookups happen on every memoized tool call; resolving label
+        # children once keeps the per-call cost to a single increment.
+        self._cache_event_children = {}
+
+        # Adaptive LLM concurrency metrics
+        self.llm_concurrency_limit = Gauge(
+            'symptomsync_llm_concurrency_limit',
+            'Target number of concurrent LLM-bound analyses (adaptive limit)'
+        )
+        self.llm_concurrency_in_flight = Gauge(
+            'symptomsync_llm_concurrency_in_flight',
+            'LLM-bound analyses currently holding a concurrency slot'
+        )
+        self.llm_concurrency_backoffs = Counter(
+            'symptomsync_llm_concurrency_backoffs_total',
+            'Adaptive concurrency limit reductions',
+            ['reason']  # reason is "rate_limit", "timeout", or "latency"
+        )
+
+        # Speculative knowledge retrieval metrics
+        self.speculative_retrievals = Counter(
+            'symptomsync_speculative_retrievals_total',
+            'Speculative knowledge retrievals by outcome',
+            ['outcome']  # outcome is "hit", "miss", or "skipped"
+        )
+
+        # Session checkpoint metrics
+        self.session_stages = Counter(
+            'symptomsync_session_stages_total',
+            'Stages of follow-up turns by whether stored results were reused',
+            ['stage', 'outcome']  # outcome is "reused" or "rerun"
+        )
+        self.session_evictions = Counter(
+            'symptomsync_session_evictions_total',
+            'Sessions dropped from the checkpoint store',
+            ['reason']  # reason is "expired" or "capacity"
+        )
+        self.sessions_stored = Gauge(
+            'symptomsync_sessions_stored',
+            'Sessions currently held by the checkpoint store'
+        )
+
+        # LLM client registry metrics
+        self.llm_client_lookups = Counter(
+            'symptomsync_llm_client_lookups_total',
+            'Chat-model client lookups in the shared registry',
+            ['provider', 'outcome']  # outcome is "created" or "reused"
+        )
+
+        self.llm_http_pool_in_use = Gauge(
+            'symptomsync_llm_http_pool_in_use',
+            'LLM HTTP requests currently holding a pooled connection',
+            ['provider']
+        )
+
+        self.llm_http_pool_max = Gauge(
+            'symptomsync_llm_http_pool_max_connections',
+            'Connection limit of the shared LLM HTTP pool',
+            ['provider']
+        )
+
+        # Startup warm-up metrics
+        self.warmup_duration = Gauge(
+            'symptomsync_warmup_duration_seconds',
+            'Duration of the last startup warm-up',
+            ['status']
+        )
+
+        # Admission control metrics
+        self.admission_in_flight = Gauge(
+            'symptomsync_admission_in_flight',
+            'Analyses currently admitted by global admission control'
+        )
+        self.admission_queue_depth = Gauge(
+            'symptomsync_admission_queue_depth',
+            'Analyses waiting for admission'
+        )
+        self.requests_shed = Counter(
+            'symptomsync_requests_shed_total',
+            'Requests rejected by admission control',
+            ['reason']  # reason is "queue_full", "queue_budget", "queue_timeout", or "gateway"
+        )
+
+        # Request coalescing metrics
+        self.coalesced_requests = Counter(
+            'symptomsync_coalesced_requests_total',
+            'Requests that joined an identical in-flight run',
+            ['operation']
+        )
+
+        # Deterministic red-flag escalations answered without the graph
+        self.red_flag_short_circuits = Counter(
+            'symptomsync_red_flag_short_circuits_total',
+            'Analyses answered by the red-flag screen before the LLM graph'
+        )
+
         # System metrics
         self.active_requests = Gauge(
             'symptomsync_active_requests',
@@ -136,6 +245,73 @@ class MetricsCollector:
         """Record error metrics"""
         self.errors.labels(component=component, error_type=error_type).inc()
 
+    def record_cache_event(self, cache: str, event: str, count: int = 1):
+        """Record a cache hit, miss, or eviction"""
+        child = self._cache_event_children.get((cache, event))
+        if child is None:
+            child = self.cache_events.labels(cache=cache, event=event)
+            self._cache_event_children[(cache, event)] = child
+        child.inc(count)
+
+    def record_analysis_latency(self, mode: str, duration: float):
+        """Record end-to-end analysis latency for an analysis mode"""
+        self.analysis_duration.labels(mode=mode).observe(duration)
+
+    def set_llm_concurrency(self, limit: float, in_flight: int):
+        """Publish the adaptive LLM concurrency limit and slots in use"""
+        self.llm_concurrency_limit.set(limit)
+        self.llm_concurrency_in_flight.set(in_flight)
+
+    def record_llm_backoff(self, reason: str):
+        """Record an adaptive concurrency limit reduction"""
+        self.llm_concurrency_backoffs.labels(reason=reason).inc()
+
+    def record_speculative_retrieval(self, outcome: str):
+        """Record whether speculative knowledge retrieval was reused"""
+        self.speculative_retrievals.labels(outcome=outcome).inc()
+
+    def record_session_stage(self, stage: str, reused: bool):
+        """Record whether a follow-up turn reused a stage's stored results"""
+        self.session_stages.labels(stage=stage, outcome="reused" if reused else "rerun").inc()
+
+    def record_session_evictions(self, reason: str, count: int = 1):
+        """Record sessions evicted from the checkpoint store"""
+        self.session_evictions.labels(reason=reason).inc(count)
+
+    def set_sessions_stored(self, count: int):
+        """Publish the number of stored sessions"""
+        self.sessions_stored.set(count)
+
+    def record_llm_client_lookup(self, provider: str, reused: bool):
+        """Record a shared chat-model client lookup"""
+        self.llm_client_lookups.labels(provider=provider, outcome="reused" if reused else "created").inc()
+
+    def set_llm_http_pool(self, provider: str, in_use: int, max_connections: int):
+        """Publish pooled LLM connection usage"""
+        self.llm_http_pool_in_use.labels(provider=provider).set(in_use)
+        self.llm_http_pool_max.labels(provider=provider).set(max_connections)
+
+    def record_warmup(self, duration: float, status: str = "success"):
+        """Record how long startup warm-up took"""
+        self.warmup_duration.labels(status=status).set(duration)
+
+    def set_admission_state(self, in_flight: int, queued: int):
+        """Publish admitted and queued analysis counts"""
+        self.admission_in_flight.set(in_flight)
+        self.admission_queue_depth.set(queued)
+
+    def record_load_shed(self, reason: str):
+        """Record a request rejected by admission control"""
+        self.requests_shed.labels(reason=reason).inc()
+
+    def record_coalesced_request(self, operation: str):
+        """Record a request served by another caller's in-flight run"""
+        self.coalesced_requests.labels(operation=operation).inc()
+
+    def record_red_flag_short_circuit(self):
+        """Record an analysis answered by the red-flag screen"""
+        self.red_flag_short_circuits.inc()
+
     def increment_active_requests(self):
         """Increment active request counter"""
         self.active_requests.inc()
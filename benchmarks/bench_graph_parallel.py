@@ -0,0 +1,85 @@
+"""Benchmark: agent graph critical path with a latency-injecting fake LLM.
+
+Run from the repository root: python -m benchmarks.bench_graph_parallel
+"""
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langgraph.graph import END, StateGraph
+
+from agentic_ai.agents.knowledge_retriever import KnowledgeRetrieverAgent
+from agentic_ai.graphs.assembly_line import DRY_RUN_INPUT, DRY_RUN_RESPONSE, SymptomSyncGraph
+from agentic_ai.graphs.state import AgentState
+
+LLM_LATENCY = 0.2
+RETRIEVAL_LATENCY = 0.05
+DOCUMENTS = [{"content": "Tension headaches are the most common primary headache.", "source": "kb"}]
+
+
+class SlowFakeChatModel(FakeListChatModel):
+    """Stub chat model that waits one provider round-trip before answering."""
+
+    latency: float = LLM_LATENCY
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+class SequentialGraph(SymptomSyncGraph):
+    """The same agents wired as a strict chain, as before the parallel branches."""
+
+    def _build_graph(self):
+        chain = [
+            "symptom_extractor",
+            "knowledge_retriever",
+            "diagnostic_analyzer",
+            "risk_screen",
+            "risk_assessor",
+            "recommendation_generator",
+            "orchestrator",
+        ]
+        workflow = StateGraph(AgentState)
+        for name in chain:
+            workflow.add_node(name, getattr(self, f"_{name}_node"))
+        workflow.set_entry_point(chain[0])
+        for source, target in zip(chain, chain[1:]):
+            workflow.add_edge(source, target)
+        workflow.add_edge(chain[-1], END)
+        return workflow.compile()
+
+
+async def _retrieve_documents(self, query):
+    await asyncio.sleep(RETRIEVAL_LATENCY)
+    return DOCUMENTS
+
+
+async def _best_of(graph, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = await graph.analyze_symptoms(DRY_RUN_INPUT)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+async def bench_graph_parallel(repeats=5):
+    llm = SlowFakeChatModel(responses=[json.dumps(DRY_RUN_RESPONSE)])
+    with patch.object(KnowledgeRetrieverAgent, "_retrieve_documents", _retrieve_documents):
+        sequential_time, sequential = await _best_of(SequentialGraph().with_llm(llm), repeats)
+        parallel_time, parallel = await _best_of(SymptomSyncGraph().with_llm(llm), repeats)
+    same = {key: value for key, value in sequential.items() if key != "processing_time"} == {
+        key: value for key, value in parallel.items() if key != "processing_time"
+    }
+    print(f"LLM latency {LLM_LATENCY * 1000:.0f} ms, retrieval latency {RETRIEVAL_LATENCY * 1000:.0f} ms")
+    print(
+        f"sequential {sequential_time * 1000:8.1f} ms  parallel {parallel_time * 1000:8.1f} ms  "
+        f"saved {(sequential_time - parallel_time) * 1000:6.1f} ms  same output: {same}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(bench_graph_parallel())
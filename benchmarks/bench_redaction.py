@@ -0,0 +1,106 @@
+"""Benchmark: PII redaction over transcript-sized inputs.
+
+Run from the repository root: python -m benchmarks.bench_redaction
+"""
+import random
+import time
+import tracemalloc
+
+from agentic_ai.model_context_server.redaction import REDACTION_RULES, redact_stream, redact_text
+
+FILLER = (
+    "patient says the headache started after lunch and got worse overnight "
+    "nurse advised fluids rest and a follow up call tomorrow morning"
+).split()
+PII = [
+    "jane.doe@example.com",
+    "(555) 123-4567",
+    "555-987-6543",
+    "123-45-6789",
+    "1984-07-21",
+    "MRN: A1234567",
+]
+
+
+def _legacy_redact(text):
+    """Sequential findall + sub per pattern, as run before the combined engine."""
+    redacted = text
+    count = 0
+    types = []
+    for label, pattern, replacement in REDACTION_RULES:
+        matches = pattern.findall(redacted)
+        if matches:
+            types.append(label)
+            count += len(matches)
+            redacted = pattern.sub(replacement, redacted)
+    return {"redacted_text": redacted, "redaction_count": count, "redaction_types": types}
+
+
+def _transcript(size, rng):
+    parts = []
+    length = 0
+    while length < size:
+        token = rng.choice(PII) if rng.random() < 0.02 else rng.choice(FILLER)
+        parts.append(token)
+        length += len(token) + 1
+    return " ".join(parts)[:size]
+
+
+def _best_of(fn, text, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_redaction():
+    rng = random.Random(11)
+    for size, repeats in ((1_000, 200), (100_000, 20), (10_000_000, 3)):
+        text = _transcript(size, rng)
+        legacy_time, legacy = _best_of(_legacy_redact, text, repeats)
+        single_time, single = _best_of(redact_text, text, repeats)
+        same = (legacy["redaction_count"], legacy["redaction_types"]) == (
+            single["redaction_count"],
+            single["redaction_types"],
+        )
+        print(
+            f"{size:>10} chars  legacy {legacy_time * 1000:9.2f} ms  "
+            f"one-rebuild {single_time * 1000:9.2f} ms  "
+            f"speedup {legacy_time / single_time:4.1f}x  same counts/types: {same}"
+        )
+
+
+
+def _peak_memory(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_streaming_memory(size=20_000_000, chunk_size=1 << 20):
+    rng = random.Random(13)
+    block = _transcript(chunk_size, rng)
+    chunks = [block] * (size // chunk_size)
+    total = len(block) * len(chunks)
+
+    def whole():
+        redact_text("".join(chunks))
+
+    def streamed():
+        for _ in redact_stream(iter(chunks)):
+            pass
+
+    for name, fn in (("whole text", whole), ("streaming", streamed)):
+        elapsed, peak = _peak_memory(fn)
+        print(f"{name:>10}  {total:>10} chars  {elapsed * 1000:9.2f} ms  peak {peak / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    bench_redaction()
+    bench_streaming_memory()
@@ -0,0 +1,74 @@
+"""Benchmark: triage phrase matching throughput and negation handling.
+
+Run from the repository root: python -m benchmarks.bench_triage_matcher
+"""
+import random
+import time
+
+from agentic_ai.model_context_server import decision_support as ds
+from agentic_ai.model_context_server.phrase_matcher import PhraseMatcher
+
+FILLER = (
+    "patient reports feeling off after lunch and walked home slowly with family "
+    "mentions poor sleep some stress at work and a long week overall"
+).split()
+
+
+def _legacy_scan(text):
+    """Per-phrase substring checks as run before the compiled matcher."""
+    return (
+        [flag for flag, phrases in ds.RED_FLAG_PATTERNS.items() if any(p in text for p in phrases)],
+        [name for name, phrases in ds.SYMPTOM_HINTS.items() if any(p in text for p in phrases)],
+        [term for term, phrases in ds.CONTEXT_TERMS.items() if any(p in text for p in phrases)],
+    )
+
+
+NEGATED_NOTES = (
+    "no chest pain",
+    "denies shortness of breath",
+    "patient is negative for seizures",
+    "no fever, no headache",
+    "does not have a rash",
+)
+
+
+def _sample_text(words, rng):
+    body = " ".join(rng.choice(FILLER) for _ in range(words))
+    return f"{body} with a headache and fever since yesterday, now chest pain".lower()
+
+
+def _throughput(fn, text, min_seconds=0.5):
+    runs = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        fn(text)
+        runs += 1
+    elapsed = time.perf_counter() - start
+    return runs / elapsed, len(text) * runs / elapsed / 1e6
+
+
+def bench_triage_matcher():
+    rng = random.Random(42)
+    tables = {"red_flags": ds.RED_FLAG_PATTERNS, "symptoms": ds.SYMPTOM_HINTS, "context": ds.CONTEXT_TERMS}
+    matcher = PhraseMatcher(
+        tables,
+        negation_cues=ds.NEGATION_CUES,
+        negatable_groups=("symptoms",),
+        strict_negation_cues=ds.RED_FLAG_NEGATION_CUES,
+        strict_negation_groups=("red_flags",),
+    )
+    candidates = [("legacy substring", _legacy_scan), ("token trie", matcher.scan)]
+
+    legacy_hits = sum(len(flags) + len(symptoms) for flags, symptoms, _ in map(_legacy_scan, NEGATED_NOTES))
+    token_hits = sum(len(found["red_flags"]) + len(found["symptoms"]) for found in map(matcher.scan, NEGATED_NOTES))
+    print(f"negated notes: legacy reports {legacy_hits} findings, token trie reports {token_hits}")
+
+    for words in (40, 400, 4000, 40000):
+        text = _sample_text(words, rng)
+        for name, fn in candidates:
+            calls, mb = _throughput(fn, text)
+            print(f"{len(text):>8} chars  {name:<17} {calls:>10.0f} scans/s  {mb:>7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    bench_triage_matcher()